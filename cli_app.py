@@ -8,13 +8,30 @@
 # ======================================== 导入相关模块 =========================================
 
 import argparse
-from ws_converter.converter import convert_image_to_json, convert_video_to_json
-from ws_converter.simulator import run_simulator
+import multiprocessing
+
+# 各子命令依赖的模块在对应分支中按需导入：
+# convert不加载Pygame，转换图片不加载OpenCV，命令行启动只需导入argparse
 
 # ======================================== 全局变量 ============================================
 
 # ======================================== 功能函数 ============================================
 
+def make_progress_printer(unit):
+    """
+    创建命令行进度回调：在同一行刷新已完成数量、百分比、速率和预计剩余时间
+    :param unit: 进度单位（如"帧"、"行"）
+    :return: 进度回调函数progress(done, total)
+    """
+    from ws_converter.converter import ProgressTracker
+
+    tracker = ProgressTracker(unit)
+
+    def progress(done, total):
+        print(f"\r转换进度：{tracker.format(done, total)}    ", end="" if done < total else "\n", flush=True)
+
+    return progress
+
 def main():
     parser = argparse.ArgumentParser(
         prog="视频图像取模工具平台",
@@ -30,10 +47,34 @@ def main():
 
     2. 将图像转换为JSON帧：
        python cli_app.py image -i test_image.png -o out -W 128 -H 64
+       转换时调整颜色（亮度 / 对比度 / 饱和度，可先在GUI预览面板中调好数值）：
+       python cli_app.py convert -i test_image.png -o out -W 128 -H 64 --brightness 1.2 --saturation 1.3
 
     3. 播放转换好的帧（支持连播）：
        python cli_app.py play -p "output/test_gif_frame_*.json" -W 128 -H 64 --fps 30
 
+    4. 按帧时间戳实时播放（渲染落后时自动丢帧）：
+       python cli_app.py play -p "output/test_gif_frame_*.json" -W 128 -H 64 --clock timestamp
+
+    5. 无窗口离线渲染（输出格式由扩展名决定：.png拼图 / .gif / .mp4）：
+       python cli_app.py render -p "output/test_gif_frame_*.json" -o preview.gif --fps 15
+
+    6. 多面板拼接屏仿真（布局文件描述面板位置、尺寸、旋转及帧源）：
+       python cli_app.py wall -l wall_layout.json --fps 30
+
+    7. 生成滚动字幕帧（整段文字只渲染一次，按窗口切片生成每一帧）：
+       python cli_app.py marquee -t "Hello 世界" -o marquee -W 32 -H 16 --speed 1 --color "#ff0000"
+
+    8. 导出点阵字库（ASCII / GB2312一级汉字 / 自定义字符，多进程光栅化），并用字库在仿真器中显示文字：
+       python cli_app.py atlas -c gb2312 -W 16 -H 16 -o fonts/gb2312_16.wsfa
+       python cli_app.py text -a fonts/gb2312_16.wsfa -t "你好" -W 32 -H 16 --scroll
+
+    9. 批量字符转点阵JSON（字符串 / 文本文件 / 码点范围，多进程并行，已是最新的输出自动跳过）：
+       python cli_app.py chars -t "温度湿度" --file labels.txt --range 0x30-0x39 -o chars -W 16 -H 16
+
+    10. 按任务清单并发批量转换（JSON/TOML，输入与参数未变化的任务自动跳过，输出汇总报告）：
+       python cli_app.py run -m assets.toml -j 4 --report report.json
+
     ⚠️【播放模式说明】
     - 要实现连播，请使用通配符匹配多个JSON文件，例如：
       -p "output/test_gif_frame_*.json"
@@ -42,6 +83,8 @@ def main():
     - 播放控制键：
       空格键   —— 暂停/继续播放
       ← →键   —— 上一帧 / 下一帧
+      I键     —— 显示/隐藏性能统计叠加层（解码/渲染/显示耗时、p50/p99帧间隔、丢帧、内存）
+      L键     —— 切换方块/LED外观
       ESC键   —— 退出播放窗口
 
     📦【输出命名规则】
@@ -62,6 +105,9 @@ def main():
     conv.add_argument("-H", "--height", type=int, required=True, help="输出点阵图像 高度")
     conv.add_argument("-f", "--frames", type=int, default=0, help="输出多少帧数-均匀抽帧（仅视频有效）")
     conv.add_argument("-d", "--desc", default="", help="附加描述信息")
+    conv.add_argument("--brightness", type=float, default=1.0, help="亮度调整系数，默认1.0（大于1增亮）")
+    conv.add_argument("--contrast", type=float, default=1.0, help="对比度调整系数，默认1.0（大于1增强）")
+    conv.add_argument("--saturation", type=float, default=1.0, help="饱和度调整系数，默认1.0（0为灰度）")
 
     # ===== 子命令 play =====
     play = sub.add_parser("play", help="播放转换后的 JSON 数据帧")
@@ -70,18 +116,194 @@ def main():
     play.add_argument("-H", "--height", type=int, required=True, help="LED 屏幕的行数（高度）")
     play.add_argument("--window", type=int, default=1000, help="窗口尺寸（像素），控制播放窗口大小，默认1000")
     play.add_argument("--fps", type=int, default=30, help="播放帧率，默认30帧/秒")
+    play.add_argument("--clock", choices=["fixed", "timestamp"], default="fixed",
+                      help="播放时钟：fixed按固定帧率逐帧播放；timestamp按帧时间戳实时播放，落后时丢帧")
+    play.add_argument("--watch", action="store_true", help="监视帧文件变化，仅重新加载变化的帧，不中断播放")
+    play.add_argument("--stats", action="store_true", help="显示性能统计叠加层（播放时也可按 I 键切换）")
+    play.add_argument("--stats-out", default=None, help="退出时导出逐帧性能统计（.json 或 .csv）")
+    play.add_argument("--appearance", choices=["square", "led"], default="square",
+                      help="显示外观：square方块+边框；led圆形漫射LED+辉光（播放时也可按 L 键切换）")
+
+    # ===== 子命令 render =====
+    render = sub.add_parser("render", help="无窗口离线渲染 JSON 数据帧为 PNG拼图/GIF/MP4")
+    render.add_argument("-p", "--path", required=True, help="输入 JSON 数据文件路径（支持通配符）")
+    render.add_argument("-o", "--output", required=True, help="输出文件路径（.png/.gif/.mp4）")
+    render.add_argument("-W", "--width", type=int, default=None, help="LED 屏幕的列数（默认读取首帧）")
+    render.add_argument("-H", "--height", type=int, default=None, help="LED 屏幕的行数（默认读取首帧）")
+    render.add_argument("--window", type=int, default=1000, help="画面宽度（像素），与播放窗口一致，默认1000")
+    render.add_argument("--fps", type=int, default=30, help="GIF/MP4 帧率，默认30帧/秒")
+    render.add_argument("--columns", type=int, default=8, help="PNG 拼图每行帧数，默认8")
+    render.add_argument("--no-grid", action="store_true", help="不绘制像素边框")
+
+    # ===== 子命令 wall =====
+    wall = sub.add_parser("wall", help="多面板拼接屏仿真播放")
+    wall.add_argument("-l", "--layout", required=True, help="拼接屏布局 JSON 文件路径")
+    wall.add_argument("--window", type=int, default=1000, help="窗口尺寸（像素），控制播放窗口大小，默认1000")
+    wall.add_argument("--fps", type=int, default=30, help="播放帧率，默认30帧/秒")
+    wall.add_argument("--clock", choices=["fixed", "timestamp"], default="fixed",
+                      help="播放时钟：fixed按固定帧率逐帧播放；timestamp按帧时间戳实时播放，落后时丢帧")
+    wall.add_argument("--stats", action="store_true", help="显示性能统计叠加层（播放时也可按 I 键切换）")
+    wall.add_argument("--stats-out", default=None, help="退出时导出逐帧性能统计（.json 或 .csv）")
+    wall.add_argument("--appearance", choices=["square", "led"], default="square",
+                      help="显示外观：square方块+边框；led圆形漫射LED+辉光（播放时也可按 L 键切换）")
+
+    # ===== 子命令 marquee =====
+    marquee = sub.add_parser("marquee", help="生成滚动字幕 JSON 数据帧")
+    marquee.add_argument("-t", "--text", required=True, help="字幕文字")
+    marquee.add_argument("-o", "--output", required=True, help="输出目录")
+    marquee.add_argument("-W", "--width", type=int, required=True, help="输出点阵图像 宽度")
+    marquee.add_argument("-H", "--height", type=int, required=True, help="输出点阵图像 高度")
+    marquee.add_argument("--speed", type=int, default=1, help="每帧移动的列数，默认1")
+    marquee.add_argument("--direction", choices=["left", "right"], default="left", help="滚动方向，默认left")
+    marquee.add_argument("--no-loop", action="store_true", help="文字移入再移出一次（默认生成可无缝循环的帧）")
+    marquee.add_argument("--color", default="#ffffff", help="文字颜色（#rrggbb 或 r,g,b），默认白色")
+    marquee.add_argument("--bg", default="#000000", help="背景颜色（#rrggbb 或 r,g,b），默认黑色")
+    marquee.add_argument("--font-size", type=int, default=None, help="字号，默认高度-2")
+    marquee.add_argument("--fps", type=int, default=30, help="帧时间戳使用的帧率，默认30帧/秒")
+    marquee.add_argument("--name", default="marquee", help="输出文件名前缀，默认marquee")
+
+    # ===== 子命令 atlas =====
+    atlas = sub.add_parser("atlas", help="导出1位点阵字库文件")
+    atlas.add_argument("-o", "--output", required=True, help="字库文件输出路径（如 fonts/ascii_8x16.wsfa）")
+    atlas.add_argument("-W", "--width", type=int, required=True, help="字形宽度（点阵列数）")
+    atlas.add_argument("-H", "--height", type=int, required=True, help="字形高度（点阵行数）")
+    atlas.add_argument("-c", "--charset", choices=["ascii", "gb2312"], default="ascii",
+                       help="内置字符集：ascii可打印字符 / gb2312一级汉字，默认ascii")
+    atlas.add_argument("--chars", default=None, help="自定义字符（提供时忽略 --charset）")
+    atlas.add_argument("--chars-file", default=None, help="自定义字符文件（UTF-8文本，提供时忽略 --charset）")
+    atlas.add_argument("--font-size", type=int, default=None, help="字号，默认高度-2")
+    atlas.add_argument("--workers", type=int, default=None, help="光栅化进程数，默认CPU核数")
+
+    # ===== 子命令 text =====
+    text = sub.add_parser("text", help="使用点阵字库在仿真器中显示文字")
+    text.add_argument("-a", "--atlas", required=True, help="点阵字库文件路径")
+    text.add_argument("-t", "--text", required=True, help="显示的文字")
+    text.add_argument("-W", "--width", type=int, required=True, help="LED 屏幕的列数（宽度）")
+    text.add_argument("-H", "--height", type=int, required=True, help="LED 屏幕的行数（高度）")
+    text.add_argument("--window", type=int, default=1000, help="窗口尺寸（像素），控制播放窗口大小，默认1000")
+    text.add_argument("--fps", type=int, default=30, help="播放帧率，默认30帧/秒")
+    text.add_argument("--scroll", action="store_true", help="滚动显示")
+    text.add_argument("--speed", type=int, default=1, help="滚动时每帧移动的列数，默认1")
+    text.add_argument("--color", default="#ffffff", help="文字颜色（#rrggbb 或 r,g,b），默认白色")
+    text.add_argument("--bg", default="#000000", help="背景颜色（#rrggbb 或 r,g,b），默认黑色")
+    text.add_argument("--appearance", choices=["square", "led"], default="square",
+                      help="显示外观：square方块+边框；led圆形漫射LED+辉光（播放时也可按 L 键切换）")
+
+    # ===== 子命令 chars =====
+    chars = sub.add_parser("chars", help="批量字符转点阵 JSON（输出 manifest.json 字符→文件清单）")
+    chars.add_argument("-t", "--text", default=None, help="待转换的字符串")
+    chars.add_argument("--file", default=None, help="待转换字符的文本文件（UTF-8）")
+    chars.add_argument("--range", default=None, help="码点范围，如 0x4E00-0x4E2F，多个范围用逗号分隔")
+    chars.add_argument("-o", "--output", required=True, help="输出目录")
+    chars.add_argument("-W", "--width", type=int, required=True, help="输出点阵图像 宽度")
+    chars.add_argument("-H", "--height", type=int, required=True, help="输出点阵图像 高度")
+    chars.add_argument("--font-size", type=int, default=None, help="字号，默认高度-2")
+    chars.add_argument("--color", default="#ffffff", help="文字颜色（#rrggbb 或 r,g,b），默认白色")
+    chars.add_argument("--bg", default="#000000", help="背景颜色（#rrggbb 或 r,g,b），默认黑色")
+    chars.add_argument("--workers", type=int, default=None, help="工作进程数，默认CPU核数")
+    chars.add_argument("--force", action="store_true", help="忽略已有输出，全部重新转换")
+
+    # ===== 子命令 run =====
+    run = sub.add_parser("run", help="按任务清单（JSON/TOML）并发批量转换，跳过未变化的任务")
+    run.add_argument("-m", "--manifest", required=True, help="任务清单文件路径（.json 或 .toml）")
+    run.add_argument("-j", "--jobs", type=int, default=None, help="并发任务数，默认取清单的 concurrency，再默认CPU核数")
+    run.add_argument("--force", action="store_true", help="忽略任务状态文件，全部重新转换")
+    run.add_argument("--report", default=None, help="汇总报告 JSON 输出路径（含每个任务的耗时、输出与错误）")
 
     args = parser.parse_args()
 
     try:
         if args.mode == "convert":
+            from ws_converter.converter import convert_image_to_json, convert_video_to_json
+
             if args.frames > 0:
-                convert_video_to_json(args.input, args.output, args.width, args.height, args.frames, args.desc)
+                convert_video_to_json(args.input, args.output, args.width, args.height, args.frames, args.desc,
+                                      args.brightness, args.contrast, args.saturation,
+                                      progress=make_progress_printer("帧"))
             else:
-                convert_image_to_json(args.input, args.output, args.width, args.height, args.desc)
+                # 图像点阵整块一次算完，不逐行显示进度
+                outputs = convert_image_to_json(args.input, args.output, args.width, args.height, args.desc,
+                                                args.brightness, args.contrast, args.saturation)
+                print(f"图像转换完成：{outputs[0]}")
 
         elif args.mode == "play":
-            run_simulator(args.path, args.width, args.height, args.window, args.fps)
+            from ws_converter.simulator import run_simulator
+
+            stats = run_simulator(args.path, args.width, args.height, args.window, args.fps, args.clock, args.watch,
+                                  args.stats, args.stats_out, args.appearance)
+            print(f"播放统计：显示 {stats['presented_frames']} 帧，丢帧 {stats['dropped_frames']} 帧，"
+                  f"实际帧率 {stats['achieved_fps']} FPS")
+
+        elif args.mode == "wall":
+            from ws_converter.simulator import run_wall_simulator
+
+            stats = run_wall_simulator(args.layout, args.window, args.fps, args.clock, args.stats, args.stats_out,
+                                       args.appearance)
+            print(f"播放统计：显示 {stats['presented_frames']} 帧，丢帧 {stats['dropped_frames']} 帧，"
+                  f"实际帧率 {stats['achieved_fps']} FPS")
+
+        elif args.mode == "render":
+            from ws_converter.renderer import render_frames
+
+            paths = render_frames(args.path, args.output, args.width, args.height, args.window,
+                                  args.fps, not args.no_grid, args.columns)
+            print(f"渲染完成：{', '.join(paths)}")
+
+        elif args.mode == "marquee":
+            from ws_converter.marquee import text_to_marquee
+            from ws_converter.color import parse_color
+
+            stats = text_to_marquee(args.text, args.output, args.width, args.height, args.speed, args.direction,
+                                    not args.no_loop, parse_color(args.color), parse_color(args.bg), args.font_size,
+                                    args.fps, args.name)
+            line = f"已生成 {stats['frames']} 帧滚动字幕，耗时 {stats['elapsed']:.3f} 秒"
+            if stats["removed"]:
+                line += f"，删除 {stats['removed']} 个旧帧文件"
+            print(line)
+
+        elif args.mode == "atlas":
+            from ws_converter.font_atlas import export_font_atlas
+
+            chars = args.chars
+            if args.chars_file:
+                with open(args.chars_file, encoding="utf-8") as f:
+                    chars = f.read()
+            stats = export_font_atlas(args.output, args.width, args.height, args.charset, chars, args.font_size,
+                                      workers=args.workers)
+            print(f"已导出 {stats['glyphs']} 个字形（{args.width}×{args.height}，{stats['bytes']} 字节）到 "
+                  f"{stats['path']}，耗时 {stats['elapsed']:.2f} 秒")
+
+        elif args.mode == "chars":
+            from ws_converter.char_converter import parse_char_source, convert_chars
+            from ws_converter.color import parse_color
+
+            source = parse_char_source(args.text, args.file, args.range)
+            if not source:
+                raise ValueError("请通过 -t / --file / --range 指定待转换的字符")
+            stats = convert_chars(source, args.output, args.width, args.height, args.font_size,
+                                  parse_color(args.color), parse_color(args.bg), args.workers, args.force)
+            print(f"批量转换完成：转换 {stats['converted']} 个字符，跳过 {stats['skipped']} 个（已是最新），"
+                  f"耗时 {stats['elapsed']:.2f} 秒，{stats['rate']:.0f} 字符/秒，清单 {stats['manifest']}")
+
+        elif args.mode == "text":
+            from ws_converter.simulator import run_text_simulator
+            from ws_converter.color import parse_color
+
+            run_text_simulator(args.atlas, args.text, args.width, args.height, args.window, args.fps, args.scroll,
+                               args.speed, parse_color(args.color), parse_color(args.bg), args.appearance)
+
+        elif args.mode == "run":
+            from ws_converter.pipeline import run_manifest
+
+            try:
+                report = run_manifest(args.manifest, args.jobs, args.force, args.report)
+            except Exception as e:
+                # 清单缺失、无法解析或校验失败：以非零状态退出，便于脚本与流水线判断
+                print(f"[ERROR] {e}")
+                raise SystemExit(2)
+            if report["failed"]:
+                # 有任务失败时以非零状态退出，便于脚本与流水线判断
+                raise SystemExit(1)
     except Exception as e:
         print(f"[ERROR] {e}")
 
@@ -93,5 +315,7 @@ def main():
 # ========================================  主程序  ===========================================
 
 if __name__ == "__main__":
+    # 打包为可执行文件后，atlas/chars/run使用的进程池工作进程需要此调用，否则会重新执行命令行解析
+    multiprocessing.freeze_support()
     print("🎉 欢迎使用『视频图像取模工具平台 v1.0 - Design by FreakStudio Freak嵌入式』🎉\n如需帮助，请使用 --help 参数")
     main()
\ No newline at end of file
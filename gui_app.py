@@ -10,32 +10,37 @@
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, colorchooser
-from ws_converter.converter import convert_image_to_json, convert_video_to_json
-from ws_converter.simulator import WS2812Simulator
-from ws_converter.editor import PixelEditor
-from ws_converter.char_converter import get_default_font, char_to_matrix
-import threading
+from ws_converter.converter import convert_image_to_json, convert_video_to_json, ProgressTracker, ConversionCancelled, \
+    get_preview_proxy, preview_color_adjustments, IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+from ws_converter.job_runner import JobRunner
+# 仿真器（Pygame）、像素编辑器与字符转换（字体加载）在首次使用时才导入，缩短界面启动时间
 import os
 import json
 import glob
 import re
-import pygame
 from PIL import Image, ImageTk
-import time
-import cv2
 import sys
+import multiprocessing
+import numpy as np
 
 # ======================================== 全局变量 ============================================
 
-# 仿真器实例和对应的线程
+# 仿真器子进程控制器（仿真器运行在独立进程中，帧数据通过共享内存传递）
 simulator = None
-sim_thread = None
 # 指向 assets 文件夹（存储图片、图标等资源）
 ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 
 # 像素矩阵编辑器的独立窗口实例
 editor_window = None
 
+# 后台转换任务事件的轮询间隔（毫秒）
+JOB_POLL_INTERVAL = 100
+
+# 颜色调整预览：视频抽取的预览帧数，以及预览图的最大显示尺寸（像素）
+PREVIEW_SAMPLE_FRAMES = 4
+PREVIEW_MAX_WIDTH = 640
+PREVIEW_MAX_HEIGHT = 120
+
 # ======================================== 功能函数 ============================================
 
 def resource_path(relative_path):
@@ -48,6 +53,61 @@ def resource_path(relative_path):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
 
+def preview_proxy_job(path, width, height, sample_frames, progress=None, cancel=None):
+    """
+    生成颜色调整预览代理的后台任务函数（包装get_preview_proxy，适配JobRunner的progress/cancel参数）
+    视频需要解码和跳帧，放在后台线程执行，避免选择大视频时界面卡住
+    :param path: 图片或视频路径
+    :param width: 点阵宽度
+    :param height: 点阵高度
+    :param sample_frames: 视频均匀抽取的帧数
+    :param progress: 进度回调（未使用）
+    :param cancel: 取消标志（仅在开始前检查）
+    :return: 预览代理数组
+    """
+    if cancel is not None and cancel.is_set():
+        raise ConversionCancelled([])
+    return get_preview_proxy(path, width, height, sample_frames)
+
+def sim_load_job(sim, json_pattern, progress=None, cancel=None):
+    """
+    读取帧数据写入共享内存的后台任务函数（包装SimulatorProcess.read_frames，适配JobRunner的progress/cancel参数）
+    帧数较多时解析JSON耗时明显，放在后台线程执行，避免启动模拟器时界面卡住
+    :param sim: SimulatorProcess对象
+    :param json_pattern: JSON帧文件的匹配模式
+    :param progress: 进度回调（未使用）
+    :param cancel: 取消标志（仅在开始前检查）
+    :return: read_frames返回的帧数据字典
+    """
+    if cancel is not None and cancel.is_set():
+        raise ConversionCancelled([])
+    return sim.read_frames(json_pattern)
+
+def char_convert_job(char, width, height, output_path, text_color, bg_color, preview_path,
+                     progress=None, cancel=None):
+    """
+    单字符转换的后台任务函数（包装char_to_matrix，适配JobRunner的progress/cancel参数）
+    :param char: 单个字符
+    :param width: 点阵宽度
+    :param height: 点阵高度
+    :param output_path: JSON输出路径
+    :param text_color: 文字RGB颜色
+    :param bg_color: 背景RGB颜色
+    :param preview_path: 预览图保存路径
+    :param progress: 进度回调（转换完成时报告1/1）
+    :param cancel: 取消标志（单字符转换很快，仅在开始前检查）
+    :return: JSON输出路径
+    """
+    from ws_converter.char_converter import char_to_matrix
+
+    if cancel is not None and cancel.is_set():
+        raise ConversionCancelled([])
+    char_to_matrix(char, width, height, output_path=output_path, text_color=text_color, bg_color=bg_color,
+                   preview_path=preview_path)
+    if progress is not None:
+        progress(1, 1)
+    return output_path
+
 def gui_main():
     """
     主函数：创建并运行视频图像取模工具的Tkinter图形界面
@@ -216,6 +276,20 @@ def gui_main():
     progress_var = tk.DoubleVar()
     # 进度提示标签
     progress_label = tk.StringVar(value="准备就绪")
+    # 后台转换任务队列（任务按提交顺序依次执行）
+    convert_runner = JobRunner()
+    # 各任务的类型（"image"或"video"）与进度统计（任务开始运行时创建）
+    job_kinds = {}
+    trackers = {}
+    # 颜色调整系数（预览与转换共用）
+    brightness = tk.DoubleVar(value=1.0)
+    contrast = tk.DoubleVar(value=1.0)
+    saturation = tk.DoubleVar(value=1.0)
+    preview_info = tk.StringVar(value="选择输入文件后显示颜色调整预览")
+    # 预览代理数组、当前预览图（需保持引用）与待执行的刷新任务
+    preview_state = {"proxy": None, "photo": None, "job": None, "request": None}
+    # 预览代理的后台任务队列（与转换任务分开，不必排在转换之后）
+    preview_runner = JobRunner()
 
     def browse_input():
         """
@@ -225,6 +299,7 @@ def gui_main():
         path = filedialog.askopenfilename()
         if path:
             input_path.set(path)
+            load_preview()
 
     def browse_output():
         """
@@ -235,22 +310,22 @@ def gui_main():
         if path:
             output_path.set(path)
 
-    def update_progress(current, total, message):
+    def update_progress(current, total, message, tracker):
         """
-        更新进度条和进度提示标签的显示内容
+        更新进度条和进度提示标签的显示内容（由转换函数的进度回调驱动，显示真实速率与剩余时间）
         :param current: 当前进度值（已完成的数量）
         :param total: 总进度值（总数量）
-        :param message: 进度提示文字（如“处理区块:”）
+        :param message: 进度提示文字（如“处理帧:”）
+        :param tracker: ProgressTracker对象，用于计算速率与剩余时间
         :return: 无返回值
         """
-        progress = (current / total) * 100
-        progress_var.set(progress)
-        progress_label.set(f"{message} {current}/{total} ({progress:.1f}%)")
-        convert_tab.update_idletasks()  # 强制更新UI
+        progress_var.set((current / total) * 100 if total else 100)
+        progress_label.set(f"{message} {tracker.format(current, total)}")
 
     def do_convert():
         """
-        执行图像/视频到WS2812点阵JSON数据的转换操作，根据文件类型调用对应转换函数
+        将图像/视频到WS2812点阵JSON数据的转换提交到后台任务队列，根据文件类型调用对应转换函数
+        可连续提交多个任务，按提交顺序依次转换，转换期间界面保持响应
         支持的图片格式：jpg、jpeg、png、bmp
         支持的视频格式：mp4、avi、mov、mkv
         :return: 无返回值
@@ -258,41 +333,186 @@ def gui_main():
         file = input_path.get()
         out = output_path.get()
         ext = os.path.splitext(file)[1].lower()
-        w, h, f = width.get(), height.get(), frame_count.get()
+        try:
+            w, h, f = width.get(), height.get(), frame_count.get()
+        except tk.TclError:
+            messagebox.showerror("错误", "矩阵宽度、高度和视频帧数必须是整数")
+            return
 
         # 校验输入输出路径
         if not file or not out:
             messagebox.showerror("错误", "请选择输入文件和输出目录")
             return
 
+        name = os.path.basename(file)
+        # 使用预览面板中调好的颜色调整系数
+        adjustments = {"brightness": brightness.get(), "contrast": contrast.get(), "saturation": saturation.get()}
+        if ext in IMAGE_EXTENSIONS:
+            # 图像转换：点阵整块一次算完，完成时报告一次进度
+            job = convert_runner.submit(name, convert_image_to_json, file, out, w, h, **adjustments)
+            job_kinds[job.id] = "image"
+        elif ext in VIDEO_EXTENSIONS:
+            # 视频转换：按帧报告进度
+            job = convert_runner.submit(name, convert_video_to_json, file, out, w, h, f, **adjustments)
+            job_kinds[job.id] = "video"
+        else:
+            status1.set("⚠️ 不支持的文件类型")
+            return
+        status1.set(f"📥 已加入队列：{name}（待完成任务 {convert_runner.pending()} 个）")
+
+    def load_preview():
+        """
+        载入当前输入文件的预览代理（已缩放分块的点阵颜色，视频为均匀抽取的几帧）并刷新预览
+        代理按文件与点阵尺寸缓存，同一文件再次载入不会重新解码
+        :return: 无返回值
+        """
+        file = input_path.get()
+        preview_state["proxy"] = None
+        if not file or not os.path.isfile(file):
+            preview_info.set("请先选择输入文件")
+            return
         try:
-            if ext in [".jpg", ".jpeg", ".png", ".bmp"]:
-                # 图像转换进度模拟
-                img = Image.open(file)
-                total_blocks = w * h
-                for i in range(total_blocks):
-                    update_progress(i+1, total_blocks, "处理区块:")
-                    # 模拟处理延迟
-                    time.sleep(0.001)
-                convert_image_to_json(file, out, w, h)
-                status1.set("✅ 图像转换完成")
-            elif ext in [".mp4", ".avi", ".mov", ".mkv"]:
-                # 视频转换进度
-                cap = cv2.VideoCapture(file)
-                total_frames = min(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), f)
-                cap.release()
-
-                for i in range(total_frames):
-                    update_progress(i+1, total_frames, "处理帧:")
-                    # 模拟处理延迟
-                    time.sleep(0.001)
-
-                convert_video_to_json(file, out, w, h, f)
-                status1.set(f"🎞 视频转换完成，共提取 {f} 帧")
+            w, h = width.get(), height.get()
+        except tk.TclError:
+            preview_info.set("❌ 矩阵宽度和高度必须是整数")
+            return
+        # 代理在后台线程生成，结果由poll_jobs交回；之前未完成的预览请求作废
+        if preview_state["request"] is not None:
+            preview_state["request"].cancel()
+        preview_state["request"] = preview_runner.submit(os.path.basename(file), preview_proxy_job, file, w, h,
+                                                         PREVIEW_SAMPLE_FRAMES)
+        preview_info.set(f"⏳ 正在生成预览：{os.path.basename(file)}")
+
+    def handle_preview_event(event):
+        """
+        处理预览代理任务的结束事件：只采用最近一次请求的结果（在界面线程中调用）
+        :param event: JobRunner事件元组
+        :return: 无返回值
+        """
+        kind, job = event[0], event[1]
+        if job is not preview_state["request"] or kind in ("start", "progress"):
+            return
+        preview_state["request"] = None
+        if kind == "done":
+            proxy = job.result
+            preview_state["proxy"] = proxy
+            preview_info.set(f"预览：{job.name}（{len(proxy)} 帧，{proxy.shape[2]}×{proxy.shape[1]}）")
+            render_preview()
+        elif kind == "failed":
+            preview_info.set(f"❌ 无法生成预览: {job.error}")
+
+    def schedule_preview(_value=None):
+        """
+        滑块移动时请求刷新预览：同一轮空闲期内的多次请求合并为一次
+        :param _value: Scale回调传入的当前值（未使用）
+        :return: 无返回值
+        """
+        if preview_state["proxy"] is not None and preview_state["job"] is None:
+            preview_state["job"] = root.after_idle(render_preview)
+
+    def render_preview():
+        """
+        在预览代理上重跑颜色调整阶段（含RGB565量化），各帧横向拼接放大后显示
+        :return: 无返回值
+        """
+        preview_state["job"] = None
+        proxy = preview_state["proxy"]
+        if proxy is None:
+            return
+        frames = preview_color_adjustments(proxy, brightness.get(), contrast.get(), saturation.get())
+        n, h, w, _ = frames.shape
+        # 帧之间留1列灰色分隔
+        strip = np.full((h, n * (w + 1) - 1, 3), 64, dtype=np.uint8)
+        for i, frame in enumerate(frames):
+            strip[:, i * (w + 1):i * (w + 1) + w] = frame
+        scale = max(1, min(PREVIEW_MAX_WIDTH // strip.shape[1], PREVIEW_MAX_HEIGHT // h))
+        img = Image.fromarray(strip).resize((strip.shape[1] * scale, h * scale), Image.NEAREST)
+        preview_state["photo"] = ImageTk.PhotoImage(img)
+        preview_label.config(image=preview_state["photo"])
+
+    def reset_adjustments():
+        """
+        将亮度、对比度、饱和度恢复为1.0并刷新预览
+        :return: 无返回值
+        """
+        for var in (brightness, contrast, saturation):
+            var.set(1.0)
+        schedule_preview()
+
+    def cancel_convert():
+        """
+        取消正在运行的转换任务：转换函数在下一个帧/行边界停止，并删除已写出的部分输出文件
+        :return: 无返回值
+        """
+        job = convert_runner.cancel_current()
+        if job is None:
+            status1.set("没有正在运行的转换任务")
+        else:
+            status1.set(f"⏳ 正在取消：{job.name}")
+
+    def cancel_all_converts():
+        """
+        取消所有排队中和运行中的转换任务
+        :return: 无返回值
+        """
+        count = convert_runner.cancel_all()
+        status1.set(f"⏳ 正在取消 {count} 个任务" if count else "没有待完成的转换任务")
+
+    def handle_convert_event(event):
+        """
+        处理转换任务队列的一个事件，更新进度条与状态提示（在界面线程中调用）
+        :param event: JobRunner事件元组
+        :return: 无返回值
+        """
+        kind, job = event[0], event[1]
+        is_image = job_kinds.get(job.id) == "image"
+        if kind == "start":
+            # 任务真正开始运行时才开始计时，排队时间不计入速率
+            trackers[job.id] = ProgressTracker("帧")
+            progress_var.set(0)
+            progress_label.set("处理图像..." if is_image else "处理帧:")
+            status1.set(f"⏳ 正在转换：{job.name}（待完成任务 {convert_runner.pending()} 个）")
+            return
+        if kind == "progress":
+            if is_image:
+                # 图像整块一次算完，只在完成时报告一次，不显示速率
+                progress_var.set(100)
+                progress_label.set("图像点阵计算完成")
             else:
-                status1.set("⚠️ 不支持的文件类型")
-        except Exception as e:
-            status1.set(f"❌ 出错: {e}")
+                update_progress(event[2], event[3], "处理帧:", trackers[job.id])
+            return
+
+        trackers.pop(job.id, None)
+        job_kinds.pop(job.id, None)
+        if kind == "done":
+            if is_image:
+                status1.set(f"✅ 图像转换完成：{job.name}")
+            else:
+                status1.set(f"🎞 视频转换完成：{job.name}，共提取 {len(job.result)} 帧")
+        elif kind == "cancelled":
+            progress_var.set(0)
+            progress_label.set("已取消")
+            status1.set(f"⏹ 已取消：{job.name}，已删除 {job.removed} 个部分输出文件")
+        else:
+            text = f"❌ {job.name} 出错: {job.error}"
+            if job.removed:
+                text += f"，已删除 {job.removed} 个部分输出文件"
+            status1.set(text)
+
+    def poll_jobs():
+        """
+        定时取出后台任务队列的事件并更新界面（后台线程不直接操作Tk控件）
+        :return: 无返回值
+        """
+        for event in convert_runner.poll():
+            handle_convert_event(event)
+        for event in char_runner.poll():
+            handle_char_event(event)
+        for event in preview_runner.poll():
+            handle_preview_event(event)
+        for event in sim_runner.poll():
+            handle_sim_event(event)
+        root.after(JOB_POLL_INTERVAL, poll_jobs)
 
     # 构建图像/视频转换的UI组件
     tk.Label(convert_tab, text="输入文件路径").pack(anchor="w", padx=10, pady=(10, 0))
@@ -313,8 +533,28 @@ def gui_main():
     tk.Entry(param_frame, textvariable=frame_count, width=5).grid(row=0, column=5)
     param_frame.pack(pady=10)
 
+    # 颜色调整预览：滑块只在缓存的低分辨率代理上重跑颜色阶段，预览即时更新
+    adjust_frame = tk.LabelFrame(convert_tab, text="颜色调整预览")
+    for row, (label, var) in enumerate((("亮度", brightness), ("对比度", contrast), ("饱和度", saturation))):
+        tk.Label(adjust_frame, text=label).grid(row=row, column=0, padx=5, sticky="e")
+        tk.Scale(adjust_frame, variable=var, from_=0.0, to=2.0, resolution=0.05, orient="horizontal", length=220,
+                 showvalue=True, command=schedule_preview).grid(row=row, column=1, padx=5)
+    adjust_btn_frame = tk.Frame(adjust_frame)
+    tk.Button(adjust_btn_frame, text="刷新预览", command=load_preview).pack(side="left", padx=5)
+    tk.Button(adjust_btn_frame, text="恢复默认", command=reset_adjustments).pack(side="left", padx=5)
+    tk.Button(adjust_btn_frame, text="应用并转换", command=do_convert).pack(side="left", padx=5)
+    adjust_btn_frame.grid(row=3, column=0, columnspan=2, pady=5)
+    preview_label = tk.Label(adjust_frame)
+    preview_label.grid(row=0, column=2, rowspan=4, padx=10)
+    tk.Label(adjust_frame, textvariable=preview_info).grid(row=4, column=0, columnspan=3, sticky="w", padx=5)
+    adjust_frame.pack(fill="x", padx=10, pady=5)
+
     # 转换按钮和状态提示
-    tk.Button(convert_tab, text="开始转换", command=do_convert, bg="#007acc", fg="white", width=20).pack(pady=5)
+    convert_btn_frame = tk.Frame(convert_tab)
+    tk.Button(convert_btn_frame, text="开始转换", command=do_convert, bg="#007acc", fg="white", width=20).grid(row=0, column=0, padx=5)
+    tk.Button(convert_btn_frame, text="取消当前任务", command=cancel_convert).grid(row=0, column=1, padx=5)
+    tk.Button(convert_btn_frame, text="取消全部", command=cancel_all_converts).grid(row=0, column=2, padx=5)
+    convert_btn_frame.pack(pady=5)
     tk.Label(convert_tab, textvariable=status1, fg="green").pack()
 
     # 进度条提示信息
@@ -324,9 +564,6 @@ def gui_main():
     tk.Label(progress_frame, textvariable=progress_label).pack(side="left")
     ttk.Progressbar(progress_frame, variable=progress_var, maximum=100).pack(side="left", expand=True, fill="x", padx=5)
 
-    progress_hint = tk.Label(root, text="⚠ 当前进度条显示可能不同步，请以终端输出为准。", fg="red")
-    progress_hint.pack()
-
     progress_hint = tk.Label(root, text="注意：限制图像分辨率最大为 256×128，建议不要超过该尺寸。", fg="red")
     progress_hint.pack()
 
@@ -349,6 +586,11 @@ def gui_main():
     height2 = tk.IntVar()
     # 模拟器状态提示
     status2 = tk.StringVar()
+    # 是否监视帧文件变化（热重载）
+    watch_frames = tk.BooleanVar(value=False)
+    # 帧数据读取的后台任务队列与当前读取请求（读取完成后在界面线程通知子进程加载）
+    sim_runner = JobRunner()
+    sim_state = {"request": None}
 
     def browse_json():
         """
@@ -372,23 +614,23 @@ def gui_main():
 
     def start_sim():
         """
-        启动WS2812点阵帧播放模拟器，在新线程中运行，避免阻塞UI
-        先终止旧的模拟器实例，再加载新的帧数据并启动
+        启动WS2812点阵帧播放模拟器，在独立进程中运行，避免与UI竞争GIL
+        先终止旧的模拟器进程，再加载新的帧数据并启动
         :return: 无返回值
         """
-        global simulator, sim_thread
+        global simulator
         file = json_path.get()
         if not file:
             status2.set("❗请先选择 JSON 帧文件")
             return
 
-        # 终止旧实例
+        # 终止旧实例，作废尚未完成的帧读取
+        if sim_state["request"] is not None:
+            sim_state["request"].cancel()
+            sim_state["request"] = None
         if simulator:
-            # 发送停止信号
-            simulator.stop_event.set()
-            if sim_thread:
-                sim_thread.join(timeout=0.5)
-            pygame.quit()
+            simulator.stop(timeout=0.5)
+            simulator = None
 
         # 智能匹配帧文件（支持帧序列的通配符匹配）
         base_prefix = re.sub(r'_frame_\d+\.json$', '_frame_*.json', file)
@@ -407,17 +649,51 @@ def gui_main():
             status2.set("❌ 无法读取帧尺寸")
             return
 
-        # 定义模拟器运行函数，用于线程执行
-        def run_sim():
-            global simulator
-            simulator = WS2812Simulator(width2.get(), height2.get(), 800)
-            simulator.load_frames(base_prefix)
-            simulator.run()
+        from ws_converter.sim_process import SimulatorProcess
+
+        # 启动仿真器子进程，帧数据在后台线程写入共享内存，完成后由handle_sim_event通知子进程加载
+        # 仿真窗口失焦或最小化时降到10帧/秒，减少后台预览的CPU占用
+        simulator = SimulatorProcess(width2.get(), height2.get(), 800, watch=watch_frames.get(), background_fps=10)
+        sim_state["request"] = sim_runner.submit(os.path.basename(base_prefix), sim_load_job, simulator, base_prefix)
+        status2.set("⏳ 正在读取帧数据...")
+        root.after(200, poll_sim)
 
-        # 启动新线程运行模拟器（守护线程，随主程序退出）
-        sim_thread = threading.Thread(target=run_sim, daemon=True)
-        sim_thread.start()
-        status2.set("▶️ 播放中 (空格键暂停/播放)")
+    def handle_sim_event(event):
+        """
+        处理帧数据读取任务的结束事件：仿真器仍是发起读取的实例时通知子进程加载，否则销毁读取结果（在界面线程中调用）
+        :param event: JobRunner事件元组
+        :return: 无返回值
+        """
+        kind, job = event[0], event[1]
+        if kind in ("start", "progress"):
+            return
+        if job is sim_state["request"]:
+            sim_state["request"] = None
+        sim = job.args[0]
+        if kind == "done":
+            if sim is simulator and sim.is_alive():
+                count = sim.attach_frames(job.result)
+                status2.set(f"▶️ 播放中，共 {count} 帧 (空格键暂停/播放)")
+            else:
+                sim.discard_frames(job.result)
+        elif kind == "failed" and sim is simulator:
+            status2.set(f"❌ 读取帧数据失败: {job.error}")
+
+    def poll_sim():
+        """
+        定时读取仿真器子进程上报的播放状态；子进程退出（窗口关闭）后停止轮询并释放资源
+        :return: 无返回值
+        """
+        global simulator
+        if not simulator:
+            return
+        state = simulator.poll_state()
+        if not state["running"]:
+            simulator.stop(timeout=0.5)
+            simulator = None
+            status2.set("⏹ 模拟器已关闭")
+            return
+        root.after(200, poll_sim)
 
     def stop_sim():
         """
@@ -426,7 +702,7 @@ def gui_main():
         """
         global simulator
         if simulator:
-            simulator.playing = False
+            simulator.pause()
             status2.set("⏸ 播放已停止")
 
     def next_frame():
@@ -436,8 +712,9 @@ def gui_main():
         """
         global simulator
         if simulator:
-            simulator.current_frame = min(simulator.current_frame + 1, len(simulator.frames) - 1)
-            status2.set(f"下一帧: {simulator.current_frame}")
+            simulator.step(1)
+            frame = min(simulator.state["frame"] + 1, max(simulator.state["frame_count"] - 1, 0))
+            status2.set(f"下一帧: {frame}")
 
     def prev_frame():
         """
@@ -446,8 +723,8 @@ def gui_main():
         """
         global simulator
         if simulator:
-            simulator.current_frame = max(simulator.current_frame - 1, 0)
-            status2.set(f"上一帧: {simulator.current_frame}")
+            simulator.step(-1)
+            status2.set(f"上一帧: {max(simulator.state['frame'] - 1, 0)}")
 
     # === Tab3: 像素矩阵编辑器 ===
     editor_tab = ttk.Frame(tab_control)
@@ -466,8 +743,9 @@ def gui_main():
        - 点击像素格绘制颜色
        - 拖拽鼠标连续绘制
        - 使用工具栏按钮：新建/导入/保存模板
+       - 滚轮滚动画布，Shift+滚轮水平滚动，Ctrl+滚轮缩放
     3. 文件规范：
-       - 支持最大256x128像素矩阵
+       - 支持最大4096x4096像素矩阵（只渲染可见区域）
        - 使用RGB565格式存储
     """
 
@@ -535,7 +813,8 @@ def gui_main():
                 editor_container = tk.Frame(editor_window)
                 editor_container.pack(expand=True, fill="both", padx=10, pady=10)
 
-                # 初始化编辑器
+                # 初始化编辑器（首次打开时才导入编辑器模块）
+                from ws_converter.editor import PixelEditor
                 editor = PixelEditor(editor_container)
 
                 # 绑定父子窗口关系
@@ -594,13 +873,16 @@ def gui_main():
     tab_control.bind("<<NotebookTabChanged>>", create_editor_window)
 
     def on_closing():
-        global simulator, sim_thread
+        global simulator
         if simulator:
-            # 发送停止信号
-            simulator.stop_event.set()
-        if sim_thread and sim_thread.is_alive():
-            sim_thread.join(timeout=0.5)
-        pygame.quit()
+            # 通知仿真器子进程退出并销毁共享内存
+            simulator.stop(timeout=0.5)
+            simulator = None
+        # 取消后台转换任务，运行中的任务在下一个帧/行边界退出
+        convert_runner.shutdown()
+        char_runner.shutdown()
+        preview_runner.shutdown()
+        sim_runner.shutdown()
         root.destroy()
 
     # 播放器 UI
@@ -613,6 +895,7 @@ def gui_main():
     tk.Entry(param_frame2, textvariable=width2, width=5).grid(row=0, column=1)
     tk.Label(param_frame2, text="高").grid(row=0, column=2, padx=5)
     tk.Entry(param_frame2, textvariable=height2, width=5).grid(row=0, column=3)
+    tk.Checkbutton(param_frame2, text="监视文件变化（自动热重载）", variable=watch_frames).grid(row=0, column=4, padx=5)
     param_frame2.pack(pady=10)
 
     ctrl_frame = tk.Frame(play_tab)
@@ -636,6 +919,8 @@ def gui_main():
     # 输出JSON路径
     char_output_path = tk.StringVar()
     char_status = tk.StringVar(value="准备就绪")
+    # 字符转换的后台任务队列（与图像/视频转换分开，不必排在长视频之后）
+    char_runner = JobRunner()
     # 颜色变量（十六进制格式，默认白色字、黑色背景）
     text_color = tk.StringVar(value="#ffffff")
     bg_color = tk.StringVar(value="#000000")
@@ -690,7 +975,7 @@ def gui_main():
 
     def do_char_convert():
         """
-        执行单个字符到WS2812点阵JSON的转换操作，支持自定义文字和背景颜色
+        将单个字符到WS2812点阵JSON的转换提交到后台执行，支持自定义文字和背景颜色
         :return: 无返回值
         """
         try:
@@ -706,25 +991,32 @@ def gui_main():
             # 转换颜色（十六进制→RGB元组）
             text_rgb = hex_to_rgb(text_color.get())
             bg_rgb = hex_to_rgb(bg_color.get())
-
-            # 调用核心转换逻辑（传入颜色参数）
-            from ws_converter.char_converter import char_to_matrix
-            char_to_matrix(
-                char, w, h,
-                output_path=out_path,
-                # 自定义文字色
-                text_color=text_rgb,
-                # 自定义背景色
-                bg_color=bg_rgb
-            )
-
-            char_status.set(f"✅ 字符「{char}」转换完成！已保存至{out_path}")
-        except ValueError as e:
+        except (ValueError, tk.TclError) as e:
             char_status.set(f"❌ 错误：{e}")
-        except FileNotFoundError as e:
-            char_status.set(f"❌ 字体文件错误：{e}")
-        except Exception as e:
-            char_status.set(f"❌ 未知错误：{str(e)}")
+            return
+
+        # 字体加载与光栅化在后台线程执行，预览图保存在JSON旁边
+        char_runner.submit(char, char_convert_job, char, w, h, out_path, text_rgb, bg_rgb,
+                           os.path.splitext(out_path)[0] + "_preview.png")
+        char_status.set(f"⏳ 正在转换字符「{char}」...")
+
+    def handle_char_event(event):
+        """
+        处理字符转换任务的结束事件，更新状态提示（在界面线程中调用）
+        :param event: JobRunner事件元组
+        :return: 无返回值
+        """
+        kind, job = event[0], event[1]
+        if kind == "done":
+            char_status.set(f"✅ 字符「{job.name}」转换完成！已保存至{job.result}")
+        elif kind == "failed":
+            e = job.error
+            if isinstance(e, ValueError):
+                char_status.set(f"❌ 错误：{e}")
+            elif isinstance(e, FileNotFoundError):
+                char_status.set(f"❌ 字体文件错误：{e}")
+            else:
+                char_status.set(f"❌ 未知错误：{str(e)}")
 
     # 1. 字符输入区域
     tk.Label(char_tab, text="输入单个字符（中文/英文/数字）：", font=("微软雅黑", 12)).pack(anchor="w", padx=10,
@@ -774,6 +1066,7 @@ def gui_main():
     tab_control.pack(expand=1, fill="both")
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
+    root.after(JOB_POLL_INTERVAL, poll_jobs)
     root.mainloop()
 
 # ======================================== 自定义类 ============================================
@@ -783,4 +1076,6 @@ def gui_main():
 # ========================================  主程序  ===========================================
 
 if __name__ == "__main__":
+    # 打包为可执行文件后，spawn方式启动的仿真器子进程需要此调用
+    multiprocessing.freeze_support()
     gui_main()
\ No newline at end of file
@@ -0,0 +1,51 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_char_converter.py
+# @Description : 批量字符转换检查：返回的统计信息、已是最新的输出跳过、参数变化后全部重新转换
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import json
+import pytest
+from ws_converter.char_converter import convert_chars, get_default_font
+
+# ======================================== 全局变量 ============================================
+
+# ======================================== 功能函数 ============================================
+
+@pytest.fixture(autouse=True)
+def require_font():
+    """
+    没有可用字体时跳过本文件的测试
+    :return: 无返回值
+    """
+    try:
+        get_default_font()
+    except FileNotFoundError:
+        pytest.skip("系统中没有可用字体")
+
+def test_convert_chars_stats_and_skip(tmp_path, capsys):
+    out = tmp_path / "chars"
+    stats = convert_chars("abca汉", str(out), 8, 8, workers=1)
+    assert (stats["converted"], stats["skipped"]) == (4, 0)
+    assert stats["elapsed"] >= 0 and stats["rate"] >= 0
+    # 统计信息由调用方输出，库函数本身不打印
+    assert capsys.readouterr().out == ""
+    with open(stats["manifest"], encoding="utf-8") as f:
+        entries = json.load(f)["chars"]
+    assert sorted(entries) == sorted("abc汉")
+    assert all((out / name).exists() for name in entries.values())
+
+    again = convert_chars("abc汉d", str(out), 8, 8, workers=1)
+    assert (again["converted"], again["skipped"]) == (1, 4)
+
+    resized = convert_chars("abc", str(out), 10, 8, workers=1)
+    assert (resized["converted"], resized["skipped"]) == (3, 0)
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,63 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_converter.py
+# @Description : 转换器检查：颜色调整与RGB565编码的数组版与逐像素标量版结果一致
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import numpy as np
+import pytest
+from ws_converter.color import rgb888_to_rgb565
+from ws_converter.converter import adjust_color_array, apply_color_adjustments, colors_to_rgb565
+
+# ======================================== 全局变量 ============================================
+
+# 颜色调整系数组合(亮度, 对比度, 饱和度)：含默认值、增强、减弱、去色与反相等边界情况
+ADJUSTMENTS = [
+    (1.0, 1.0, 1.0),
+    (1.2, 1.0, 1.0),
+    (0.7, 1.5, 1.3),
+    (1.0, 0.4, 0.0),
+    (1.3, 2.0, 2.5),
+    (0.5, -1.0, -0.5),
+]
+
+# ======================================== 功能函数 ============================================
+
+def random_colors(seed, shape=(12, 17)):
+    """
+    生成随机RGB颜色（包含纯黑、纯白等极值）
+    :param seed: 随机种子
+    :param shape: 颜色数组的前几维形状
+    :return: 形状为shape + (3,)的uint8数组
+    """
+    colors = np.random.default_rng(seed).integers(0, 256, shape + (3,), dtype=np.uint8)
+    colors[0, 0] = (0, 0, 0)
+    colors[0, 1] = (255, 255, 255)
+    colors[0, 2] = (255, 0, 128)
+    return colors
+
+@pytest.mark.parametrize("seed, adjustment", list(enumerate(ADJUSTMENTS)))
+def test_adjust_color_array_matches_scalar(seed, adjustment):
+    brightness, contrast, saturation = adjustment
+    colors = random_colors(seed)
+    expected = np.array([apply_color_adjustments(*map(int, c), brightness, contrast, saturation)
+                         for c in colors.reshape(-1, 3)], dtype=np.uint8).reshape(colors.shape)
+    actual = adjust_color_array(colors, brightness, contrast, saturation)
+    assert actual.dtype == np.uint8 and actual.shape == colors.shape
+    np.testing.assert_array_equal(actual, expected)
+
+@pytest.mark.parametrize("brightness, contrast, saturation", ADJUSTMENTS[:3])
+def test_colors_to_rgb565_matches_scalar(brightness, contrast, saturation):
+    colors = random_colors(7)
+    expected = [rgb888_to_rgb565(*apply_color_adjustments(*map(int, c), brightness, contrast, saturation))
+                for c in colors.reshape(-1, 3)]
+    assert colors_to_rgb565(colors, brightness, contrast, saturation) == expected
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
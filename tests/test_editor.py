@@ -0,0 +1,142 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_editor.py
+# @Description : 像素编辑器检查：撤销/重做历史、种子填充、Bresenham直线与点阵数据校验（不创建窗口）
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+from collections import deque
+import numpy as np
+import pytest
+from ws_converter.editor import EditHistory, flood_fill, line_cells, pixels_from_data
+
+# ======================================== 全局变量 ============================================
+
+# 八个卦限方向的直线终点（起点为原点）
+OCTANT_ENDPOINTS = [(7, 3), (3, 7), (-3, 7), (-7, 3), (-7, -3), (-3, -7), (3, -7), (7, -3)]
+
+# ======================================== 功能函数 ============================================
+
+def apply_change(flat, change):
+    """
+    将撤销/重做返回的变化写入展开的像素数组
+    :param flat: 一维像素数组（原地修改）
+    :param change: (像素索引数组, 值数组)
+    :return: 无返回值
+    """
+    indices, values = change
+    flat[indices] = values
+
+def bfs_fill(arr, x, y, color):
+    """
+    逐像素广度优先的四连通填充，作为flood_fill的参考实现
+    :param arr: 形状为(高, 宽)的数组（原地修改）
+    :param x: 种子列坐标
+    :param y: 种子行坐标
+    :param color: 填充颜色
+    :return: 无返回值
+    """
+    h, w = arr.shape
+    target = arr[y, x]
+    if target == color:
+        return
+    queue = deque([(x, y)])
+    arr[y, x] = color
+    while queue:
+        cx, cy = queue.popleft()
+        for nx, ny in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)):
+            if 0 <= nx < w and 0 <= ny < h and arr[ny, nx] == target:
+                arr[ny, nx] = color
+                queue.append((nx, ny))
+
+def test_history_undo_redo_round_trip():
+    rng = np.random.default_rng(1)
+    original = rng.integers(0, 4, 64).astype(np.uint16)
+    flat = original.copy()
+    history = EditHistory(1 << 20)
+    states = [flat.copy()]
+    for _ in range(5):
+        indices = rng.choice(64, 10, replace=False)
+        new = rng.integers(0, 4, 10).astype(np.uint16)
+        history.record(indices, flat[indices], new)
+        flat[indices] = new
+        states.append(flat.copy())
+
+    for expected in reversed(states[:-1]):
+        apply_change(flat, history.undo())
+        np.testing.assert_array_equal(flat, expected)
+    assert history.undo() is None
+    for expected in states[1:]:
+        apply_change(flat, history.redo())
+        np.testing.assert_array_equal(flat, expected)
+    assert history.redo() is None
+
+def test_history_record_clears_redo_and_skips_noop():
+    history = EditHistory(1 << 20)
+    assert not history.record([0, 1], [5, 6], [5, 6])
+    history.record([0], [1], [2])
+    history.undo()
+    history.record([3], [1], [2])
+    assert history.redo() is None
+
+def test_history_evicts_oldest_at_cap():
+    op_size = EditHistory.operation_size(EditHistory.make_operation(np.arange(8), np.zeros(8), np.ones(8)))
+    history = EditHistory(op_size * 3)
+    for i in range(6):
+        # 每次操作修改不相邻的一段，便于按索引区分
+        history.record(np.arange(i * 10, i * 10 + 8), np.zeros(8), np.ones(8))
+    assert history.nbytes <= op_size * 3
+    assert len(history.undo_ops) == 3
+    remaining = [int(history.undo()[0][0]) for _ in range(3)]
+    assert remaining == [50, 40, 30]
+    assert history.undo() is None
+
+def test_history_keeps_single_oversized_operation():
+    history = EditHistory(16)
+    assert history.record(np.arange(100), np.zeros(100), np.ones(100))
+    assert len(history.undo_ops) == 1
+
+@pytest.mark.parametrize("seed", range(5))
+def test_flood_fill_matches_bfs(seed):
+    rng = np.random.default_rng(seed)
+    arr = rng.integers(0, 3, (23, 31)).astype(np.uint16)
+    for _ in range(5):
+        x, y = int(rng.integers(31)), int(rng.integers(23))
+        color = int(rng.integers(0, 4))
+        expected = arr.copy()
+        bfs_fill(expected, x, y, color)
+        flood_fill(arr, x, y, color)
+        np.testing.assert_array_equal(arr, expected)
+
+@pytest.mark.parametrize("x1, y1", OCTANT_ENDPOINTS)
+def test_line_cells_octants(x1, y1):
+    cells = line_cells(0, 0, x1, y1)
+    assert cells[0] == (0, 0)
+    assert cells[-1] == (x1, y1)
+    # 主方向每步前进一格，相邻像素八连通且不重复
+    assert len(cells) == max(abs(x1), abs(y1)) + 1
+    for (ax, ay), (bx, by) in zip(cells, cells[1:]):
+        assert max(abs(bx - ax), abs(by - ay)) == 1
+    # 反向绘制覆盖同样数量的像素
+    assert len(line_cells(x1, y1, 0, 0)) == len(cells)
+
+def test_line_cells_degenerate():
+    assert line_cells(2, 3, 2, 3) == [(2, 3)]
+    assert line_cells(0, 0, 4, 0) == [(x, 0) for x in range(5)]
+    assert line_cells(0, 0, 0, -3) == [(0, -y) for y in range(4)]
+
+def test_pixels_from_data_validates_once():
+    arr = pixels_from_data({"pixels": list(range(6)), "width": 3, "height": 2})
+    assert arr.shape == (2, 3) and arr.dtype == np.uint16
+    with pytest.raises(ValueError, match="像素数"):
+        pixels_from_data({"pixels": [0] * 5, "width": 3, "height": 2})
+    with pytest.raises(ValueError, match="缺少字段"):
+        pixels_from_data({"width": 3, "height": 2})
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,110 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_font_atlas.py
+# @Description : 点阵字库检查：按码点二分查找字形、字形解包、字库文件格式校验与导出统计
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import numpy as np
+import pytest
+from ws_converter.char_converter import get_char_mask, get_default_font
+from ws_converter.font_atlas import ATLAS_HEADER, ATLAS_MAGIC, ATLAS_VERSION, FontAtlas, build_charset, \
+    export_font_atlas
+
+# ======================================== 全局变量 ============================================
+
+# 测试字形尺寸（宽度不是8的整数倍，覆盖按行打包的补位）
+GLYPH_W = 10
+GLYPH_H = 6
+# 测试字库包含的字符（含多字节码点，按码点升序写入）
+ATLAS_CHARS = sorted("ACEGIKM0248永汉字")
+
+# ======================================== 功能函数 ============================================
+
+def write_atlas(path, chars, masks, magic=ATLAS_MAGIC, version=ATLAS_VERSION):
+    """
+    按字库文件格式直接写出测试字库（不依赖系统字体）
+    :param path: 输出路径
+    :param chars: 按码点升序排列的字符列表
+    :param masks: 形状为(字符数, GLYPH_H, GLYPH_W)的bool数组
+    :param magic: 文件魔数
+    :param version: 文件版本
+    :return: 无返回值
+    """
+    glyphs = np.packbits(masks, axis=-1)
+    glyph_bytes = glyphs.shape[1] * glyphs.shape[2]
+    with open(path, "wb") as f:
+        f.write(ATLAS_HEADER.pack(magic, version, 0, GLYPH_W, GLYPH_H, glyph_bytes, len(chars)))
+        f.write(np.array([ord(c) for c in chars], dtype="<u4").tobytes())
+        f.write(glyphs.tobytes())
+
+@pytest.fixture
+def atlas(tmp_path):
+    """
+    写出随机字形的测试字库并加载
+    :return: (FontAtlas对象, 字形掩码数组)
+    """
+    masks = np.random.default_rng(0).random((len(ATLAS_CHARS), GLYPH_H, GLYPH_W)) > 0.5
+    path = tmp_path / "test.wsfa"
+    write_atlas(path, ATLAS_CHARS, masks)
+    return FontAtlas(str(path)), masks
+
+def test_find_every_glyph(atlas):
+    font, masks = atlas
+    assert len(font) == len(ATLAS_CHARS)
+    for i, ch in enumerate(ATLAS_CHARS):
+        assert font.find(ch) == i
+        assert ch in font
+        np.testing.assert_array_equal(font.get_mask(ch), masks[i])
+
+@pytest.mark.parametrize("ch", ["B", "1", "9", " ", "\x00", "￿", "😀"])
+def test_find_missing_glyph(atlas, ch):
+    font, _ = atlas
+    # 码点介于已有字形之间、小于最小或大于最大时都返回-1
+    assert font.find(ch) == -1
+    assert ch not in font
+    assert font.get_mask(ch) is None
+
+def test_find_matches_linear_search(atlas):
+    font, _ = atlas
+    codepoints = [ord(c) for c in ATLAS_CHARS]
+    for cp in range(0, 0x7000, 7):
+        expected = codepoints.index(cp) if cp in codepoints else -1
+        assert font.find(chr(cp)) == expected
+
+def test_rejects_bad_header(tmp_path):
+    masks = np.zeros((1, GLYPH_H, GLYPH_W), dtype=bool)
+    write_atlas(tmp_path / "magic.wsfa", ["A"], masks, magic=b"XXXX")
+    with pytest.raises(ValueError):
+        FontAtlas(str(tmp_path / "magic.wsfa"))
+    write_atlas(tmp_path / "version.wsfa", ["A"], masks, version=ATLAS_VERSION + 1)
+    with pytest.raises(ValueError):
+        FontAtlas(str(tmp_path / "version.wsfa"))
+
+def test_build_charset_sorted_unique():
+    assert build_charset(chars="cabba\n") == ["a", "b", "c"]
+    ascii_chars = build_charset("ascii")
+    assert ascii_chars[0] == " " and ascii_chars[-1] == "~" and len(ascii_chars) == 95
+    with pytest.raises(ValueError):
+        build_charset("latin1")
+
+def test_export_round_trip(tmp_path):
+    try:
+        font_path = get_default_font()
+    except FileNotFoundError:
+        pytest.skip("系统中没有可用字体")
+    path = tmp_path / "atlas" / "ascii.wsfa"
+    stats = export_font_atlas(str(path), GLYPH_W, GLYPH_H, chars="zAb", workers=1)
+    assert stats["glyphs"] == 3
+    assert stats["bytes"] == path.stat().st_size
+    font = FontAtlas(str(path))
+    for ch in "Abz":
+        np.testing.assert_array_equal(font.get_mask(ch), get_char_mask(font_path, GLYPH_H - 2, ch, GLYPH_W, GLYPH_H))
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
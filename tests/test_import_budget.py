@@ -0,0 +1,66 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_import_budget.py
+# @Description : 启动耗时检查：在全新子进程中执行cli_app.py convert转换图片，确认不加载重量级依赖且导入耗时在预算内
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+from PIL import Image
+
+# ======================================== 全局变量 ============================================
+
+# 仓库根目录
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 转换图片时不应加载的模块
+HEAVY_MODULES = ("pygame", "cv2", "tqdm")
+# 导入cli_app的耗时预算（毫秒）；顶层重新导入pygame或OpenCV会明显超出
+IMPORT_BUDGET_MS = 200
+
+# 子进程中执行的检查脚本：计时导入cli_app，再按命令行方式转换图片，最后输出已加载的重量级模块
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import cli_app
+import_ms = (time.perf_counter() - start) * 1000
+sys.argv = ["cli_app.py", "convert", "-i", sys.argv[1], "-o", sys.argv[2], "-W", "8", "-H", "8"]
+cli_app.main()
+print(json.dumps({"import_ms": import_ms, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY_MODULES,)
+
+# ======================================== 功能函数 ============================================
+
+def run_probe(tmp_path):
+    """
+    在全新解释器中执行检查脚本
+    :param tmp_path: 临时目录
+    :return: (检查结果字典, 输出目录)
+    """
+    image = tmp_path / "probe.png"
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(image)
+    out_dir = tmp_path / "out"
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    proc = subprocess.run([sys.executable, "-c", PROBE, str(image), str(out_dir)], cwd=REPO_DIR, env=env,
+                          capture_output=True, text=True, timeout=60, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), out_dir
+
+def test_convert_image_skips_heavy_modules(tmp_path):
+    result, out_dir = run_probe(tmp_path)
+    assert (out_dir / "probe.json").exists()
+    assert result["loaded"] == []
+
+def test_cli_import_within_budget(tmp_path):
+    result, _ = run_probe(tmp_path)
+    assert result["import_ms"] < IMPORT_BUDGET_MS, f"导入cli_app耗时 {result['import_ms']:.0f} ms"
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
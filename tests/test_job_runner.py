@@ -0,0 +1,111 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_job_runner.py
+# @Description : 后台转换任务检查：任务取消或中途失败时删除已写出的部分输出文件
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import os
+import time
+import numpy as np
+import pytest
+from ws_converter import converter
+from ws_converter.converter import ConversionFailed, convert_video_to_json
+from ws_converter.job_runner import JobRunner, JOB_CANCELLED, JOB_DONE, JOB_FAILED
+
+cv2 = pytest.importorskip("cv2")
+
+# ======================================== 全局变量 ============================================
+
+# 等待任务结束的超时时间（秒）
+WAIT_TIMEOUT = 30
+
+# ======================================== 功能函数 ============================================
+
+def make_video(path, frames=6, size=32):
+    """
+    生成测试视频（每帧为不同灰度）
+    :param path: 输出路径（.avi）
+    :param frames: 帧数
+    :param size: 画面边长
+    :return: 视频路径字符串
+    """
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10, (size, size))
+    for i in range(frames):
+        writer.write(np.full((size, size, 3), i * 40, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+def wait_finished(runner):
+    """
+    轮询事件队列直到任务结束
+    :param runner: JobRunner对象
+    :return: 结束事件的类型
+    """
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        for event in runner.poll():
+            if event[0] in (JOB_DONE, JOB_CANCELLED, JOB_FAILED):
+                return event[0]
+        time.sleep(0.01)
+    raise TimeoutError("任务未在超时时间内结束")
+
+def failing_after(count, func):
+    """
+    包装函数：前count次调用正常执行，之后抛出OSError（模拟磁盘写满等中途错误）
+    :param count: 正常执行的次数
+    :param func: 被包装的函数
+    :return: 包装后的函数
+    """
+    calls = {"n": 0}
+    def wrapper(*args, **kwargs):
+        calls["n"] += 1
+        if calls["n"] > count:
+            raise OSError("No space left on device")
+        return func(*args, **kwargs)
+    return wrapper
+
+def test_video_failure_reports_partial_outputs(tmp_path, monkeypatch):
+    video = make_video(tmp_path / "clip.avi")
+    monkeypatch.setattr(converter, "colors_to_rgb565", failing_after(3, converter.colors_to_rgb565))
+    with pytest.raises(ConversionFailed) as info:
+        convert_video_to_json(video, str(tmp_path / "out"), 4, 4, 6, progress=lambda done, total: None)
+    assert len(info.value.outputs) == 3
+    assert isinstance(info.value.error, OSError)
+    assert isinstance(info.value.__cause__, OSError)
+
+def test_runner_removes_outputs_of_failed_job(tmp_path, monkeypatch):
+    video = make_video(tmp_path / "clip.avi")
+    out_dir = tmp_path / "out"
+    monkeypatch.setattr(converter, "colors_to_rgb565", failing_after(3, converter.colors_to_rgb565))
+    runner = JobRunner()
+    try:
+        job = runner.submit("clip", convert_video_to_json, video, str(out_dir), 4, 4, 6)
+        assert wait_finished(runner) == JOB_FAILED
+    finally:
+        runner.shutdown()
+    assert job.status == JOB_FAILED
+    assert isinstance(job.error, OSError)
+    assert job.removed == 3
+    assert list(out_dir.iterdir()) == []
+
+def test_runner_keeps_outputs_of_finished_job(tmp_path):
+    video = make_video(tmp_path / "clip.avi")
+    out_dir = tmp_path / "out"
+    runner = JobRunner()
+    try:
+        job = runner.submit("clip", convert_video_to_json, video, str(out_dir), 4, 4, 6)
+        assert wait_finished(runner) == JOB_DONE
+    finally:
+        runner.shutdown()
+    assert job.removed == 0
+    assert sorted(p.name for p in out_dir.iterdir()) == sorted(os.path.basename(p) for p in job.result)
+    assert len(job.result) == 6
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,110 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_marquee.py
+# @Description : 滚动文字检查：窗口切片生成的滚动帧与逐帧参考实现一致，循环序列首尾衔接，重新生成时清理旧帧
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import os
+import numpy as np
+import pytest
+from ws_converter.char_converter import get_default_font
+from ws_converter.marquee import marquee_frames, text_to_marquee
+
+# ======================================== 全局变量 ============================================
+
+# 测试点阵宽度
+WIDTH = 8
+
+# ======================================== 功能函数 ============================================
+
+def random_mask(seed, height=5, text_w=13):
+    """
+    生成随机的文字宽位图掩码
+    :param seed: 随机种子
+    :param height: 掩码高度
+    :param text_w: 掩码宽度
+    :return: 形状为(height, text_w)的bool数组
+    """
+    return np.random.default_rng(seed).random((height, text_w)) > 0.5
+
+def reference_loop(mask, width, speed):
+    """
+    逐帧参考实现：文字后接一屏空白组成循环带，每帧从循环带上按偏移取宽度为width的窗口
+    :param mask: 文字掩码
+    :param width: 点阵宽度
+    :param speed: 每帧移动的列数
+    :return: 帧列表
+    """
+    h, text_w = mask.shape
+    period = text_w + width
+    period += (-period) % speed
+    strip = np.zeros((h, period), dtype=bool)
+    strip[:, :text_w] = mask
+    return [strip[:, (np.arange(width) + offset) % period] for offset in range(0, period, speed)]
+
+@pytest.mark.parametrize("speed", [1, 2, 3, 5])
+def test_loop_matches_reference(speed):
+    mask = random_mask(speed)
+    frames = marquee_frames(mask, WIDTH, speed=speed)
+    expected = reference_loop(mask, WIDTH, speed)
+    assert frames.shape == (len(expected), mask.shape[0], WIDTH)
+    for frame, ref in zip(frames, expected):
+        np.testing.assert_array_equal(frame, ref)
+
+@pytest.mark.parametrize("speed", [1, 4])
+def test_loop_is_seamless(speed):
+    mask = random_mask(10)
+    frames = marquee_frames(mask, WIDTH, speed=speed)
+    # 相邻帧（包括末帧到首帧）都恰好平移speed列
+    for cur, nxt in zip(frames, np.concatenate((frames[1:], frames[:1]))):
+        np.testing.assert_array_equal(cur[:, speed:], nxt[:, :WIDTH - speed])
+    assert frames[0].any()
+
+def test_right_is_reversed_left():
+    mask = random_mask(3)
+    left = marquee_frames(mask, WIDTH, speed=2)
+    right = marquee_frames(mask, WIDTH, speed=2, direction="right")
+    np.testing.assert_array_equal(right, left[::-1])
+
+def test_no_loop_enters_and_leaves():
+    mask = np.ones((4, 6), dtype=bool)
+    frames = marquee_frames(mask, WIDTH, loop=False)
+    assert len(frames) == 6 + WIDTH + 1
+    # 首尾帧为空白，中间某帧文字完全位于屏内
+    assert not frames[0].any() and not frames[-1].any()
+    assert frames.sum(axis=(1, 2)).max() == mask.sum()
+    # 文字从右侧移入：第1帧只露出最右一列
+    np.testing.assert_array_equal(frames[1][:, -1], True)
+    assert frames[1][:, :-1].sum() == 0
+
+def test_invalid_direction():
+    with pytest.raises(ValueError):
+        marquee_frames(random_mask(0), WIDTH, direction="up")
+
+def test_text_to_marquee_removes_stale_frames(tmp_path):
+    try:
+        get_default_font()
+    except FileNotFoundError:
+        pytest.skip("系统中没有可用字体")
+    out = tmp_path / "marquee"
+    first = text_to_marquee("Hello world", str(out), WIDTH, 8, speed=1)
+    assert first["frames"] == len(first["paths"]) and first["removed"] == 0
+    # 其他前缀和不符合帧命名规则的文件不受影响
+    (out / "other_frame_0000.json").write_text("{}")
+    (out / "marquee_frame_notes.json").write_text("{}")
+
+    second = text_to_marquee("Hi", str(out), WIDTH, 8, speed=2)
+    assert second["frames"] < first["frames"]
+    assert second["removed"] == first["frames"] - second["frames"]
+    remaining = sorted(p.name for p in out.glob("marquee_frame_*.json"))
+    assert remaining == sorted([os.path.basename(p) for p in second["paths"]] + ["marquee_frame_notes.json"])
+    assert (out / "other_frame_0000.json").exists()
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,104 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_pipeline_cli.py
+# @Description : run子命令检查：在子进程中执行cli_app.py run，确认汇总报告、未变化任务跳过及清单缺失时的退出码
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import json
+import os
+import subprocess
+import sys
+import numpy as np
+from PIL import Image
+
+# ======================================== 全局变量 ============================================
+
+# 仓库根目录
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# 测试清单：两个图片任务，并发数2（经过进程池）
+MANIFEST = """
+concurrency = 2
+
+[defaults]
+output = "build"
+width = 8
+height = 8
+
+[[jobs]]
+input = "a.png"
+brightness = 1.2
+
+[[jobs]]
+input = "b.png"
+formats = "png"
+"""
+
+# ======================================== 功能函数 ============================================
+
+def run_cli(*args, cwd):
+    """
+    在全新子进程中执行cli_app.py
+    :param args: 命令行参数
+    :param cwd: 工作目录
+    :return: subprocess.CompletedProcess对象
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_DIR)
+    return subprocess.run([sys.executable, os.path.join(REPO_DIR, "cli_app.py"), *args], cwd=cwd, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+def make_project(tmp_path):
+    """
+    生成测试图片与任务清单
+    :param tmp_path: 临时目录
+    :return: 清单路径
+    """
+    rng = np.random.default_rng(0)
+    for name in ("a.png", "b.png"):
+        Image.fromarray(rng.integers(0, 256, (32, 32, 3), dtype=np.uint8)).save(tmp_path / name)
+    manifest = tmp_path / "assets.toml"
+    manifest.write_text(MANIFEST, encoding="utf-8")
+    return manifest
+
+def test_run_reports_and_skips_unchanged(tmp_path):
+    manifest = make_project(tmp_path)
+    report_path = tmp_path / "report.json"
+
+    first = run_cli("run", "-m", str(manifest), "--report", str(report_path), cwd=tmp_path)
+    assert first.returncode == 0, first.stdout + first.stderr
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert (report["total"], report["done"], report["skipped"], report["failed"]) == (2, 2, 0, 0)
+    assert [job["name"] for job in report["jobs"]] == ["a", "b"]
+    assert (tmp_path / "build" / "a.json").exists()
+    assert (tmp_path / "build" / "b_preview.png").exists()
+
+    second = run_cli("run", "-m", str(manifest), "--report", str(report_path), cwd=tmp_path)
+    assert second.returncode == 0, second.stdout + second.stderr
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert (report["done"], report["skipped"]) == (0, 2)
+
+    # 修改一个任务的输入后只重新转换该任务
+    Image.fromarray(np.zeros((32, 32, 3), dtype=np.uint8)).save(tmp_path / "a.png")
+    third = run_cli("run", "-m", str(manifest), "--report", str(report_path), cwd=tmp_path)
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert third.returncode == 0
+    assert {job["name"]: job["status"] for job in report["jobs"]} == {"a": "done", "b": "skipped"}
+
+def test_run_failed_job_exits_1(tmp_path):
+    manifest = tmp_path / "broken.toml"
+    manifest.write_text('[[jobs]]\ninput = "missing.png"\nwidth = 8\nheight = 8\n', encoding="utf-8")
+    result = run_cli("run", "-m", str(manifest), cwd=tmp_path)
+    assert result.returncode == 1
+
+def test_run_missing_manifest_exits_2(tmp_path):
+    result = run_cli("run", "-m", str(tmp_path / "nope.toml"), cwd=tmp_path)
+    assert result.returncode == 2
+    assert "[ERROR]" in result.stdout
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
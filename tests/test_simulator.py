@@ -0,0 +1,130 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : test_simulator.py
+# @Description : 仿真器检查：使用SDL虚拟显示驱动，确认LED精灵缓存不超过内存上限、时间戳时钟的帧推进与丢帧计数
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from ws_converter import simulator as sim_module
+from ws_converter.color import rgb888_array_to_rgb565
+from ws_converter.simulator import WS2812Simulator, sprite_nbytes
+
+# ======================================== 全局变量 ============================================
+
+# 测试矩阵尺寸
+WIDTH = 16
+HEIGHT = 16
+
+# ======================================== 功能函数 ============================================
+
+@pytest.fixture
+def make_sim():
+    """
+    创建仿真器实例，测试结束后关闭Pygame
+    :return: 以关键字参数创建WS2812Simulator的函数
+    """
+    def make(**kwargs):
+        return WS2812Simulator(WIDTH, HEIGHT, **kwargs)
+    yield make
+    pygame.quit()
+
+def distinct_color_frames():
+    """
+    生成覆盖全部4096种4位量化颜色的帧序列（每帧256种颜色）
+    :return: 形状为(16, HEIGHT, WIDTH)的uint16 RGB565数组
+    """
+    q = np.arange(4096)
+    rgb = np.stack([(q >> 8) & 0xF, (q >> 4) & 0xF, q & 0xF], axis=-1) * 17
+    return rgb888_array_to_rgb565(rgb.astype(np.uint8)).reshape(16, HEIGHT, WIDTH)
+
+def test_led_sprite_cache_stays_within_budget(make_sim, monkeypatch):
+    monkeypatch.setattr(sim_module, "LED_SPRITE_CACHE_MB", 0.25)
+    budget = 0.25 * 1024 * 1024
+    sim = make_sim(window_width=WIDTH * 16, appearance="led")
+    assert sim.use_led_appearance()
+
+    for frame in distinct_color_frames():
+        blits = sim.led_blits(frame)
+        # 被淘汰的精灵不影响当前帧的blit参数
+        assert len(blits) == int(np.count_nonzero(sim_module.LED_KEY_LUT[frame]))
+        assert sim._led_sprite_bytes <= budget
+        assert sim._led_sprite_bytes == sum(sprite_nbytes(s) for s in sim._led_sprites.values())
+
+    # 缓存保留的是最近使用的颜色
+    last_keys = set(np.unique(sim_module.LED_KEY_LUT[distinct_color_frames()[-1]]).tolist())
+    assert list(sim._led_sprites)[-1] in last_keys
+    assert 0 < len(sim._led_sprites) < 4096
+
+def test_led_sprite_cache_reuses_hits(make_sim):
+    sim = make_sim(window_width=WIDTH * 8, appearance="led")
+    frame = distinct_color_frames()[1]
+    sim.led_blits(frame)
+    size = sim._led_sprite_bytes
+    cached = dict(sim._led_sprites)
+    sim.led_blits(frame)
+    assert sim._led_sprite_bytes == size
+    assert all(sim._led_sprites[k] is v for k, v in cached.items())
+
+def make_clock_sim(make_sim, count=10, fps=10):
+    """
+    创建timestamp时钟模式的仿真器并载入按fps均匀分布的帧
+    :param make_sim: make_sim夹具
+    :param count: 帧数
+    :param fps: 帧率
+    :return: WS2812Simulator对象
+    """
+    sim = make_sim(window_width=WIDTH * 4, fps=fps, clock_mode="timestamp")
+    sim.set_frames(np.zeros((count, HEIGHT, WIDTH), dtype=np.uint16))
+    return sim
+
+def test_advance_by_clock_on_schedule(make_sim):
+    sim = make_clock_sim(make_sim)
+    t0 = 100.0
+    due = sim.advance_by_clock(t0)
+    assert due == pytest.approx(t0 + 0.1)
+    for i in range(1, 25):
+        due = sim.advance_by_clock(due + 1e-6)
+        assert sim.current_frame == i % 10
+    assert sim.dropped_frames == 0
+    assert due == pytest.approx(t0 + 2.5)
+
+def test_advance_by_clock_counts_skipped_frames(make_sim):
+    sim = make_clock_sim(make_sim)
+    t0 = 100.0
+    sim.advance_by_clock(t0)
+    # 卡顿0.35秒：直接跳到第3帧，中间2帧计为丢帧
+    sim.advance_by_clock(t0 + 0.35)
+    assert (sim.current_frame, sim.dropped_frames) == (3, 2)
+    # 卡顿跨过两整轮循环（每轮10帧）后落在第5帧
+    sim.advance_by_clock(t0 + 2.55)
+    assert sim.current_frame == 5
+    assert sim.dropped_frames == 2 + (2 * 10 + 5 - 3 - 1)
+
+def test_advance_by_clock_realigns_after_seek(make_sim):
+    sim = make_clock_sim(make_sim)
+    t0 = 100.0
+    sim.advance_by_clock(t0)
+    # 外部跳帧后以新帧重新对齐时间轴，不计丢帧
+    sim.current_frame = 7
+    due = sim.advance_by_clock(t0 + 5.0)
+    assert (sim.current_frame, sim.dropped_frames) == (7, 0)
+    assert due == pytest.approx(t0 + 5.1)
+    sim.advance_by_clock(due + 1e-6)
+    assert (sim.current_frame, sim.dropped_frames) == (8, 0)
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
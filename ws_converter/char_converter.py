@@ -10,16 +10,30 @@
 
 import json
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-from ws_converter.editor import rgb888_to_rgb565
+from ws_converter.color import rgb888_to_rgb565
 
 # ======================================== 全局变量 ============================================
 
+# 已加载字体对象的缓存数量（按(字体路径, 字号)缓存）
+FONT_CACHE_SIZE = 32
+# 字符掩码的LRU缓存数量（按(字体路径, 字号, 字符, 宽, 高)缓存）
+GLYPH_CACHE_SIZE = 4096
+# 批量转换的清单文件名
+MANIFEST_NAME = "manifest.json"
+# 待转换字符数少于该值时不启用多进程（进程启动开销大于转换本身）
+BATCH_PARALLEL_MIN_CHARS = 256
+
 # ======================================== 功能函数 ============================================
 
+@lru_cache(maxsize=None)
 def get_default_font():
     """
-    获取默认中文字体（兼容Windows/Linux/Mac）
+    获取默认中文字体（兼容Windows/Linux/Mac），只在首次调用时探测字体路径，之后直接返回缓存结果
     """
     # ws_converter的上级是NeopixelMatrixTool
     root_dir = os.path.dirname(os.path.dirname(__file__))
@@ -30,45 +44,44 @@ def get_default_font():
         "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
     ]
     for path in font_paths:
-        print(f"尝试字体路径：{path}，是否存在：{os.path.exists(path)}")
         if os.path.exists(path):
             return path
     raise FileNotFoundError("未找到中文字体文件，请将simhei.ttf放入NeopixelMatrixTool/assets目录")
 
-def char_to_matrix(char, width, height, font_size=None, output_path=None,
-                   text_color=(255, 255, 255), bg_color=(0, 0, 0)):
+@lru_cache(maxsize=FONT_CACHE_SIZE)
+def get_font(font_path, font_size):
     """
-    单字符转WS2812点阵JSON（先二值化→再替换颜色）
-    :param char: 单个字符（中文/英文/数字）
+    获取字体对象（按(字体路径, 字号)缓存，同一字体只打开一次）
+    :param font_path: TTF/TTC字体文件路径
+    :param font_size: 字号
+    :return: PIL FreeTypeFont对象
+    """
+    return ImageFont.truetype(font_path, font_size)
+
+@lru_cache(maxsize=GLYPH_CACHE_SIZE)
+def get_char_mask(font_path, font_size, char, width, height):
+    """
+    将单个字符渲染为居中的二值化掩码（按(字体路径, 字号, 字符, 宽, 高)做LRU缓存，重复字符不再调用FreeType）
+    :param font_path: 字体文件路径
+    :param font_size: 字号
+    :param char: 单个字符
     :param width: 点阵宽度
     :param height: 点阵高度
-    :param font_size: 字体大小（默认适配高度）
-    :param output_path: JSON输出路径
-    :param text_color: 文字RGB颜色（默认白色）
-    :param bg_color: 背景RGB颜色（默认黑色）
-    :return: 点阵数据（RGB565）+ JSON字典
+    :return: 形状为(高, 宽)的只读bool数组，True为文字像素
     """
-    # 校验：仅允许单字符
-    if len(char) != 1:
-        raise ValueError("仅支持单个字符输入！")
-
-    # ===================== 第一步：生成纯黑白二值化掩码 =====================
     # 1. 初始化灰度画布（背景=黑）
     mask_img = Image.new("L", (width, height), 0)  # L=灰度模式，0=黑色背景
     mask_draw = ImageDraw.Draw(mask_img)
+    font = get_font(font_path, font_size)
 
-    # 2. 加载字体（适配尺寸：避免字符超出画布）
-    font_size = font_size or max(1, height - 2)  # 字体大小=高度-2，最小1
-    font = ImageFont.truetype(get_default_font(), font_size)
-
-    # 3. 手动计算字符居中位置（兼容所有PIL版本，替代anchor）
+    # 2. 手动计算字符居中位置（兼容所有PIL版本，替代anchor）
     bbox = mask_draw.textbbox((0, 0), char, font=font)
     char_w = bbox[2] - bbox[0]
     char_h = bbox[3] - bbox[1]
     x = max(0, (width - char_w) // 2)  # 防止x为负
     y = max(0, (height - char_h) // 2)  # 防止y为负
 
-    # 4. 绘制白色字符（灰度值255），关闭抗锯齿
+    # 3. 绘制白色字符（灰度值255），关闭抗锯齿
     mask_draw.text(
         (x, y),
         char,
@@ -77,33 +90,44 @@ def char_to_matrix(char, width, height, font_size=None, output_path=None,
         antialias=False  # 严格二值化，无灰色边缘
     )
 
-    # 5. 严格二值化掩码（确保只有0/255两种值）
+    # 4. 严格二值化掩码（高于阈值=文字，否则=背景）
     threshold = 127
-    # 高于阈值=白，否则=黑
-    binary_mask = mask_img.point(lambda p: 255 if p > threshold else 0)
-
-    # ===================== 第二步：替换为用户自定义颜色 =====================
-    # 1. 初始化RGB画布（最终颜色画布）
-    final_img = Image.new("RGB", (width, height), bg_color)
-    final_draw = ImageDraw.Draw(final_img)
-
-    # 2. 遍历二值化掩码，替换颜色
-    for y_pixel in range(height):
-        for x_pixel in range(width):
-            mask_pixel = binary_mask.getpixel((x_pixel, y_pixel))
-            # 掩码中白色=文字→替换为用户选的文字色
-            if mask_pixel == 255:
-                final_img.putpixel((x_pixel, y_pixel), text_color)
-            # 掩码中黑色=背景→保持初始化的背景色，无需操作
-
-    # ===================== 第三步：转换为RGB565点阵 =====================
-    pixels = []
-    for y_pixel in range(height):
-        for x_pixel in range(width):
-            r, g, b = final_img.getpixel((x_pixel, y_pixel))
-            pixels.append(rgb888_to_rgb565(r, g, b))
-
-    # ===================== 第四步：保存JSON和预览图 =====================
+    mask = np.asarray(mask_img) > threshold
+    mask.flags.writeable = False
+    return mask
+
+def char_to_matrix(char, width, height, font_size=None, output_path=None,
+                   text_color=(255, 255, 255), bg_color=(0, 0, 0), preview_path=None, debug=False):
+    """
+    单字符转WS2812点阵JSON（先二值化→再替换颜色）
+    默认无任何副作用（不写预览图、不打印），可在批量转换或工作进程中直接调用
+    :param char: 单个字符（中文/英文/数字）
+    :param width: 点阵宽度
+    :param height: 点阵高度
+    :param font_size: 字体大小（默认适配高度）
+    :param output_path: JSON输出路径（默认不写文件）
+    :param text_color: 文字RGB颜色（默认白色）
+    :param bg_color: 背景RGB颜色（默认黑色）
+    :param preview_path: 预览PNG输出路径（默认不保存预览图）
+    :param debug: 是否打印调试信息（默认False）
+    :return: 点阵数据（RGB565）+ JSON字典
+    """
+    # 校验：仅允许单字符
+    if len(char) != 1:
+        raise ValueError("仅支持单个字符输入！")
+
+    # ===================== 第一步：生成纯黑白二值化掩码 =====================
+    # 字体大小=高度-2，最小1（适配尺寸：避免字符超出画布）；掩码来自缓存，重复字符无需重新光栅化
+    font_size = font_size or max(1, height - 2)
+    mask = get_char_mask(get_default_font(), font_size, char, width, height)
+
+    # ===================== 第二步：替换颜色并转换为RGB565点阵 =====================
+    # 掩码中文字像素取文字色、背景像素取背景色，两种颜色的RGB565值只计算一次
+    text565 = np.uint16(rgb888_to_rgb565(*text_color))
+    bg565 = np.uint16(rgb888_to_rgb565(*bg_color))
+    pixels = np.where(mask, text565, bg565).ravel().tolist()
+
+    # ===================== 第三步：保存JSON和预览图 =====================
     json_data = {
         "pixels": pixels,
         "width": width,
@@ -118,15 +142,129 @@ def char_to_matrix(char, width, height, font_size=None, output_path=None,
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(json_data, f, indent=4, ensure_ascii=False)
 
-    # 保存预览图（验证效果）
-    final_img.save(f"char_preview_{char}.png")
+    if preview_path:
+        # 预览图使用原始RGB888颜色（验证效果）
+        preview = np.where(mask[..., None], np.uint8(text_color), np.uint8(bg_color)).astype(np.uint8)
+        Image.fromarray(preview).save(preview_path)
 
-    # 调试信息：统计文字像素数
-    text_pixel_count = sum(1 for p in binary_mask.getdata() if p == 255)
-    print(f"调试：总像素={width * height}，文字像素数={text_pixel_count}")
+    if debug:
+        # 调试信息：统计文字像素数
+        print(f"调试：总像素={width * height}，文字像素数={int(mask.sum())}")
 
     return pixels, json_data
 
+def parse_char_source(text=None, path=None, codepoint_range=None):
+    """
+    汇总批量转换的字符来源，按首次出现的顺序去重（忽略换行符）
+    :param text: 字符串（如标签文字）
+    :param path: UTF-8文本文件路径
+    :param codepoint_range: 码点范围字符串，如"0x4E00-0x4E2F"、"65-90"，多个范围用逗号分隔
+    :return: 字符列表
+    """
+    chars = []
+    if text:
+        chars.extend(text)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            chars.extend(f.read())
+    if codepoint_range:
+        for part in codepoint_range.split(","):
+            start, _, end = part.strip().partition("-")
+            start = int(start, 0)
+            end = int(end, 0) if end else start
+            chars.extend(chr(c) for c in range(start, end + 1))
+    return [c for c in dict.fromkeys(chars) if c not in "\r\n"]
+
+def char_file_name(char):
+    """
+    生成字符对应的输出文件名（按码点命名，避免文件系统不允许的字符）
+    :param char: 单个字符
+    :return: 文件名，如"char_4E2D.json"
+    """
+    return f"char_{ord(char):04X}.json"
+
+def convert_char_chunk(chars, output_dir, width, height, font_size, text_color, bg_color):
+    """
+    转换一组字符并写出JSON文件（进程池工作函数，每个进程各自缓存字体与字形掩码）
+    :param chars: 字符列表
+    :param output_dir: 输出目录
+    :param width: 点阵宽度
+    :param height: 点阵高度
+    :param font_size: 字号
+    :param text_color: 文字RGB颜色
+    :param bg_color: 背景RGB颜色
+    :return: [(字符, 文件名), ...]
+    """
+    done = []
+    for char in chars:
+        name = char_file_name(char)
+        char_to_matrix(char, width, height, font_size, os.path.join(output_dir, name), text_color, bg_color)
+        done.append((char, name))
+    return done
+
+def convert_chars(chars, output_dir, width, height, font_size=None, text_color=(255, 255, 255),
+                  bg_color=(0, 0, 0), workers=None, force=False):
+    """
+    批量转换字符为WS2812点阵JSON：多进程并行转换，一次写出所有文件和字符→文件清单，已是最新的输出自动跳过
+    转换参数（尺寸、字号、颜色、字体文件及其修改时间）与清单记录一致且输出文件存在时视为最新
+    :param chars: 字符序列（可用parse_char_source生成）
+    :param output_dir: 输出目录（清单文件为其中的manifest.json）
+    :param width: 点阵宽度
+    :param height: 点阵高度
+    :param font_size: 字号（默认高度-2）
+    :param text_color: 文字RGB颜色（默认白色）
+    :param bg_color: 背景RGB颜色（默认黑色）
+    :param workers: 工作进程数（默认CPU核数；字符较少时自动单进程）
+    :param force: 是否忽略已有输出全部重新转换（默认False）
+    :return: 统计信息字典：converted、skipped、elapsed（秒）、rate（字符/秒）、manifest（清单路径）
+    """
+    start = time.perf_counter()
+    chars = list(dict.fromkeys(chars))
+    font_size = font_size or max(1, height - 2)
+    font_path = get_default_font()
+    params = {
+        "width": width,
+        "height": height,
+        "font_size": font_size,
+        "text_color": list(text_color),
+        "bg_color": list(bg_color),
+        "font": os.path.abspath(font_path),
+        "font_mtime_ns": os.stat(font_path).st_mtime_ns,
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    entries = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, encoding="utf-8") as f:
+            old = json.load(f)
+        # 参数变化时已有输出全部作废
+        if old.get("params") == params:
+            entries = old.get("chars", {})
+
+    todo = [c for c in chars if force or c not in entries
+            or not os.path.exists(os.path.join(output_dir, entries[c]))]
+    args = (output_dir, width, height, font_size, tuple(text_color), tuple(bg_color))
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(todo) < BATCH_PARALLEL_MIN_CHARS:
+        done = convert_char_chunk(todo, *args)
+    else:
+        chunk = -(-len(todo) // (workers * 4))
+        parts = [todo[i:i + chunk] for i in range(0, len(todo), chunk)]
+        n = len(parts)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(convert_char_chunk, parts, *[[a] * n for a in args])
+            done = [item for part in results for item in part]
+
+    entries.update(done)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump({"params": params, "chars": entries}, f, indent=2, ensure_ascii=False)
+
+    elapsed = time.perf_counter() - start
+    rate = len(done) / elapsed if elapsed > 0 else 0.0
+    return {"converted": len(done), "skipped": len(chars) - len(done), "elapsed": elapsed,
+            "rate": rate, "manifest": manifest_path}
+
 # ======================================== 自定义类 ============================================
 
 # ======================================== 初始化配置 ==========================================
@@ -0,0 +1,159 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : color.py
+# @Description : 颜色格式转换公共文件，提供RGB888/RGB565/十六进制互转及伽马校正的标量版与NumPy数组版，不依赖任何GUI库
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+from functools import lru_cache
+import numpy as np
+
+# ======================================== 全局变量 ============================================
+
+# 像素边框颜色（仿真窗口与离线渲染共用）
+GRID_COLOR = (40, 40, 40)
+
+# ======================================== 功能函数 ============================================
+
+def rgb888_to_rgb565(r, g, b):
+    """
+    符合嵌入式系统标准的RGB888转RGB565（含溢出保护，输入自动限制在0-255）
+    :param r: RGB888的红色分量（整数）
+    :param g: RGB888的绿色分量（整数）
+    :param b: RGB888的蓝色分量（整数）
+    :return: RGB565格式的颜色值（16位整数，结构：高5位红、中间6位绿、低5位蓝）
+    """
+    r = min(max(int(r), 0), 255)
+    g = min(max(int(g), 0), 255)
+    b = min(max(int(b), 0), 255)
+    return ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+
+def rgb565_to_rgb888(rgb565):
+    """
+    高精度RGB565转RGB888（按比例扩展到0-255，白色还原为255而非248）
+    :param rgb565: RGB565格式的颜色值（16位整数）
+    :return: RGB888格式颜色元组(r, g, b)，每个分量为0-255的整数
+    """
+    r = (rgb565 >> 11) & 0x1F
+    g = (rgb565 >> 5) & 0x3F
+    b = rgb565 & 0x1F
+    return (
+        (r * 527 + 23) >> 6,
+        (g * 259 + 33) >> 6,
+        (b * 527 + 23) >> 6
+    )
+
+def rgb_to_hex(rgb_tuple):
+    """
+    将RGB888元组转换为十六进制颜色代码
+    :param rgb_tuple: RGB888格式的颜色元组(r, g, b)
+    :return: 十六进制颜色代码字符串（格式为#rrggbb）
+    """
+    return "#{:02x}{:02x}{:02x}".format(*rgb_tuple)
+
+def parse_color(text):
+    """
+    解析颜色字符串（命令行/配置文件使用）
+    :param text: "#rrggbb"、"rrggbb"或"r,g,b"格式的字符串
+    :return: RGB888颜色元组(r, g, b)
+    """
+    text = text.strip()
+    if "," in text:
+        parts = [int(p) for p in text.split(",")]
+        if len(parts) != 3:
+            raise ValueError(f"颜色格式错误: {text}（应为 r,g,b）")
+        return tuple(min(max(p, 0), 255) for p in parts)
+    text = text.lstrip("#")
+    if len(text) != 6:
+        raise ValueError(f"颜色格式错误: {text}（应为 #rrggbb）")
+    return tuple(int(text[i:i + 2], 16) for i in (0, 2, 4))
+
+@lru_cache(maxsize=4096)
+def rgb565_to_hex(rgb565):
+    """
+    将RGB565颜色值转换为十六进制颜色代码（结果缓存，重复颜色不再重复计算）
+    :param rgb565: RGB565格式的颜色值（16位整数）
+    :return: 十六进制颜色代码字符串（格式为#rrggbb）
+    """
+    return rgb_to_hex(rgb565_to_rgb888(int(rgb565)))
+
+@lru_cache(maxsize=None)
+def get_rgb565_lut():
+    """
+    获取全部65536个RGB565值对应的RGB888查找表（首次调用时计算，之后复用，与rgb565_to_rgb888算法一致）
+    :return: 形状为(65536, 3)的只读uint8数组，第i行为RGB565值i对应的(r, g, b)
+    """
+    v = np.arange(65536, dtype=np.uint32)
+    r = (v >> 11) & 0x1F
+    g = (v >> 5) & 0x3F
+    b = v & 0x1F
+    lut = np.empty((65536, 3), dtype=np.uint8)
+    lut[:, 0] = (r * 527 + 23) >> 6
+    lut[:, 1] = (g * 259 + 33) >> 6
+    lut[:, 2] = (b * 527 + 23) >> 6
+    lut.flags.writeable = False
+    return lut
+
+def rgb888_array_to_rgb565(rgb):
+    """
+    RGB888数组批量转换为RGB565（与rgb888_to_rgb565算法一致，超出0-255的值先截断）
+    :param rgb: 最后一维为(r, g, b)的数组，形状任意（如(高, 宽, 3)），可为整数或浮点
+    :return: 去掉最后一维的uint16数组
+    """
+    rgb = np.asarray(rgb)
+    if rgb.dtype != np.uint8:
+        rgb = np.clip(rgb, 0, 255).astype(np.uint8)
+    r = rgb[..., 0].astype(np.uint16)
+    g = rgb[..., 1].astype(np.uint16)
+    b = rgb[..., 2].astype(np.uint16)
+    return ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+
+def rgb565_array_to_rgb888(values):
+    """
+    RGB565数组批量转换为RGB888（一次查表完成）
+    :param values: RGB565数组或列表，形状任意
+    :return: 形状为values.shape + (3,)的uint8数组
+    """
+    return get_rgb565_lut()[np.asarray(values, dtype=np.uint16)]
+
+@lru_cache(maxsize=16)
+def get_gamma_lut(gamma):
+    """
+    获取8位伽马校正查找表（按伽马值缓存）
+    :param gamma: 伽马值（如2.2；1.0表示不校正）
+    :return: 长度为256的只读uint8数组，第i项为 round(255 * (i/255)^gamma)
+    """
+    lut = np.round(255.0 * (np.arange(256) / 255.0) ** gamma).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+def apply_gamma(rgb, gamma=2.2):
+    """
+    对RGB888颜色进行伽马校正（查表实现，LED亮度与人眼感知更一致）
+    :param rgb: RGB888颜色元组(r, g, b)，或元素为0-255的数组（任意形状）
+    :param gamma: 伽马值（默认2.2）
+    :return: 输入为元组时返回校正后的元组，否则返回同形状的uint8数组
+    """
+    lut = get_gamma_lut(float(gamma))
+    if isinstance(rgb, tuple):
+        return tuple(int(lut[min(max(int(c), 0), 255)]) for c in rgb)
+    return lut[np.clip(np.asarray(rgb), 0, 255).astype(np.uint8)]
+
+def rgb565_gamma(rgb565, gamma=2.2):
+    """
+    对RGB565颜色值进行伽马校正（先展开为RGB888校正，再压缩回RGB565）
+    :param rgb565: RGB565颜色值（整数）或RGB565数组
+    :param gamma: 伽马值（默认2.2）
+    :return: 输入为整数时返回整数，否则返回同形状的uint16数组
+    """
+    if isinstance(rgb565, (int, np.integer)):
+        return rgb888_to_rgb565(*apply_gamma(rgb565_to_rgb888(int(rgb565)), gamma))
+    return rgb888_array_to_rgb565(apply_gamma(rgb565_array_to_rgb888(rgb565), gamma))
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
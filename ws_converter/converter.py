@@ -12,8 +12,9 @@ from PIL import Image
 import numpy as np
 import json
 import os
-import cv2
-from tqdm import tqdm
+import time
+from functools import lru_cache
+from ws_converter.color import rgb888_to_rgb565, rgb888_array_to_rgb565, rgb565_array_to_rgb888
 
 try:
     resample = Image.Resampling.LANCZOS
@@ -22,6 +23,12 @@ except AttributeError:
 
 # ======================================== 全局变量 ============================================
 
+# 支持的图片与视频扩展名
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv")
+# 颜色调整预览代理的缓存项数（每个源文件与点阵尺寸组合占一项）
+PREVIEW_CACHE_SIZE = 8
+
 # ======================================== 功能函数 ============================================
 
 def apply_color_adjustments(r, g, b, brightness=1.0, contrast=1.0, saturation=1.0):
@@ -56,21 +63,118 @@ def apply_color_adjustments(r, g, b, brightness=1.0, contrast=1.0, saturation=1.
     # 将结果限制在0-255范围内并转换为整数后返回
     return max(0, min(int(r), 255)), max(0, min(int(g), 255)), max(0, min(int(b), 255))
 
-def rgb888_to_rgb565(r, g, b):
+def adjust_color_array(rgb, brightness=1.0, contrast=1.0, saturation=1.0):
+    """
+    apply_color_adjustments的数组版：对整块RGB数据一次完成饱和度、对比度、亮度调整（计算顺序与取整方式与标量版一致）
+    :param rgb: 最后一维为(r, g, b)的数组，形状任意（如(高, 宽, 3)），元素为0-255
+    :param brightness: 亮度调整系数（默认1.0）
+    :param contrast: 对比度调整系数（默认1.0）
+    :param saturation: 饱和度调整系数（默认1.0）
+    :return: 与输入同形状的uint8数组
+    """
+    rgb = np.asarray(rgb, dtype=np.float64)
+    # 灰度值按ITU-R BT.601公式计算并向下取整（与标量版的int()一致）
+    gray = np.floor(0.299 * rgb[..., 0] + 0.587 * rgb[..., 1] + 0.114 * rgb[..., 2])[..., None]
+    out = gray + (rgb - gray) * saturation
+    out = (out - 128) * contrast + 128
+    out *= brightness
+    return np.clip(np.trunc(out), 0, 255).astype(np.uint8)
+
+def block_average(img_array, width, height):
+    """
+    将图像按点阵尺寸分块，一次求出每块的平均颜色（右侧、下方不足一块的余量舍去）
+    :param img_array: 形状为(高, 宽, 3)的RGB数组
+    :param width: 点阵的宽度（列数）
+    :param height: 点阵的高度（行数）
+    :return: 形状为(height, width, 3)的uint8数组，每个元素为块平均颜色向下取整
+    """
+    h, w, _ = img_array.shape
+    block_h, block_w = h // height, w // width
+    blocks = img_array[:block_h * height, :block_w * width].reshape(height, block_h, width, block_w, 3)
+    return blocks.mean(axis=(1, 3)).astype(np.uint8)
+
+def load_image_colors(image_path, width, height):
+    """
+    读取图片并缩放、分块求平均，得到颜色调整前的点阵颜色（转换与预览共用）
+    :param image_path: 输入图片的路径
+    :param width: 点阵的宽度（列数）
+    :param height: 点阵的高度（行数）
+    :return: 形状为(height, width, 3)的uint8数组
+    """
+    # 打开图片并转换为RGB模式（去除透明通道）
+    img = Image.open(image_path).convert("RGB")
+    # 放大图片（width*10/height*10是为了后续分块取平均更平滑），使用LANCZOS重采样（高质量缩放）
+    img = img.resize((width * 10, height * 10), resample)
+    return block_average(np.array(img), width, height)
+
+def colors_to_rgb565(colors, brightness=1.0, contrast=1.0, saturation=1.0):
+    """
+    点阵颜色的颜色调整与RGB565编码阶段（整块数组一次完成）
+    :param colors: 形状为(高, 宽, 3)的RGB数组
+    :param brightness: 亮度调整系数（默认1.0）
+    :param contrast: 对比度调整系数（默认1.0）
+    :param saturation: 饱和度调整系数（默认1.0）
+    :return: 按行优先展开的RGB565整数列表
+    """
+    return rgb888_array_to_rgb565(adjust_color_array(colors, brightness, contrast, saturation)).ravel().tolist()
+
+@lru_cache(maxsize=PREVIEW_CACHE_SIZE)
+def load_preview_proxy(path, mtime, width, height, sample_frames):
+    """
+    生成颜色调整预览用的代理数据（按源文件路径、修改时间、点阵尺寸缓存，源文件变化后自动失效）
+    :param path: 图片或视频路径
+    :param mtime: 源文件修改时间（仅作缓存键）
+    :param width: 点阵的宽度（列数）
+    :param height: 点阵的高度（行数）
+    :param sample_frames: 视频均匀抽取的帧数
+    :return: 形状为(帧数, height, width, 3)的只读uint8数组，为颜色调整前的点阵颜色
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext in IMAGE_EXTENSIONS:
+        proxy = load_image_colors(path, width, height)[None]
+    else:
+        import cv2
+
+        cap = cv2.VideoCapture(path)
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        count = max(1, min(sample_frames, total))
+        frames = []
+        for i in range(count):
+            cap.set(cv2.CAP_PROP_POS_FRAMES, i * total // count)
+            ret, frame = cap.read()
+            if ret:
+                frames.append(block_average(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), width, height))
+        cap.release()
+        if not frames:
+            raise ValueError(f"无法读取视频帧: {path}")
+        proxy = np.stack(frames)
+    proxy.flags.writeable = False
+    return proxy
+
+def get_preview_proxy(path, width, height, sample_frames=4):
+    """
+    获取颜色调整预览代理：源文件只解码、缩放、分块一次，之后调整滑块只需在代理上重跑颜色阶段
+    :param path: 图片或视频路径
+    :param width: 点阵的宽度（列数）
+    :param height: 点阵的高度（行数）
+    :param sample_frames: 视频均匀抽取的帧数（默认4，图片忽略）
+    :return: 形状为(帧数, height, width, 3)的只读uint8数组
+    """
+    return load_preview_proxy(os.path.abspath(path), os.path.getmtime(path), width, height, sample_frames)
+
+def preview_color_adjustments(proxy, brightness=1.0, contrast=1.0, saturation=1.0):
     """
-    将RGB888格式的颜色值转换为RGB565格式
-    :param r: RGB888的红色分量（0-255的整数）
-    :param g: RGB888的绿色分量（0-255的整数）
-    :param b: RGB888的蓝色分量（0-255的整数）
-    :return: RGB565格式的颜色值（16位整数）
+    在预览代理上执行颜色调整，并经RGB565量化后还原为RGB888，显示效果与实际转换输出一致
+    :param proxy: get_preview_proxy返回的代理数组
+    :param brightness: 亮度调整系数（默认1.0）
+    :param contrast: 对比度调整系数（默认1.0）
+    :param saturation: 饱和度调整系数（默认1.0）
+    :return: 与代理同形状的uint8数组
     """
-    # RGB565格式：高5位为红，中间6位为绿，低5位为蓝
-    # 右移3位取r的高5位，左移11位放到对应位置
-    # 右移2位取g的高6位，左移5位放到对应位置
-    # 右移3位取b的高5位，放到最低5位
-    return ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
+    return rgb565_array_to_rgb888(rgb888_array_to_rgb565(adjust_color_array(proxy, brightness, contrast, saturation)))
 
-def convert_image_to_json(image_path, output_dir, width, height, description="", brightness=1.0, contrast=1.0, saturation=1.0):
+def convert_image_to_json(image_path, output_dir, width, height, description="", brightness=1.0, contrast=1.0, saturation=1.0,
+                          progress=None, cancel=None):
     """
     将图片转换为指定尺寸的RGB565点阵JSON文件（包含颜色调整）
     :param image_path: 输入图片的路径
@@ -81,30 +185,16 @@ def convert_image_to_json(image_path, output_dir, width, height, description="",
     :param brightness: 亮度调整系数（默认1.0）
     :param contrast: 对比度调整系数（默认1.0）
     :param saturation: 饱和度调整系数（默认1.0）
-    :return: 无返回值（直接生成JSON文件）
+    :param progress: 进度回调progress(已完成行数, 总行数)，点阵计算完成后调用（默认None）
+    :param cancel: 取消标志（带is_set()方法，如threading.Event），开始计算前检查，已设置时抛出ConversionCancelled
+    :return: 生成的JSON文件路径列表
     """
-    # 打开图片并转换为RGB模式（去除透明通道）
-    img = Image.open(image_path).convert("RGB")
-    # 放大图片（width*10/height*10是为了后续分块取平均更平滑），使用LANCZOS重采样（高质量缩放）
-    img = img.resize((width * 10, height * 10), resample)
-    # 将图片转换为numpy数组，方便分块计算
-    img_array = np.array(img)
-    orig_h, orig_w, _ = img_array.shape
-    # 计算每个点阵块的高度和宽度
-    block_h, block_w = orig_h // height, orig_w // width
-
-    pixels = []
-    # 遍历每个点阵位置（按行优先顺序）
-    for y in range(height):
-        for x in range(width):
-            # 截取当前点阵位置对应的图片块
-            block = img_array[y*block_h:(y+1)*block_h, x*block_w:(x+1)*block_w]
-            # 计算块内的平均颜色（按像素维度求均值）
-            avg_color = block.mean(axis=(0, 1))
-            r, g, b = map(int, avg_color)
-            r, g, b = apply_color_adjustments(r, g, b, brightness, contrast, saturation)
-            # 转换为RGB565格式并加入列表
-            pixels.append(rgb888_to_rgb565(r, g, b))
+    if cancel is not None and cancel.is_set():
+        raise ConversionCancelled([])
+    # 分块取平均后，颜色调整与RGB565编码对整个点阵一次完成
+    pixels = colors_to_rgb565(load_image_colors(image_path, width, height), brightness, contrast, saturation)
+    if progress:
+        progress(height, height)
 
     # 构造JSON数据结构
     json_data = {
@@ -120,11 +210,17 @@ def convert_image_to_json(image_path, output_dir, width, height, description="",
     # 获取图片的基础文件名（不含扩展名）
     base = os.path.splitext(os.path.basename(image_path))[0]
 
-    # 写入JSON文件（缩进2格，增强可读性）
-    with open(os.path.join(output_dir, f"{base}.json"), "w") as f:
-        json.dump(json_data, f, indent=2)
+    # 写入JSON文件（缩进2格，增强可读性）；写入中途出错时带上可能已部分写出的文件
+    outpath = os.path.join(output_dir, f"{base}.json")
+    try:
+        with open(outpath, "w") as f:
+            json.dump(json_data, f, indent=2)
+    except Exception as e:
+        raise ConversionFailed([outpath], e) from e
+    return [outpath]
 
-def convert_video_to_json(video_path, output_dir, width, height, total_frames=30, description="", brightness=1.0, contrast=1.0, saturation=1.0):
+def convert_video_to_json(video_path, output_dir, width, height, total_frames=30, description="", brightness=1.0, contrast=1.0, saturation=1.0,
+                          progress=None, cancel=None):
     """
     将视频的指定帧数转换为RGB565点阵JSON文件（包含颜色调整）
     :param video_path: 输入视频的路径
@@ -136,8 +232,14 @@ def convert_video_to_json(video_path, output_dir, width, height, total_frames=30
     :param brightness: 亮度调整系数（默认1.0）
     :param contrast: 对比度调整系数（默认1.0）
     :param saturation: 饱和度调整系数（默认1.0）
-    :return: 无返回值（直接生成多个JSON文件，对应不同帧）
+    :param progress: 进度回调progress(已完成帧数, 总帧数)，每处理完一帧调用一次（默认None，使用tqdm进度条）
+    :param cancel: 取消标志（带is_set()方法，如threading.Event），每帧开始前检查，已设置时抛出ConversionCancelled
+    :return: 生成的JSON文件路径列表（对应不同帧）
     """
+    # OpenCV与tqdm只在转换视频时加载，转换图片不引入
+    import cv2
+    from tqdm import tqdm
+
     # 打开视频文件
     cap = cv2.VideoCapture(video_path)
     # 获取视频的总帧数和帧率
@@ -152,53 +254,114 @@ def convert_video_to_json(video_path, output_dir, width, height, total_frames=30
 
     os.makedirs(output_dir, exist_ok=True)
     base = os.path.splitext(os.path.basename(video_path))[0]
+    outputs = []
 
-    # 遍历帧索引，使用tqdm显示进度条
-    for idx in tqdm(frame_indices, desc="正在转换视频帧为JSON"):
-        # 设置视频读取的位置为指定帧
-        cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-
-        # 读取帧（ret为是否读取成功，frame为帧数据）
-        ret, frame = cap.read()
-        if not ret:
-            continue
-        img_array = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, _ = img_array.shape
-        block_h, block_w = h // height, w // width
-
-        pixels = []
-        # 遍历每个点阵位置（按行优先顺序）
-        for y in range(height):
-            for x in range(width):
-                # 截取当前点阵位置对应的帧块
-                block = img_array[y*block_h:(y+1)*block_h, x*block_w:(x+1)*block_w]
-                # 计算块内的平均颜色
-                avg_color = block.mean(axis=(0, 1))
-                r, g, b = map(int, avg_color)
-                r, g, b = apply_color_adjustments(r, g, b, brightness, contrast, saturation)
-                # 转换为RGB565格式并加入列表
-                pixels.append(rgb888_to_rgb565(r, g, b))
-
-        # 构造单帧的JSON数据结构（包含帧索引和时间戳）
-        json_data = {
-            "pixels": pixels,
-            "width": width,
-            "height": height,
-            "frame_index": idx,
-            "timestamp": round(idx / fps, 2), # 计算帧对应的时间戳（保留2位小数）
-            "description": description,
-            "version": 1.0
-        }
-
-        # 写入JSON文件（文件名包含帧索引，补零到4位）
-        outpath = os.path.join(output_dir, f"{base}_frame_{idx:04d}.json")
-        with open(outpath, "w") as f:
-            json.dump(json_data, f, indent=2)
+    # 遍历帧索引：提供进度回调时由调用方显示进度，否则使用tqdm显示进度条
+    indices = frame_indices if progress else tqdm(frame_indices, desc="正在转换视频帧为JSON")
+    try:
+        for done, idx in enumerate(indices):
+            # 帧边界检查取消标志
+            if cancel is not None and cancel.is_set():
+                raise ConversionCancelled(outputs)
+            if progress:
+                progress(done, len(frame_indices))
+            # 设置视频读取的位置为指定帧
+            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+
+            # 读取帧（ret为是否读取成功，frame为帧数据）
+            ret, frame = cap.read()
+            if not ret:
+                continue
+            # 分块取平均、颜色调整与RGB565编码均为整帧数组运算
+            colors = block_average(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), width, height)
+            pixels = colors_to_rgb565(colors, brightness, contrast, saturation)
 
-    cap.release()
+            # 构造单帧的JSON数据结构（包含帧索引和时间戳）
+            json_data = {
+                "pixels": pixels,
+                "width": width,
+                "height": height,
+                "frame_index": idx,
+                "timestamp": round(idx / fps, 2), # 计算帧对应的时间戳（保留2位小数）
+                "description": description,
+                "version": 1.0
+            }
+
+            # 写入JSON文件（文件名包含帧索引，补零到4位）；先登记再写入，写到一半出错的文件也会被清理
+            outpath = os.path.join(output_dir, f"{base}_frame_{idx:04d}.json")
+            outputs.append(outpath)
+            with open(outpath, "w") as f:
+                json.dump(json_data, f, indent=2)
+    except ConversionCancelled:
+        raise
+    except Exception as e:
+        # 中途出错（如磁盘写满、帧解码异常）时带上已写出的文件，由调用方决定是否删除
+        raise ConversionFailed(outputs, e) from e
+    finally:
+        cap.release()
+
+    if progress:
+        progress(len(frame_indices), len(frame_indices))
+    return outputs
 
 # ======================================== 自定义类 ============================================
 
+class ConversionCancelled(Exception):
+    """
+    转换被取消（在帧/行边界检查到取消标志时抛出）
+    outputs属性为取消前已写出的输出文件列表，由调用方决定是否删除
+    """
+    def __init__(self, outputs):
+        """
+        :param outputs: 已写出的输出文件路径列表
+        :return: 无返回值
+        """
+        super().__init__("转换已取消")
+        self.outputs = list(outputs)
+
+class ConversionFailed(Exception):
+    """
+    转换中途出错（原异常保存在error属性和__cause__中）
+    outputs属性为出错前已写出（含写到一半）的输出文件列表，由调用方决定是否删除
+    """
+    def __init__(self, outputs, error):
+        """
+        :param outputs: 已写出的输出文件路径列表
+        :param error: 原始异常
+        :return: 无返回值
+        """
+        super().__init__(f"转换失败: {error}")
+        self.outputs = list(outputs)
+        self.error = error
+
+class ProgressTracker:
+    """
+    进度统计类：根据已完成数量和耗时计算处理速率与预计剩余时间，供GUI和命令行显示真实进度
+    """
+    def __init__(self, unit="帧"):
+        """
+        初始化进度统计
+        :param unit: 进度单位（如"帧"、"行"）
+        :return: 无返回值
+        """
+        self.unit = unit
+        self.start = time.perf_counter()
+
+    def format(self, done, total):
+        """
+        生成进度描述文字
+        :param done: 已完成数量
+        :param total: 总数量
+        :return: 如"12/30 帧 (40.0%) 8.5 帧/秒 剩余 2.1 秒"
+        """
+        elapsed = time.perf_counter() - self.start
+        percent = done / total * 100 if total else 100.0
+        text = f"{done}/{total} {self.unit} ({percent:.1f}%)"
+        if done > 0 and elapsed > 0:
+            rate = done / elapsed
+            text += f" {rate:.1f} {self.unit}/秒 剩余 {(total - done) / rate:.1f} 秒"
+        return text
+
 # ======================================== 初始化配置 ==========================================
 
 # ========================================  主程序  ===========================================
\ No newline at end of file
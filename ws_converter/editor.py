@@ -11,72 +11,344 @@
 import tkinter as tk
 from tkinter import colorchooser, filedialog, messagebox, simpledialog
 import json
+from collections import deque
+import numpy as np
+from PIL import Image, ImageTk
+from ws_converter.color import rgb888_to_rgb565, rgb565_array_to_rgb888, rgb565_to_hex, rgb_to_hex
 
 # ======================================== 全局变量 ============================================
 
+# 像素边框（网格覆盖层）颜色
+GRID_OUTLINE = "gray"
+# 撤销/重做历史的默认内存上限（MB）
+HISTORY_LIMIT_MB = 16
+# 单次重绘的像素数超过点阵总数的该比例时，改为整幅重绘
+PARTIAL_REPAINT_RATIO = 0.125
+# 编辑工具：工具标识 -> 按钮文字
+EDIT_TOOLS = {
+    "pen": "画笔",
+    "fill": "填充",
+    "rect": "实心矩形",
+    "outline": "矩形框",
+    "line": "直线",
+    "replace": "替换颜色",
+}
+# 拖拽预览（矩形/直线工具）的颜色
+PREVIEW_COLOR = "#00c0ff"
+# 点阵宽度、高度的上限（画布只渲染可见区域，上限只用于防止误输入）
+MAX_MATRIX_SIZE = 4096
+# 可选的缩放级别（单个像素的显示尺寸）
+ZOOM_LEVELS = (1, 2, 3, 4, 5, 6, 8, 10, 12, 16, 20, 24, 30, 40, 60)
+# 像素尺寸不小于该值时才绘制网格覆盖层
+GRID_MIN_PIXEL_SIZE = 4
+
 # ======================================== 功能函数 ============================================
 
-def rgb565_to_rgb888(rgb565):
+def line_cells(x0, y0, x1, y1):
+    """
+    Bresenham直线光栅化：返回从(x0, y0)到(x1, y1)经过的所有像素坐标（含两端点）
+    :param x0: 起点列坐标
+    :param y0: 起点行坐标
+    :param x1: 终点列坐标
+    :param y1: 终点行坐标
+    :return: [(x, y), ...]像素坐标列表
+    """
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx = 1 if x0 < x1 else -1
+    sy = 1 if y0 < y1 else -1
+    err = dx + dy
+    cells = []
+    while True:
+        cells.append((x0, y0))
+        if x0 == x1 and y0 == y1:
+            return cells
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+
+def flood_fill(arr, x, y, color):
+    """
+    扫描线种子填充：将与(x, y)颜色相同且四连通的区域填充为指定颜色
+    每次处理一整段同色像素，段的左右边界和上下行的新种子均用NumPy批量求出
+    :param arr: 形状为(高, 宽)的uint16 RGB565数组（原地修改）
+    :param x: 种子列坐标
+    :param y: 种子行坐标
+    :param color: 填充颜色（RGB565）
+    :return: 无返回值
+    """
+    h, w = arr.shape
+    target = arr[y, x]
+    if target == color:
+        return
+    # 待填充区域：与种子同色且尚未填充的像素
+    open_mask = arr == target
+    seeds = [(x, y)]
+    while seeds:
+        sx, sy = seeds.pop()
+        row = open_mask[sy]
+        if not row[sx]:
+            continue
+        # 向左、向右找到同色段的边界
+        left_stop = np.flatnonzero(~row[:sx])
+        right_stop = np.flatnonzero(~row[sx:])
+        x0 = left_stop[-1] + 1 if len(left_stop) else 0
+        x1 = sx + right_stop[0] if len(right_stop) else w
+        row[x0:x1] = False
+        arr[sy, x0:x1] = color
+        # 相邻行中与本段重叠的每个同色段各产生一个种子
+        for ny in (sy - 1, sy + 1):
+            if 0 <= ny < h:
+                span = open_mask[ny, x0:x1]
+                starts = np.flatnonzero(span & ~np.r_[False, span[:-1]])
+                seeds.extend((x0 + int(i), ny) for i in starts)
+
+def fill_rect(arr, x0, y0, x1, y1, color, outline=False):
     """
-    高精度RGB565转RGB888（使用硬件级优化算法，提升转换精度）
-    :param rgb565: RGB565格式的颜色值（16位整数）
-    :return: 转换后的RGB888格式颜色元组（r, g, b），每个分量为0-255的整数；若出错则无返回（弹出错误提示）
+    绘制矩形（两个角点包含在内，坐标顺序任意，超出范围的部分自动裁剪）
+    :param arr: 形状为(高, 宽)的uint16 RGB565数组（原地修改）
+    :param x0: 角点1列坐标
+    :param y0: 角点1行坐标
+    :param x1: 角点2列坐标
+    :param y1: 角点2行坐标
+    :param color: 颜色（RGB565）
+    :param outline: 是否只绘制边框（默认False，实心填充）
+    :return: 无返回值
     """
-    try:
-        r = (rgb565 >> 11) & 0x1F
-        g = (rgb565 >> 5) & 0x3F
-        b = rgb565 & 0x1F
-        return (
-            (r * 527 + 23) >> 6,
-            (g * 259 + 33) >> 6,
-            (b * 527 + 23) >> 6
-        )
-    except Exception as e:
-        messagebox.showerror("转换错误", f"RGB565转RGB888时发生错误: {e}")
-
-def rgb888_to_rgb565(r, g, b):
+    x0, x1 = sorted((x0, x1))
+    y0, y1 = sorted((y0, y1))
+    h, w = arr.shape
+    cx0, cx1 = max(x0, 0), min(x1, w - 1)
+    cy0, cy1 = max(y0, 0), min(y1, h - 1)
+    if cx0 > cx1 or cy0 > cy1:
+        return
+    if not outline:
+        arr[cy0:cy1 + 1, cx0:cx1 + 1] = color
+        return
+    # 只绘制落在点阵内的边
+    if y0 >= 0:
+        arr[y0, cx0:cx1 + 1] = color
+    if y1 < h:
+        arr[y1, cx0:cx1 + 1] = color
+    if x0 >= 0:
+        arr[cy0:cy1 + 1, x0] = color
+    if x1 < w:
+        arr[cy0:cy1 + 1, x1] = color
+
+def draw_line(arr, x0, y0, x1, y1, color):
     """
-    符合嵌入式系统标准的RGB888转RGB565（含自动溢出保护，确保输入在有效范围）
-    :param r: RGB888的红色分量（整数，理论上可为任意值，函数会自动限制在0-255）
-    :param g: RGB888的绿色分量（整数，理论上可为任意值，函数会自动限制在0-255）
-    :param b: RGB888的蓝色分量（整数，理论上可为任意值，函数会自动限制在0-255）
-    :return: 转换后的RGB565格式颜色值（16位整数）；若出错则无返回（弹出错误提示）
+    绘制直线（Bresenham光栅化，超出范围的像素自动裁剪）
+    :param arr: 形状为(高, 宽)的uint16 RGB565数组（原地修改）
+    :param x0: 起点列坐标
+    :param y0: 起点行坐标
+    :param x1: 终点列坐标
+    :param y1: 终点行坐标
+    :param color: 颜色（RGB565）
+    :return: 无返回值
     """
-    try:
-        r = min(max(r, 0), 255)
-        g = min(max(g, 0), 255)
-        b = min(max(b, 0), 255)
-        return ((r >> 3) << 11) | ((g >> 2) << 5) | (b >> 3)
-    except Exception as e:
-        messagebox.showerror("转换错误", f"RGB888转RGB565时发生错误: {e}")
-
-def rgb_to_hex(rgb_tuple):
+    h, w = arr.shape
+    cells = np.array(line_cells(x0, y0, x1, y1))
+    inside = (cells[:, 0] >= 0) & (cells[:, 0] < w) & (cells[:, 1] >= 0) & (cells[:, 1] < h)
+    cells = cells[inside]
+    arr[cells[:, 1], cells[:, 0]] = color
+
+def replace_color(arr, old, new):
     """
-    将RGB888元组转换为十六进制颜色代码（符合CSS/UI设计的标准格式）
-    :param rgb_tuple: RGB888格式的颜色元组，包含r、g、b三个分量（每个分量为0-255的整数）
-    :return: 十六进制颜色代码字符串（格式为#rrggbb，如#ffffff表示白色）；若出错则无返回（弹出错误提示）
+    全局替换颜色：将所有等于old的像素替换为new
+    :param arr: 形状为(高, 宽)的uint16 RGB565数组
+    :param old: 被替换的颜色（RGB565）
+    :param new: 替换后的颜色（RGB565）
+    :return: 替换后的新数组
     """
-    try:
-        return "#{:02x}{:02x}{:02x}".format(*rgb_tuple)
-    except Exception as e:
-        messagebox.showerror("转换错误", f"RGB转十六进制时发生错误: {e}")
+    return np.where(arr == old, np.uint16(new), arr)
+
+def shift_pixels(arr, dx, dy):
+    """
+    循环平移：移出边界的像素从另一侧移入
+    :param arr: 形状为(高, 宽)的uint16 RGB565数组
+    :param dx: 水平平移量（正数向右）
+    :param dy: 垂直平移量（正数向下）
+    :return: 平移后的新数组
+    """
+    return np.roll(arr, (dy, dx), axis=(0, 1))
+
+def flip_pixels(arr, horizontal=True):
+    """
+    翻转点阵
+    :param arr: 形状为(高, 宽)的uint16 RGB565数组
+    :param horizontal: True为左右翻转，False为上下翻转
+    :return: 翻转后的新数组
+    """
+    return arr[:, ::-1] if horizontal else arr[::-1, :]
+
+def zoom_step(pixel_size, direction):
+    """
+    按缩放级别表取相邻的像素显示尺寸
+    :param pixel_size: 当前像素显示尺寸
+    :param direction: 1为放大，-1为缩小
+    :return: 新的像素显示尺寸（已在最大/最小级别时保持不变）
+    """
+    if direction > 0:
+        larger = [z for z in ZOOM_LEVELS if z > pixel_size]
+        return larger[0] if larger else pixel_size
+    smaller = [z for z in ZOOM_LEVELS if z < pixel_size]
+    return smaller[-1] if smaller else pixel_size
+
+def pixels_from_data(data):
+    """
+    校验点阵数据并转换为编辑用的RGB565数组（加载时校验一次，之后的编辑操作不再检查形状）
+    :param data: 点阵数据字典，需包含pixels、width、height字段
+    :return: 形状为(高, 宽)的uint16数组
+    """
+    for key in ("pixels", "width", "height"):
+        if key not in data:
+            raise ValueError(f"点阵数据缺少字段: {key}")
+    w, h = data["width"], data["height"]
+    if not (isinstance(w, int) and isinstance(h, int) and 0 < w <= MAX_MATRIX_SIZE and 0 < h <= MAX_MATRIX_SIZE):
+        raise ValueError(f"点阵尺寸无效: {w}×{h}（宽高须为1-{MAX_MATRIX_SIZE}的整数）")
+    if len(data["pixels"]) != w * h:
+        raise ValueError(f"像素数与点阵尺寸不符: 共 {len(data['pixels'])} 个像素，{w}×{h} 点阵需要 {w * h} 个")
+    return np.array(data["pixels"], dtype=np.uint16).reshape(h, w)
 
 # ======================================== 自定义类 ============================================
 
+class EditHistory:
+    """
+    基于增量的撤销/重做历史：每个操作只记录发生变化的像素，按连续索引段压缩存储
+    核心特性：
+        1. 每个操作保存(起始索引, 段长度)以及变化前后的RGB565值，不再保存整幅点阵副本
+        2. 支持重做，新操作会清空重做栈
+        3. 总内存超过上限时丢弃最早的操作（至少保留最近一次操作）
+    """
+    def __init__(self, max_bytes=HISTORY_LIMIT_MB * 1024 * 1024):
+        """
+        初始化历史记录
+        :param max_bytes: 撤销与重做记录合计的内存上限（字节）
+        :return: 无返回值
+        """
+        self.max_bytes = max_bytes
+        self.undo_ops = deque()
+        self.redo_ops = []
+        # 当前所有记录占用的内存（字节）
+        self.nbytes = 0
+
+    @staticmethod
+    def make_operation(indices, old, new):
+        """
+        构造一个操作记录：去掉前后值相同的像素，按索引排序后压缩为连续索引段
+        :param indices: 像素索引序列
+        :param old: 对应的原RGB565值序列
+        :param new: 对应的新RGB565值序列
+        :return: 操作元组(段起点, 段长度, 原值, 新值)；没有任何像素变化时返回None
+        """
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        old = np.asarray(old, dtype=np.uint16).ravel()
+        new = np.asarray(new, dtype=np.uint16).ravel()
+        changed = old != new
+        if not changed.any():
+            return None
+        indices, old, new = indices[changed], old[changed], new[changed]
+        # 同一像素多次出现时保留首次的原值和末次的新值
+        order = np.argsort(indices, kind="stable")
+        indices, old, new = indices[order], old[order], new[order]
+        first = np.r_[True, indices[1:] != indices[:-1]]
+        last = np.r_[indices[1:] != indices[:-1], True]
+        indices, old, new = indices[first], old[first], new[last]
+        breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+        starts = indices[np.r_[0, breaks]].astype(np.uint32)
+        lengths = np.diff(np.r_[0, breaks, len(indices)]).astype(np.uint32)
+        return starts, lengths, old, new
+
+    @staticmethod
+    def operation_indices(op):
+        """
+        将操作记录中的连续索引段展开为像素索引数组
+        :param op: 操作元组
+        :return: int64像素索引数组
+        """
+        starts, lengths = op[0].astype(np.int64), op[1].astype(np.int64)
+        offsets = np.cumsum(lengths) - lengths
+        return np.arange(int(lengths.sum())) + np.repeat(starts - offsets, lengths)
+
+    @staticmethod
+    def operation_size(op):
+        """
+        计算操作记录占用的内存
+        :param op: 操作元组
+        :return: 字节数
+        """
+        return sum(part.nbytes for part in op)
+
+    def record(self, indices, old, new):
+        """
+        记录一次编辑操作，清空重做栈，并按内存上限丢弃最早的操作
+        :param indices: 像素索引序列
+        :param old: 对应的原RGB565值序列
+        :param new: 对应的新RGB565值序列
+        :return: 是否记录了操作（没有像素变化时为False）
+        """
+        op = self.make_operation(indices, old, new)
+        if op is None:
+            return False
+        for dropped in self.redo_ops:
+            self.nbytes -= self.operation_size(dropped)
+        self.redo_ops = []
+        self.undo_ops.append(op)
+        self.nbytes += self.operation_size(op)
+        while self.nbytes > self.max_bytes and len(self.undo_ops) > 1:
+            self.nbytes -= self.operation_size(self.undo_ops.popleft())
+        return True
+
+    def undo(self):
+        """
+        弹出最近一次操作并移入重做栈
+        :return: (像素索引数组, 需恢复的原值数组)；没有可撤销的操作时返回None
+        """
+        if not self.undo_ops:
+            return None
+        op = self.undo_ops.pop()
+        self.redo_ops.append(op)
+        return self.operation_indices(op), op[2]
+
+    def redo(self):
+        """
+        弹出最近一次撤销的操作并移回撤销栈
+        :return: (像素索引数组, 需重新写入的新值数组)；没有可重做的操作时返回None
+        """
+        if not self.redo_ops:
+            return None
+        op = self.redo_ops.pop()
+        self.undo_ops.append(op)
+        return self.operation_indices(op), op[3]
+
+    def clear(self):
+        """
+        清空所有撤销/重做记录
+        :return: 无返回值
+        """
+        self.undo_ops.clear()
+        self.redo_ops = []
+        self.nbytes = 0
+
 class PixelEditor:
     """
     WS2812点阵像素编辑器类，支持像素绘制、颜色选择、JSON文件导入/导出、撤销操作等功能
     核心特性：
-        1. 支持自定义点阵尺寸，自动适配像素显示大小
-        2. 支持鼠标点击/拖拽绘制像素
+        1. 支持自定义点阵尺寸，自动适配像素显示大小；支持滚动和缩放，只渲染可见区域
+        2. 支持鼠标点击/拖拽绘制像素（拖拽路径按直线插值，整笔作为一次撤销操作）
         3. 支持JSON格式的点阵数据加载与保存
-        4. 提供撤销功能，支持颜色选择器
+        4. 提供填充、矩形、直线、全局替换颜色、循环平移、翻转等批量编辑工具（NumPy一次完成）
+        5. 提供增量撤销/重做功能（内存占用有上限），支持颜色选择器
     """
-    def __init__(self, parent_container, json_file=None):
+    def __init__(self, parent_container, json_file=None, history_limit_mb=HISTORY_LIMIT_MB):
         """
         初始化像素编辑器的界面和数据
         :param parent_container: 父容器（可以是tk.Frame、tk.Tk或tk.Toplevel对象）
         :param json_file: 可选参数，要加载的JSON点阵数据文件路径（字符串），默认为None
+        :param history_limit_mb: 撤销/重做历史的内存上限（MB，默认16）
         :return: 无返回值
         """
         # 添加窗口类型判断
@@ -86,17 +358,33 @@ class PixelEditor:
         else:
             self.root = parent_container
 
-        # 初始化撤销栈、像素大小参数和矩形ID存储
-        # 存储像素数据的历史状态，用于撤销操作
-        self.undo_stack = []
+        # 初始化撤销历史、像素大小参数和画布图像
+        # 只记录每次操作中变化的像素，用于撤销/重做
+        self.history = EditHistory(int(history_limit_mb * 1024 * 1024))
         # 默认单个像素的显示尺寸（像素）
         self.default_pixel_size = 30
         # 当前单个像素的显示尺寸
         self.pixel_size = self.default_pixel_size
         # 当前绘制使用的颜色（RGB888）
         self.current_color = (255, 255, 255)
-        # 存储每个像素的矩形ID
-        self.rect_ids = []
+        # 可见区域对应的放大图像（单个PhotoImage）及其画布项ID
+        self.photo = None
+        self.image_id = None
+        # 当前已渲染的可见像素范围(列起点, 行起点, 列终点, 行终点)，终点不含
+        self.view = (0, 0, 0, 0)
+        # 已登记的可见区域刷新回调（滚动/缩放/窗口尺寸变化时合并为一次）
+        self.view_job = None
+        # 当前笔画：{像素索引: 笔画开始前的原值}，以及上一个落笔的像素坐标
+        self.stroke = None
+        self.last_cell = None
+        # 等待在空闲时统一重绘的像素索引，以及已登记的after_idle回调
+        self.pending_cells = set()
+        self.flush_job = None
+        # 编辑中的点阵颜色（形状为(高, 宽)的uint16数组），只在保存时写回self.data["pixels"]
+        self.pixels = None
+        # 当前编辑工具，以及矩形/直线工具按下时的起点像素坐标
+        self.tool = tk.StringVar(value="pen")
+        self.anchor_cell = None
 
         # 默认模板
         self.data_template = {
@@ -116,6 +404,7 @@ class PixelEditor:
         else:
             self.initialize_default()
 
+        self.update_scrollregion()
         self.draw_pixels()
 
     def initialize_default(self):
@@ -123,17 +412,28 @@ class PixelEditor:
         生成默认测试图案（前4列红色，后4列绿色的8×8点阵）
         :return: 无返回值
         """
-        self.data = self.data_template.copy()
+        data = self.data_template.copy()
         # 构造默认像素数据：每行前4个像素为红色，后4个为绿色
-        self.data["pixels"] = [
+        data["pixels"] = [
             rgb888_to_rgb565(255, 0, 0) if x < 4 else rgb888_to_rgb565(0, 255, 0)
             for _ in range(8) for x in range(8)
         ]
+        self.set_data(data)
+
+    def set_data(self, data):
+        """
+        校验并切换到新的点阵数据，建立编辑用的像素数组，并清空撤销历史
+        :param data: 点阵数据字典
+        :return: 无返回值
+        """
+        self.pixels = pixels_from_data(data)
+        self.data = data
+        self.history.clear()
 
     def new_template(self):
         """
         新建纯白模板，支持用户自定义点阵尺寸并自动适配像素显示大小
-            1. 弹出输入框让用户输入宽度和高度（限制宽度≤256，高度≤128）
+            1. 弹出输入框让用户输入宽度和高度（均不超过MAX_MATRIX_SIZE）
             2. 根据屏幕尺寸计算合适的像素显示大小
             3. 初始化纯白点阵数据并重新绘制
         :return: 无返回值
@@ -141,38 +441,24 @@ class PixelEditor:
         try:
             # 将编辑器窗口提升到顶层
             self.root.lift()
-            # 弹出输入框获取宽度（最小值1，最大值256）
-            w = simpledialog.askinteger("宽度", "请输入模板宽度:", parent=self.root, minvalue=1, maxvalue=256)
+            # 弹出输入框获取宽度（最小值1，最大值MAX_MATRIX_SIZE）
+            w = simpledialog.askinteger("宽度", "请输入模板宽度:", parent=self.root,
+                                        minvalue=1, maxvalue=MAX_MATRIX_SIZE)
             # 用户取消输入
             if w is None: return
-            # 弹出输入框获取高度（最小值1，最大值128）
-            h = simpledialog.askinteger("高度", "请输入模板高度:", parent=self.root, minvalue=1, maxvalue=128)
+            # 弹出输入框获取高度（最小值1，最大值MAX_MATRIX_SIZE）
+            h = simpledialog.askinteger("高度", "请输入模板高度:", parent=self.root,
+                                        minvalue=1, maxvalue=MAX_MATRIX_SIZE)
             if h is None: return
 
-            # 尺寸超限提示
-            if w > 256 or h > 128:
-                messagebox.showwarning("尺寸超限", "宽度<=256，高度<=128", parent=self.root)
-                return
-
-            # 计算最大可显示的像素尺寸（基于屏幕尺寸的2/3）
-            max_w = (self.root.winfo_screenwidth() * 2) // 3
-            max_h = (self.root.winfo_screenheight() * 2) // 3
-            cell_w = max_w // w
-            cell_h = max_h // h
-
-            # 限制像素尺寸在5到默认尺寸之间
-            self.pixel_size = max(5, min(self.default_pixel_size, cell_w, cell_h))
-
             # 初始化纯白点阵数据
             white = rgb888_to_rgb565(255, 255, 255)
-            self.data = {"pixels": [white] * (w * h), "width": w, "height": h,
-                         "description": "Pure white template", "version": 1.0}
-            # 清空撤销栈
-            self.undo_stack.clear()
-            # 调整画布尺寸并重新绘制像素
-            self.canvas.config(width=w * self.pixel_size, height=h * self.pixel_size)
+            # 切换数据并清空撤销历史
+            self.set_data({"pixels": [white] * (w * h), "width": w, "height": h,
+                           "description": "Pure white template", "version": 1.0})
+            # 计算像素显示尺寸、调整画布尺寸并重新绘制像素
+            self.fit_to_screen()
             # 更新状态提示
-            self.draw_pixels()
             self.status_label.config(text=f"已创建 {w}×{h} 模板")
         except Exception as e:
             messagebox.showerror("新建错误", f"错误: {e}")
@@ -181,17 +467,34 @@ class PixelEditor:
         """
         创建编辑器的UI组件，包括画布、控制按钮、颜色预览框、状态标签
             1. 创建画布用于显示和绘制像素
-            2. 创建控制按钮（新建模板、选择颜色、导入/导出JSON、撤销）
+            2. 创建控制按钮（新建模板、选择颜色、导入/导出JSON、撤销/重做）与编辑工具栏
             3. 创建颜色预览标签和状态提示标签
         :return: 无返回值
         """
         try:
-            # 创建画布（背景色为深灰色）
-            self.canvas = tk.Canvas(self.root, bg="#404040")
-            self.canvas.pack(padx=5, pady=5, expand=True, fill=tk.BOTH)
+            # 创建画布（背景色为深灰色）及水平/垂直滚动条
+            view = tk.Frame(self.root)
+            view.pack(padx=5, pady=5, expand=True, fill=tk.BOTH)
+            view.rowconfigure(0, weight=1)
+            view.columnconfigure(0, weight=1)
+            self.canvas = tk.Canvas(view, bg="#404040", highlightthickness=0)
+            self.canvas.grid(row=0, column=0, sticky="nsew")
+            xbar = tk.Scrollbar(view, orient=tk.HORIZONTAL, command=self.canvas.xview)
+            xbar.grid(row=1, column=0, sticky="ew")
+            ybar = tk.Scrollbar(view, orient=tk.VERTICAL, command=self.canvas.yview)
+            ybar.grid(row=0, column=1, sticky="ns")
+            # 滚动位置变化时同步滚动条，并登记可见区域刷新
+            self.canvas.config(xscrollcommand=lambda *a: (xbar.set(*a), self.schedule_view_update()),
+                               yscrollcommand=lambda *a: (ybar.set(*a), self.schedule_view_update()))
             # 绑定鼠标事件：左键点击绘制像素、左键拖拽绘制像素
             self.canvas.bind("<Button-1>", self.on_pixel_click)
             self.canvas.bind("<B1-Motion>", self.on_pixel_drag)
+            self.canvas.bind("<ButtonRelease-1>", self.on_pixel_release)
+            # 滚轮滚动（Shift水平滚动，Ctrl缩放），画布尺寸变化时刷新可见区域
+            self.canvas.bind("<MouseWheel>", self.on_mouse_wheel)
+            self.canvas.bind("<Button-4>", self.on_mouse_wheel)
+            self.canvas.bind("<Button-5>", self.on_mouse_wheel)
+            self.canvas.bind("<Configure>", lambda e: self.schedule_view_update())
 
             # 创建控制按钮框架
             ctrl = tk.Frame(self.root)
@@ -204,8 +507,30 @@ class PixelEditor:
                              ("选择颜色", self.choose_color),
                              ("导入JSON", self.load_file),
                              ("保存JSON", self.save_file),
-                             ("撤销", self.undo)]:
+                             ("撤销", self.undo),
+                             ("重做", self.redo)]:
                 tk.Button(ctrl, text=txt, width=8, command=cmd).pack(side=tk.LEFT, padx=5)
+            # 快捷键：Ctrl+Z撤销，Ctrl+Y重做
+            top = self.root.winfo_toplevel()
+            top.bind("<Control-z>", lambda e: self.undo())
+            top.bind("<Control-y>", lambda e: self.redo())
+
+            # 创建编辑工具框架：工具选择（单选按钮）与平移/翻转按钮
+            tools = tk.Frame(self.root)
+            tools.pack(pady=5)
+            for key, txt in EDIT_TOOLS.items():
+                tk.Radiobutton(tools, text=txt, value=key, variable=self.tool, indicatoron=False,
+                               width=8).pack(side=tk.LEFT, padx=2)
+            for txt, dx, dy in [("←", -1, 0), ("→", 1, 0), ("↑", 0, -1), ("↓", 0, 1)]:
+                tk.Button(tools, text=txt, width=2,
+                          command=lambda dx=dx, dy=dy: self.apply_array(shift_pixels(self.pixel_array(), dx, dy))
+                          ).pack(side=tk.LEFT, padx=2)
+            tk.Button(tools, text="水平翻转", width=8,
+                      command=lambda: self.apply_array(flip_pixels(self.pixel_array(), True))).pack(side=tk.LEFT, padx=2)
+            tk.Button(tools, text="垂直翻转", width=8,
+                      command=lambda: self.apply_array(flip_pixels(self.pixel_array(), False))).pack(side=tk.LEFT, padx=2)
+            tk.Button(tools, text="放大", width=4, command=lambda: self.zoom(1)).pack(side=tk.LEFT, padx=2)
+            tk.Button(tools, text="缩小", width=4, command=lambda: self.zoom(-1)).pack(side=tk.LEFT, padx=2)
 
             # 创建状态提示标签（下沉样式，左对齐）
             self.status_label = tk.Label(self.root, text="欢迎！", bd=1, relief=tk.SUNKEN, anchor=tk.W)
@@ -213,69 +538,374 @@ class PixelEditor:
         except Exception as e:
             messagebox.showerror("UI错误", str(e))
 
+    def fit_to_screen(self):
+        """
+        按点阵尺寸计算初始像素显示尺寸（基于屏幕尺寸的2/3，限制在5到默认尺寸之间），
+        画布尺寸不超过屏幕的2/3，超出部分通过滚动查看
+        :return: 无返回值
+        """
+        w, h = self.data["width"], self.data["height"]
+        max_w = (self.root.winfo_screenwidth() * 2) // 3
+        max_h = (self.root.winfo_screenheight() * 2) // 3
+        self.pixel_size = max(5, min(self.default_pixel_size, max_w // w, max_h // h))
+        self.canvas.config(width=min(w * self.pixel_size, max_w), height=min(h * self.pixel_size, max_h))
+        self.update_scrollregion()
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.draw_pixels()
+
+    def update_scrollregion(self):
+        """
+        按点阵尺寸和当前像素显示尺寸设置画布的滚动范围
+        :return: 无返回值
+        """
+        self.canvas.config(scrollregion=(0, 0, self.data["width"] * self.pixel_size,
+                                         self.data["height"] * self.pixel_size))
+
+    def visible_cells(self):
+        """
+        计算画布当前可见区域覆盖的像素范围
+        :return: (列起点, 行起点, 列终点, 行终点)，终点不含，已限制在点阵范围内
+        """
+        ps = self.pixel_size
+        vw = self.canvas.winfo_width()
+        vh = self.canvas.winfo_height()
+        # 画布尚未显示时使用请求的尺寸
+        if vw <= 1:
+            vw = int(self.canvas.cget("width"))
+        if vh <= 1:
+            vh = int(self.canvas.cget("height"))
+        left, top = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        c0 = min(max(int(left // ps), 0), self.data["width"])
+        r0 = min(max(int(top // ps), 0), self.data["height"])
+        c1 = min(int((left + vw) // ps) + 1, self.data["width"])
+        r1 = min(int((top + vh) // ps) + 1, self.data["height"])
+        return c0, r0, c1, r1
+
+    def schedule_view_update(self):
+        """
+        登记一次after_idle可见区域刷新：连续的滚动/缩放/尺寸变化只触发一次渲染
+        :return: 无返回值
+        """
+        if self.view_job is None:
+            self.view_job = self.canvas.after_idle(self.refresh_view)
+
+    def refresh_view(self):
+        """
+        可见像素范围变化时重新渲染，未变化时不做任何操作
+        :return: 无返回值
+        """
+        self.view_job = None
+        if self.visible_cells() != self.view:
+            self.draw_pixels()
+
     def draw_pixels(self):
         """
-        初始化或重绘整个像素矩阵，根据self.data中的点阵数据在画布上绘制矩形像素
-            1. 清空画布所有内容
-            2. 遍历每个像素位置，计算矩形坐标并绘制
-            3. 存储每个矩形的ID到self.rect_ids，用于后续颜色更新
+        渲染可见区域：只把可见范围内的像素放大为一张PhotoImage，像素边框作为独立的网格覆盖层
+            1. 逐行切片取出可见像素，批量转换为RGB888并按像素尺寸放大
+            2. 图像尺寸不变时直接写入已有图像，否则重建图像
+            3. 画布上只有1个图像项和可见范围内的网格线，内存和重绘开销只与视口大小有关
+        :return: 无返回值
+        """
+        # 整幅重绘已包含所有待更新的像素
+        self.pending_cells.clear()
+        ps = self.pixel_size
+        c0, r0, c1, r1 = self.view = self.visible_cells()
+        if c1 <= c0 or r1 <= r0:
+            return
+        rgb = rgb565_array_to_rgb888(self.pixels[r0:r1, c0:c1])
+        image = Image.fromarray(rgb).resize(((c1 - c0) * ps, (r1 - r0) * ps), Image.NEAREST)
+
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == image.size:
+            # 尺寸未变化：原地更新图像内容
+            self.photo.paste(image)
+        else:
+            self.photo = ImageTk.PhotoImage(image, master=self.canvas)
+            if self.image_id is None:
+                self.image_id = self.canvas.create_image(0, 0, image=self.photo, anchor=tk.NW)
+            else:
+                self.canvas.itemconfig(self.image_id, image=self.photo)
+        self.canvas.coords(self.image_id, c0 * ps, r0 * ps)
+        self.canvas.tag_lower(self.image_id)
+        self.draw_grid()
+
+    def draw_grid(self):
+        """
+        绘制可见范围内的像素边框网格覆盖层（每行、每列一条线，位于图像之上）；像素尺寸过小时不绘制
         :return: 无返回值
         """
-        # 清空画布
-        self.canvas.delete("all")
-        self.rect_ids = []
+        self.canvas.delete("grid")
+        ps = self.pixel_size
+        if ps < GRID_MIN_PIXEL_SIZE:
+            return
+        c0, r0, c1, r1 = self.view
+        for x in range(c0, c1 + 1):
+            self.canvas.create_line(x * ps, r0 * ps, x * ps, r1 * ps, fill=GRID_OUTLINE, tags="grid")
+        for y in range(r0, r1 + 1):
+            self.canvas.create_line(c0 * ps, y * ps, c1 * ps, y * ps, fill=GRID_OUTLINE, tags="grid")
+        if self.canvas.find_withtag("preview"):
+            self.canvas.tag_raise("preview")
+
+    def paint_cell(self, x, y):
+        """
+        只重绘单个像素：按当前数据的颜色填充图像中对应的方块，无需重建整张图像；不在可见区域内时忽略
+        :param x: 像素列坐标
+        :param y: 像素行坐标
+        :return: 无返回值
+        """
+        c0, r0, c1, r1 = self.view
+        if not (c0 <= x < c1 and r0 <= y < r1):
+            return
+        hexc = rgb565_to_hex(int(self.pixels[y, x]))
+        ps = self.pixel_size
+        x0, y0 = (x - c0) * ps, (y - r0) * ps
+        # ImageTk.PhotoImage的字符串形式即Tk图像名，可直接调用Tk的put填充矩形区域
+        self.canvas.tk.call(str(self.photo), "put", hexc, "-to", x0, y0, x0 + ps, y0 + ps)
+
+    def zoom(self, direction, event=None):
+        """
+        按缩放级别放大/缩小，保持鼠标位置（无鼠标事件时为视口中心）下的像素不动
+        :param direction: 1为放大，-1为缩小
+        :param event: 触发缩放的鼠标事件（可选）
+        :return: 无返回值
+        """
+        old = self.pixel_size
+        new = zoom_step(old, direction)
+        if new == old:
+            return
+        if event is not None:
+            ax, ay = event.x, event.y
+        else:
+            ax, ay = self.canvas.winfo_width() // 2, self.canvas.winfo_height() // 2
+        # 缩放锚点对应的点阵坐标（浮点像素）
+        fx = self.canvas.canvasx(ax) / old
+        fy = self.canvas.canvasy(ay) / old
+        self.pixel_size = new
+        self.update_scrollregion()
+        total_w = self.data["width"] * new
+        total_h = self.data["height"] * new
+        self.canvas.xview_moveto(max(fx * new - ax, 0) / total_w)
+        self.canvas.yview_moveto(max(fy * new - ay, 0) / total_h)
+        self.draw_pixels()
+        self.status_label.config(text=f"缩放: {new} 像素/格")
 
-        # 获取点阵的宽度和高度
-        w, h = self.data["width"], self.data["height"]
-        for y in range(h):
-            row = []
-            for x in range(w):
-                idx = y * w + x
-                color = rgb565_to_rgb888(self.data["pixels"][idx])
-                hexc = rgb_to_hex(color)
-                x0, y0 = x * self.pixel_size, y * self.pixel_size
-                rid = self.canvas.create_rectangle(x0, y0, x0 + self.pixel_size,
-                                                   y0 + self.pixel_size,
-                                                   fill=hexc, outline="gray")
-                row.append(rid)
-            self.rect_ids.append(row)
+    def on_mouse_wheel(self, event):
+        """
+        处理鼠标滚轮事件：默认垂直滚动，按住Shift水平滚动，按住Ctrl缩放
+        :param event: 鼠标事件对象（Windows/macOS使用delta，Linux使用Button-4/5）
+        :return: 无返回值
+        """
+        direction = 1 if (event.num == 4 or event.delta > 0) else -1
+        if event.state & 0x0004:
+            self.zoom(direction, event)
+        elif event.state & 0x0001:
+            self.canvas.xview_scroll(-direction * 3, "units")
+        else:
+            self.canvas.yview_scroll(-direction * 3, "units")
+
+    def paint_cells(self, indices):
+        """
+        只重绘指定的像素（可见区域外的忽略）；数量较多时重绘整个可见区域更快
+        :param indices: 像素索引序列
+        :return: 无返回值
+        """
+        c0, r0, c1, r1 = self.view
+        w = self.data["width"]
+        if len(indices) > (c1 - c0) * (r1 - r0) * PARTIAL_REPAINT_RATIO:
+            self.draw_pixels()
+            return
+        for idx in indices:
+            y, x = divmod(int(idx), w)
+            self.paint_cell(x, y)
+
+    def pixel_array(self):
+        """
+        获取编辑像素数组的副本，供批量编辑工具原地修改
+        :return: 形状为(高, 宽)的uint16 RGB565数组
+        """
+        return self.pixels.copy()
+
+    def apply_array(self, arr):
+        """
+        将批量编辑后的数组写回编辑像素数组：变化的像素作为一次操作写入撤销历史，并一次性重绘
+        :param arr: 编辑后形状为(高, 宽)的uint16数组
+        :return: 变化的像素数
+        """
+        self.end_stroke()
+        old = self.pixels.reshape(-1)
+        new = np.asarray(arr, dtype=np.uint16).reshape(-1)
+        changed = np.flatnonzero(old != new)
+        if len(changed):
+            self.history.record(changed, old[changed], new[changed])
+            old[changed] = new[changed]
+            self.paint_cells(changed)
+        return len(changed)
+
+    def apply_values(self, indices, values):
+        """
+        将一组RGB565值写入编辑像素数组并重绘受影响的像素
+        :param indices: 像素索引数组
+        :param values: 对应的RGB565值数组
+        :return: 无返回值
+        """
+        self.pixels.reshape(-1)[indices] = values
+        self.paint_cells(indices)
+
+    def event_cell(self, event):
+        """
+        将鼠标事件的窗口坐标换算为点阵像素坐标（考虑滚动偏移）
+        :param event: 鼠标事件对象
+        :return: (x列, y行)
+        """
+        ps = self.pixel_size
+        return int(self.canvas.canvasx(event.x) // ps), int(self.canvas.canvasy(event.y) // ps)
 
     def on_pixel_click(self, event):
         """
-        处理鼠标左键点击事件：在点击位置绘制当前颜色的像素，并记录历史状态到撤销栈
+        处理鼠标左键点击事件：按当前工具开始笔画、执行填充/替换，或记录矩形/直线的起点
         :param event: 鼠标事件对象（包含点击的x、y坐标）
         :return: 无返回值
         """
         try:
+            self.end_stroke()
             # 计算点击位置对应的像素坐标（x列，y行）
-            x, y = event.x // self.pixel_size, event.y // self.pixel_size
-            # 检查坐标是否在点阵范围内
-            if 0 <= x < self.data["width"] and 0 <= y < self.data["height"]:
-                self.undo_stack.append(self.data["pixels"][:])
-                idx = y * self.data["width"] + x
-                self.data["pixels"][idx] = rgb888_to_rgb565(*self.current_color)
-                hexc = rgb_to_hex(rgb565_to_rgb888(self.data["pixels"][idx]))
-                self.canvas.itemconfig(self.rect_ids[y][x], fill=hexc)
+            x, y = self.event_cell(event)
+            tool = self.tool.get()
+            if tool in ("rect", "outline", "line"):
+                self.anchor_cell = (x, y)
+                self.update_preview(x, y)
+                return
+            if not (0 <= x < self.data["width"] and 0 <= y < self.data["height"]):
+                return
+            color = rgb888_to_rgb565(*self.current_color)
+            if tool == "fill":
+                arr = self.pixel_array()
+                flood_fill(arr, x, y, color)
+                self.apply_array(arr)
+            elif tool == "replace":
+                arr = self.pixel_array()
+                self.apply_array(replace_color(arr, arr[y, x], color))
+            else:
+                self.stroke = {}
+                self.paint_stroke([(x, y)])
+                self.last_cell = (x, y)
         except Exception as e:
             messagebox.showerror("点击错误", str(e))
 
     def on_pixel_drag(self, event):
         """
-        处理鼠标左键拖拽事件：在拖拽路径上绘制当前颜色的像素
+        处理鼠标左键拖拽事件：画笔用Bresenham直线连接上一个与当前采样点，快速拖拽时也不会漏掉像素；
+        矩形/直线工具只更新预览
         :param event: 鼠标事件对象（包含拖拽的x、y坐标）
         :return: 无返回值
         """
         try:
             # 计算拖拽位置对应的像素坐标（x列，y行）
-            x, y = event.x // self.pixel_size, event.y // self.pixel_size
-            if 0 <= x < self.data["width"] and 0 <= y < self.data["height"]:
-                idx = y * self.data["width"] + x
-                self.data["pixels"][idx] = rgb888_to_rgb565(*self.current_color)
-                hexc = rgb_to_hex(rgb565_to_rgb888(self.data["pixels"][idx]))
-                self.canvas.itemconfig(self.rect_ids[y][x], fill=hexc)
+            x, y = self.event_cell(event)
+            if self.anchor_cell is not None:
+                self.update_preview(x, y)
+                return
+            if self.stroke is None or (x, y) == self.last_cell:
+                return
+            self.paint_stroke(line_cells(*self.last_cell, x, y))
+            self.last_cell = (x, y)
         except Exception as e:
             messagebox.showerror("拖拽错误", str(e))
 
+    def on_pixel_release(self, event):
+        """
+        处理鼠标左键释放事件：结束当前笔画，或将矩形/直线绘制到点阵上
+        :param event: 鼠标事件对象
+        :return: 无返回值
+        """
+        try:
+            if self.anchor_cell is not None:
+                x, y = self.event_cell(event)
+                x0, y0 = self.anchor_cell
+                self.anchor_cell = None
+                self.canvas.delete("preview")
+                arr = self.pixel_array()
+                color = rgb888_to_rgb565(*self.current_color)
+                if self.tool.get() == "line":
+                    draw_line(arr, x0, y0, x, y, color)
+                else:
+                    fill_rect(arr, x0, y0, x, y, color, outline=self.tool.get() == "outline")
+                self.apply_array(arr)
+            self.end_stroke()
+        except Exception as e:
+            messagebox.showerror("绘制错误", str(e))
+
+    def update_preview(self, x, y):
+        """
+        在画布上显示矩形/直线工具从起点到当前像素的预览
+        :param x: 当前像素列坐标
+        :param y: 当前像素行坐标
+        :return: 无返回值
+        """
+        self.canvas.delete("preview")
+        ps = self.pixel_size
+        x0, y0 = self.anchor_cell
+        if self.tool.get() == "line":
+            half = ps // 2
+            self.canvas.create_line(x0 * ps + half, y0 * ps + half, x * ps + half, y * ps + half,
+                                    fill=PREVIEW_COLOR, width=2, tags="preview")
+        else:
+            (x0, x1), (y0, y1) = sorted((x0, x)), sorted((y0, y))
+            self.canvas.create_rectangle(x0 * ps, y0 * ps, (x1 + 1) * ps, (y1 + 1) * ps,
+                                         outline=PREVIEW_COLOR, width=2, tags="preview")
+
+    def paint_stroke(self, cells):
+        """
+        将笔画经过的像素写入编辑像素数组（越界坐标忽略），记录各像素的原值并登记空闲时重绘
+        :param cells: [(x, y), ...]像素坐标列表
+        :return: 无返回值
+        """
+        w, h = self.data["width"], self.data["height"]
+        pixels = self.pixels
+        color = rgb888_to_rgb565(*self.current_color)
+        for x, y in cells:
+            if 0 <= x < w and 0 <= y < h:
+                idx = y * w + x
+                self.stroke.setdefault(idx, int(pixels[y, x]))
+                pixels[y, x] = color
+                self.pending_cells.add(idx)
+        self.schedule_flush()
+
+    def end_stroke(self):
+        """
+        结束当前笔画：立即完成待重绘的像素，并将整个笔画作为一次操作写入撤销历史
+        :return: 无返回值
+        """
+        if self.stroke is None:
+            return
+        self.flush_pending()
+        if self.stroke:
+            indices = list(self.stroke)
+            self.history.record(indices, list(self.stroke.values()), self.pixels.reshape(-1)[indices])
+        self.stroke = None
+        self.last_cell = None
+
+    def schedule_flush(self):
+        """
+        登记一次after_idle重绘：同一个空闲周期内的多次绘制只触发一次画布更新
+        :return: 无返回值
+        """
+        if self.flush_job is None and self.pending_cells:
+            self.flush_job = self.canvas.after_idle(self.flush_pending)
+
+    def flush_pending(self):
+        """
+        重绘所有待更新的像素
+        :return: 无返回值
+        """
+        if self.flush_job is not None:
+            self.canvas.after_cancel(self.flush_job)
+            self.flush_job = None
+        if self.pending_cells:
+            cells = sorted(self.pending_cells)
+            self.pending_cells.clear()
+            self.paint_cells(cells)
+
     def choose_color(self):
         """
         打开系统颜色选择器，让用户选择绘制颜色，并更新颜色预览标签
@@ -298,19 +928,10 @@ class PixelEditor:
         try:
             with open(path) as f:
                 d = json.load(f)
-            for k in ("pixels", "width", "height"): assert k in d
-            self.data = d
-            # 根据新尺寸重新计算像素格大小
-            w, h = d["width"], d["height"]
-            max_w = (self.root.winfo_screenwidth() * 2) // 3
-            max_h = (self.root.winfo_screenheight() * 2) // 3
-            cell_w = max_w // w
-            cell_h = max_h // h
-            self.pixel_size = max(5, min(self.default_pixel_size, cell_w, cell_h))
-            self.canvas.config(width=w * self.pixel_size,
-                               height=h * self.pixel_size)
-            self.undo_stack.clear()
-            self.draw_pixels()
+            # 校验字段与像素数，不符时给出明确提示且保留当前编辑内容
+            self.set_data(d)
+            # 根据新尺寸重新计算像素格大小并重新绘制
+            self.fit_to_screen()
             self.status_label.config(text="加载成功！")
         except Exception as e:
             messagebox.showerror("加载错误", str(e))
@@ -346,6 +967,9 @@ class PixelEditor:
                 filetypes=[("JSON", "*.json")]
             )
             if fp:
+                # 编辑像素数组只在保存时写回点阵数据
+                self.end_stroke()
+                self.data["pixels"] = self.pixels.ravel().tolist()
                 with open(fp, 'w') as f:
                     json.dump(self.data, f, indent=4)
                 messagebox.showinfo("保存成功", "已保存", parent=parent_window)
@@ -354,13 +978,25 @@ class PixelEditor:
 
     def undo(self):
         """
-        执行撤销操作：恢复到上一次的像素数据状态，并重新绘制像素
-        仅当撤销栈不为空时生效
+        执行撤销操作：恢复最近一次操作改变的像素，只重绘这些像素
+        仅当存在可撤销的操作时生效
         :return: 无返回值
         """
-        if self.undo_stack:
-            self.data["pixels"] = self.undo_stack.pop()
-            self.draw_pixels()
+        self.end_stroke()
+        change = self.history.undo()
+        if change is not None:
+            self.apply_values(*change)
+
+    def redo(self):
+        """
+        执行重做操作：重新应用最近一次撤销的操作，只重绘受影响的像素
+        仅当存在可重做的操作时生效
+        :return: 无返回值
+        """
+        self.end_stroke()
+        change = self.history.redo()
+        if change is not None:
+            self.apply_values(*change)
 
     def center_window(self, w, h):
         """
@@ -0,0 +1,233 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : font_atlas.py
+# @Description : 点阵字库导出与读取文件，将整个字符集光栅化为1位掩码打包成单个字库文件，供设备端和仿真器按码点查找渲染
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ws_converter.char_converter import get_default_font, get_char_mask
+from ws_converter.color import rgb888_to_rgb565
+from ws_converter.marquee import marquee_frames
+
+# ======================================== 全局变量 ============================================
+
+# 字库文件格式（小端序）：
+#   文件头：魔数"WSFA"(4字节) + 版本(u8) + 保留(u8) + 字形宽(u16) + 字形高(u16) + 每个字形字节数(u16) + 字形数(u32)
+#   码点索引：字形数 × u32，按码点升序排列，可二分查找
+#   字形数据：字形数 × 每个字形字节数，每行按位打包（高位在前），行字节数为ceil(宽/8)
+ATLAS_MAGIC = b"WSFA"
+ATLAS_VERSION = 1
+ATLAS_HEADER = struct.Struct("<4sBBHHHI")
+# 内置字符集
+CHARSETS = ("ascii", "gb2312")
+# 字符数少于该值时不启用多进程（进程启动开销大于光栅化本身）
+PARALLEL_MIN_CHARS = 512
+
+# ======================================== 功能函数 ============================================
+
+def build_charset(charset="ascii", chars=None):
+    """
+    生成待导出的字符列表（去重并按码点升序）
+    :param charset: 内置字符集名称："ascii"（0x20-0x7E可打印字符）或"gb2312"（GB2312一级汉字3755个）
+    :param chars: 自定义字符串（提供时忽略charset）
+    :return: 按码点升序排列的字符列表
+    """
+    if chars:
+        return sorted(set(chars) - {"\n", "\r"})
+    if charset == "ascii":
+        return [chr(c) for c in range(0x20, 0x7F)]
+    if charset == "gb2312":
+        # 一级汉字：区码0xB0-0xD7，位码0xA1-0xFE（0xD7FA-0xD7FE为空位）
+        result = []
+        for hi in range(0xB0, 0xD8):
+            for lo in range(0xA1, 0xFF):
+                try:
+                    result.append(bytes((hi, lo)).decode("gb2312"))
+                except UnicodeDecodeError:
+                    continue
+        return sorted(set(result))
+    raise ValueError(f"不支持的字符集: {charset}（支持 {', '.join(CHARSETS)}）")
+
+def rasterize_glyphs(chars, width, height, font_path, font_size):
+    """
+    光栅化一组字符并按行打包为1位数据（进程池工作函数，每个进程各自缓存字体）
+    :param chars: 字符列表
+    :param width: 字形宽度
+    :param height: 字形高度
+    :param font_path: 字体文件路径
+    :param font_size: 字号
+    :return: 形状为(字符数, 高, ceil(宽/8))的uint8数组
+    """
+    masks = np.stack([get_char_mask(font_path, font_size, ch, width, height) for ch in chars])
+    return np.packbits(masks, axis=-1)
+
+def export_font_atlas(output_path, width, height, charset="ascii", chars=None, font_size=None,
+                      font_path=None, workers=None):
+    """
+    将整个字符集按指定点阵尺寸光栅化，打包为单个1位点阵字库文件
+    :param output_path: 字库文件输出路径
+    :param width: 字形宽度（点阵列数）
+    :param height: 字形高度（点阵行数）
+    :param charset: 内置字符集名称（"ascii"或"gb2312"，默认"ascii"）
+    :param chars: 自定义字符串（提供时忽略charset）
+    :param font_size: 字号（默认高度-2，与char_to_matrix一致）
+    :param font_path: 字体文件路径（默认get_default_font）
+    :param workers: 光栅化进程数（默认CPU核数；字符较少时自动单进程）
+    :return: 统计信息字典：glyphs（字形数）、bytes（文件字节数）、elapsed（秒）、path（字库路径）
+    """
+    start = time.perf_counter()
+    glyph_chars = build_charset(charset, chars)
+    if not glyph_chars:
+        raise ValueError("字符集为空！")
+    font_path = font_path or get_default_font()
+    font_size = font_size or max(1, height - 2)
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(glyph_chars) < PARALLEL_MIN_CHARS:
+        glyphs = rasterize_glyphs(glyph_chars, width, height, font_path, font_size)
+    else:
+        # 按进程数均分为若干块，每块在一个进程内连续光栅化
+        chunk = -(-len(glyph_chars) // (workers * 4))
+        parts = [glyph_chars[i:i + chunk] for i in range(0, len(glyph_chars), chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            n = len(parts)
+            results = pool.map(rasterize_glyphs, parts, [width] * n, [height] * n, [font_path] * n, [font_size] * n)
+            glyphs = np.concatenate(list(results))
+
+    codepoints = np.array([ord(c) for c in glyph_chars], dtype="<u4")
+    glyph_bytes = glyphs.shape[1] * glyphs.shape[2]
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    with open(output_path, "wb") as f:
+        f.write(ATLAS_HEADER.pack(ATLAS_MAGIC, ATLAS_VERSION, 0, width, height, glyph_bytes, len(codepoints)))
+        f.write(codepoints.tobytes())
+        f.write(np.ascontiguousarray(glyphs).tobytes())
+    return {"glyphs": len(codepoints), "bytes": os.path.getsize(output_path),
+            "elapsed": time.perf_counter() - start, "path": output_path}
+
+# ======================================== 自定义类 ============================================
+
+class FontAtlas:
+    """
+    点阵字库读取类
+    核心功能：
+        1. 读取export_font_atlas导出的字库文件，码点索引与字形数据直接映射为NumPy数组
+        2. 按码点二分查找字形（O(log n)），解包为bool掩码
+        3. 将字符串拼接为文字掩码或RGB565帧，供仿真器直接播放
+    """
+    def __init__(self, path):
+        """
+        加载字库文件
+        :param path: 字库文件路径
+        :return: 无返回值
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, _, width, height, glyph_bytes, count = ATLAS_HEADER.unpack_from(data)
+        if magic != ATLAS_MAGIC:
+            raise ValueError(f"不是点阵字库文件: {path}")
+        if version != ATLAS_VERSION:
+            raise ValueError(f"不支持的字库版本: {version}")
+        self.width = width
+        self.height = height
+        offset = ATLAS_HEADER.size
+        self.codepoints = np.frombuffer(data, dtype="<u4", count=count, offset=offset)
+        offset += count * 4
+        row_bytes = glyph_bytes // height
+        self.glyphs = np.frombuffer(data, dtype=np.uint8, count=count * glyph_bytes,
+                                    offset=offset).reshape(count, height, row_bytes)
+
+    def __len__(self):
+        return len(self.codepoints)
+
+    def __contains__(self, char):
+        return self.find(char) >= 0
+
+    def find(self, char):
+        """
+        二分查找字符在字库中的序号
+        :param char: 单个字符
+        :return: 字形序号，不存在时返回-1
+        """
+        cp = ord(char)
+        i = int(np.searchsorted(self.codepoints, cp))
+        if i < len(self.codepoints) and self.codepoints[i] == cp:
+            return i
+        return -1
+
+    def get_mask(self, char):
+        """
+        获取字符的点阵掩码
+        :param char: 单个字符
+        :return: 形状为(高, 宽)的bool数组；字库中不存在的字符返回None
+        """
+        i = self.find(char)
+        if i < 0:
+            return None
+        return np.unpackbits(self.glyphs[i], axis=-1, count=self.width).astype(bool)
+
+    def render_text(self, text, spacing=1, proportional=True):
+        """
+        将字符串拼接为一张文字掩码
+        :param text: 文字内容（字库中不存在的字符按空白处理）
+        :param spacing: 字符间距（列数，默认1）
+        :param proportional: 是否按字形实际笔画宽度裁剪左右留白（默认True；False为等宽排列）
+        :return: 形状为(高, 总宽度)的bool数组
+        """
+        blank = np.zeros((self.height, max(1, self.width // 2)), dtype=bool)
+        gap = np.zeros((self.height, spacing), dtype=bool)
+        parts = []
+        for ch in text:
+            mask = self.get_mask(ch)
+            if mask is None:
+                mask = blank
+            elif proportional:
+                cols = np.flatnonzero(mask.any(axis=0))
+                mask = mask[:, cols[0]:cols[-1] + 1] if len(cols) else blank
+            parts.extend((mask, gap))
+        if not parts:
+            return np.zeros((self.height, 1), dtype=bool)
+        return np.concatenate(parts[:-1], axis=1)
+
+    def render_frames(self, text, width, height=None, scroll=False, speed=1, text_color=(255, 255, 255),
+                      bg_color=(0, 0, 0), spacing=1, proportional=True):
+        """
+        将字符串渲染为RGB565帧序列：不滚动时为单帧（文字水平居中，超出部分截断），滚动时为可循环的跑马灯帧
+        :param text: 文字内容
+        :param width: 点阵宽度
+        :param height: 点阵高度（默认字形高度，不足时裁剪、超出时垂直居中）
+        :param scroll: 是否生成滚动帧（默认False）
+        :param speed: 滚动时每帧移动的列数（默认1）
+        :param text_color: 文字RGB颜色（默认白色）
+        :param bg_color: 背景RGB颜色（默认黑色）
+        :param spacing: 字符间距（默认1）
+        :param proportional: 是否按笔画宽度紧凑排列（默认True）
+        :return: 形状为(帧数, 高, 宽)的uint16数组
+        """
+        height = height or self.height
+        mask = self.render_text(text, spacing, proportional)
+        # 垂直方向适配点阵高度
+        fitted = np.zeros((height, mask.shape[1]), dtype=bool)
+        top = max(0, (height - self.height) // 2)
+        rows = min(height, self.height)
+        fitted[top:top + rows] = mask[:rows]
+        if scroll:
+            masks = marquee_frames(fitted, width, speed)
+        else:
+            masks = np.zeros((1, height, width), dtype=bool)
+            text_w = min(width, fitted.shape[1])
+            left = (width - text_w) // 2
+            masks[0, :, left:left + text_w] = fitted[:, :text_w]
+        return np.where(masks, np.uint16(rgb888_to_rgb565(*text_color)), np.uint16(rgb888_to_rgb565(*bg_color)))
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,222 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : job_runner.py
+# @Description : 后台转换任务队列文件，转换任务在后台线程中排队执行，进度与结果通过事件队列交给界面线程轮询处理
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import itertools
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from ws_converter.converter import ConversionCancelled, ConversionFailed
+
+# ======================================== 全局变量 ============================================
+
+# 任务状态
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_CANCELLED = "cancelled"
+JOB_FAILED = "failed"
+
+# ======================================== 功能函数 ============================================
+
+def remove_outputs(paths):
+    """
+    删除取消或失败的任务已写出的部分输出文件（文件不存在时忽略）
+    :param paths: 输出文件路径列表
+    :return: 实际删除的文件数
+    """
+    removed = 0
+    for path in paths:
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+# ======================================== 自定义类 ============================================
+
+class ConversionJob:
+    """
+    单个后台转换任务
+    任务函数需接受progress(done, total)回调和cancel取消标志两个关键字参数（与convert_image_to_json等一致）
+    """
+    _ids = itertools.count(1)
+
+    def __init__(self, name, func, args=(), kwargs=None):
+        """
+        创建转换任务
+        :param name: 任务名称（界面显示用）
+        :param func: 任务函数
+        :param args: 任务函数的位置参数
+        :param kwargs: 任务函数的关键字参数
+        :return: 无返回值
+        """
+        self.id = next(self._ids)
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.cancel_event = threading.Event()
+        self.status = JOB_QUEUED
+        # 任务函数的返回值
+        self.result = None
+        # 失败时的异常
+        self.error = None
+        # 取消或失败时删除的部分输出文件数
+        self.removed = 0
+
+    def cancel(self):
+        """
+        请求取消任务：排队中的任务不再执行，运行中的任务在下一个帧/行边界停止
+        :return: 无返回值
+        """
+        self.cancel_event.set()
+
+class JobRunner:
+    """
+    后台转换任务队列
+    核心功能：
+        1. 任务提交到后台线程池排队执行（默认单线程，任务按提交顺序依次运行），界面线程不再被阻塞
+        2. 任务的开始、进度、完成、取消、失败都以事件形式放入线程安全队列，由界面线程定时调用poll取出处理
+        3. 任务被取消或中途失败时删除转换函数已写出的部分输出文件
+    事件为元组：("start", job)、("progress", job, done, total)、("done", job)、("cancelled", job)、("failed", job)
+    """
+    def __init__(self, max_workers=1):
+        """
+        初始化任务队列
+        :param max_workers: 同时运行的任务数（默认1，即排队依次执行）
+        :return: 无返回值
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="convert")
+        self.events = queue.Queue()
+        # 尚未结束的任务（排队中或运行中）
+        self.jobs = []
+        self._lock = threading.Lock()
+
+    def submit(self, name, func, *args, **kwargs):
+        """
+        提交转换任务
+        :param name: 任务名称
+        :param func: 任务函数（需接受progress和cancel关键字参数）
+        :param args: 任务函数的位置参数
+        :param kwargs: 任务函数的关键字参数
+        :return: ConversionJob对象
+        """
+        job = ConversionJob(name, func, args, kwargs)
+        with self._lock:
+            self.jobs.append(job)
+        self.executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        """
+        在后台线程中执行任务，并把状态变化放入事件队列
+        :param job: ConversionJob对象
+        :return: 无返回值
+        """
+        if job.cancel_event.is_set():
+            self._finish(job, JOB_CANCELLED)
+            return
+        job.status = JOB_RUNNING
+        self.events.put(("start", job))
+        try:
+            job.result = job.func(*job.args, progress=lambda done, total: self.events.put(("progress", job, done, total)),
+                                  cancel=job.cancel_event, **job.kwargs)
+        except ConversionCancelled as e:
+            job.removed = remove_outputs(e.outputs)
+            self._finish(job, JOB_CANCELLED)
+        except ConversionFailed as e:
+            job.error = e.error
+            job.removed = remove_outputs(e.outputs)
+            self._finish(job, JOB_FAILED)
+        except Exception as e:
+            job.error = e
+            self._finish(job, JOB_FAILED)
+        else:
+            self._finish(job, JOB_DONE)
+
+    def _finish(self, job, status):
+        """
+        标记任务结束并放入对应事件
+        :param job: ConversionJob对象
+        :param status: 结束状态
+        :return: 无返回值
+        """
+        job.status = status
+        with self._lock:
+            if job in self.jobs:
+                self.jobs.remove(job)
+        self.events.put((status, job))
+
+    def poll(self):
+        """
+        取出所有待处理事件（由界面线程定时调用）；同一任务连续的进度事件只保留最新一条
+        :return: 事件列表
+        """
+        events = []
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress" and events and events[-1][0] == "progress" and events[-1][1] is event[1]:
+                events[-1] = event
+            else:
+                events.append(event)
+        return events
+
+    def current(self):
+        """
+        获取正在运行的任务
+        :return: 运行中的ConversionJob对象，没有时返回None
+        """
+        with self._lock:
+            return next((job for job in self.jobs if job.status == JOB_RUNNING), None)
+
+    def pending(self):
+        """
+        获取尚未结束的任务数（排队中与运行中）
+        :return: 任务数
+        """
+        with self._lock:
+            return len(self.jobs)
+
+    def cancel_current(self):
+        """
+        取消正在运行的任务（排队中的任务继续执行）
+        :return: 被取消的任务，没有运行中的任务时返回None
+        """
+        job = self.current()
+        if job is not None:
+            job.cancel()
+        return job
+
+    def cancel_all(self):
+        """
+        取消所有排队中和运行中的任务
+        :return: 被取消的任务数
+        """
+        with self._lock:
+            jobs = list(self.jobs)
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def shutdown(self):
+        """
+        取消所有任务并关闭线程池（不等待运行中的任务结束，它会在下一个帧/行边界退出）
+        :return: 无返回值
+        """
+        self.cancel_all()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,148 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : marquee.py
+# @Description : 滚动文字（跑马灯）生成文件，整段文字只渲染一次，滚动帧通过对宽位图的窗口切片批量生成
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import glob
+import json
+import os
+import re
+import time
+import numpy as np
+from PIL import Image, ImageDraw
+from ws_converter.char_converter import get_default_font, get_font
+from ws_converter.color import rgb888_to_rgb565
+
+# ======================================== 全局变量 ============================================
+
+# 支持的滚动方向
+MARQUEE_DIRECTIONS = ("left", "right")
+# 滚动帧文件名的后缀格式（与视频帧一致），用于识别同一前缀的旧帧
+FRAME_SUFFIX = re.compile(r"_frame_\d+\.json")
+
+# ======================================== 功能函数 ============================================
+
+def render_text_mask(text, height, font_size=None, font_path=None):
+    """
+    将整段文字渲染为一张高度为点阵高度的宽位图掩码（垂直居中，关闭抗锯齿）
+    :param text: 文字内容
+    :param height: 点阵高度
+    :param font_size: 字号（默认高度-2，最小1）
+    :param font_path: 字体文件路径（默认get_default_font）
+    :return: 形状为(高, 文字宽度)的bool数组，True为文字像素
+    """
+    font_size = font_size or max(1, height - 2)
+    font = get_font(font_path or get_default_font(), font_size)
+    probe = ImageDraw.Draw(Image.new("L", (1, 1)))
+    bbox = probe.textbbox((0, 0), text, font=font)
+    text_w = max(1, bbox[2] - bbox[0])
+    text_h = bbox[3] - bbox[1]
+    img = Image.new("L", (text_w, height), 0)
+    # 与单字符一致：垂直居中，去掉左侧字形留白
+    y = max(0, (height - text_h) // 2)
+    ImageDraw.Draw(img).text((-bbox[0], y), text, fill=255, font=font, antialias=False)
+    return np.asarray(img) > 127
+
+def marquee_frames(mask, width, speed=1, direction="left", loop=True):
+    """
+    由文字宽位图生成滚动帧掩码：每帧是宽位图上的一个窗口切片，所有帧一次性批量取出
+        - loop=True：文字后接一屏宽的空白，生成恰好一个循环周期的帧，首尾相接可无缝循环播放
+        - loop=False：文字从一侧完全移入，再从另一侧完全移出
+    :param mask: 文字宽位图掩码，形状为(高, 文字宽度)
+    :param width: 点阵宽度
+    :param speed: 每帧移动的列数（默认1）
+    :param direction: 滚动方向，"left"向左、"right"向右（默认"left"）
+    :param loop: 是否生成可循环的帧序列（默认True）
+    :return: 形状为(帧数, 高, 宽)的bool数组
+    """
+    if direction not in MARQUEE_DIRECTIONS:
+        raise ValueError(f"不支持的滚动方向: {direction}（支持 {', '.join(MARQUEE_DIRECTIONS)}）")
+    speed = max(1, int(speed))
+    h, text_w = mask.shape
+    if loop:
+        # 周期长度补齐为speed的整数倍，保证最后一帧与第一帧衔接
+        period = text_w + width
+        period += (-period) % speed
+        strip = np.zeros((h, period), dtype=bool)
+        strip[:, :text_w] = mask
+        # 再接一段周期开头的内容，使窗口跨过周期末尾时取到循环后的内容
+        strip = np.concatenate((strip, strip[:, :width]), axis=1)
+        offsets = np.arange(0, period, speed)
+    else:
+        strip = np.zeros((h, text_w + 2 * width), dtype=bool)
+        strip[:, width:width + text_w] = mask
+        offsets = np.arange(0, text_w + width + 1, speed)
+    # 所有窗口在同一内存上的视图，再按偏移一次取出：形状(帧数, 高, 宽)
+    windows = np.lib.stride_tricks.sliding_window_view(strip, width, axis=1)
+    frames = windows[:, offsets].transpose(1, 0, 2)
+    if direction == "right":
+        frames = frames[::-1]
+    return np.ascontiguousarray(frames)
+
+def text_to_marquee(text, output_dir, width, height, speed=1, direction="left", loop=True,
+                    text_color=(255, 255, 255), bg_color=(0, 0, 0), font_size=None, fps=30,
+                    base_name="marquee", description=""):
+    """
+    将文字生成滚动字幕帧序列，按视频帧的命名规则输出JSON帧文件（可直接用仿真器通配符连播）
+    同一前缀下本次没有重新生成的旧帧文件会被删除，避免帧数变少后被通配符匹配到
+    :param text: 文字内容
+    :param output_dir: JSON文件的输出目录
+    :param width: 点阵宽度
+    :param height: 点阵高度
+    :param speed: 每帧移动的列数（默认1）
+    :param direction: 滚动方向，"left"或"right"（默认"left"）
+    :param loop: 是否生成可无缝循环的帧序列（默认True）
+    :param text_color: 文字RGB颜色（默认白色）
+    :param bg_color: 背景RGB颜色（默认黑色）
+    :param font_size: 字号（默认高度-2）
+    :param fps: 播放帧率，用于计算每帧的timestamp（默认30）
+    :param base_name: 输出文件名前缀（默认"marquee"）
+    :param description: 点阵的描述信息（默认空字符串）
+    :return: 统计信息字典：paths（生成的JSON文件路径列表）、frames（帧数）、removed（删除的旧帧数）、elapsed（秒）
+    """
+    if not text:
+        raise ValueError("文字内容不能为空！")
+    start = time.perf_counter()
+    mask = render_text_mask(text, height, font_size)
+    masks = marquee_frames(mask, width, speed, direction, loop)
+    # 掩码到RGB565：整个帧序列一次完成
+    frames = np.where(masks, np.uint16(rgb888_to_rgb565(*text_color)), np.uint16(rgb888_to_rgb565(*bg_color)))
+
+    os.makedirs(output_dir, exist_ok=True)
+    prefix = os.path.join(output_dir, base_name)
+    existing = [p for p in glob.glob(glob.escape(prefix) + "_frame_*.json")
+                if FRAME_SUFFIX.fullmatch(p[len(prefix):])]
+    description = description or f"Marquee '{text}' ({width}x{height})"
+    paths = []
+    for i, frame in enumerate(frames):
+        json_data = {
+            "pixels": frame.ravel().tolist(),
+            "width": width,
+            "height": height,
+            "frame_index": i,
+            "timestamp": round(i / fps, 2),
+            "description": description,
+            "version": 1.0
+        }
+        path = os.path.join(output_dir, f"{base_name}_frame_{i:04d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(json_data, f, indent=2)
+        paths.append(path)
+    # 全部新帧写出后再删除旧帧，写入失败时保留原有帧序列
+    written = set(paths)
+    removed = 0
+    for path in existing:
+        if path not in written:
+            os.remove(path)
+            removed += 1
+    return {"paths": paths, "frames": len(paths), "removed": removed, "elapsed": time.perf_counter() - start}
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -0,0 +1,272 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : pipeline.py
+# @Description : 批量转换任务清单文件，读取JSON/TOML任务清单，在进程池中并发执行转换，跳过输入与参数未变化的任务并生成汇总报告
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from ws_converter.converter import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS
+
+# ======================================== 全局变量 ============================================
+
+# 任务支持的输出格式："json"为点阵帧数据（始终生成），其余为renderer离线渲染的预览
+JOB_FORMATS = ("json", "png", "gif", "mp4")
+# 任务参数的默认值（可被清单的defaults表和单个任务覆盖）
+JOB_DEFAULTS = {
+    "output": "output",
+    "frames": 30,
+    "description": "",
+    "brightness": 1.0,
+    "contrast": 1.0,
+    "saturation": 1.0,
+    "formats": ["json"],
+    "fps": 30,
+    "grid": True,
+}
+# 单个任务允许的字段
+JOB_KEYS = {"name", "input", "width", "height"} | set(JOB_DEFAULTS)
+# 影响输出内容的参数（参与变更判断的哈希计算）
+HASH_KEYS = ("width", "height", "frames", "description", "brightness", "contrast", "saturation", "formats",
+             "fps", "grid")
+# 任务状态文件（与清单同目录，记录每个任务上次成功时的哈希与输出文件）
+STATE_SUFFIX = ".state.json"
+# 计算输入文件哈希时每次读取的字节数
+HASH_CHUNK_SIZE = 1 << 20
+# 任务状态
+JOB_DONE = "done"
+JOB_SKIPPED = "skipped"
+JOB_FAILED = "failed"
+STATUS_TEXT = {JOB_DONE: "完成", JOB_SKIPPED: "跳过", JOB_FAILED: "失败"}
+
+# ======================================== 功能函数 ============================================
+
+def load_manifest(path):
+    """
+    读取任务清单（按扩展名解析JSON或TOML），合并默认参数并校验每个任务
+    清单结构：
+        concurrency：并发任务数（可选）
+        defaults：所有任务共用的默认参数（可选）
+        jobs：任务列表，每个任务至少包含input、width、height
+    任务中的相对路径均相对于清单文件所在目录
+    :param path: 清单文件路径（.json或.toml）
+    :return: (任务字典列表, 清单中的并发数或None)
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".toml":
+        import tomllib
+
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    elif ext == ".json":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        raise ValueError(f"不支持的清单格式: {ext}（支持 .json / .toml）")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    defaults = dict(JOB_DEFAULTS, **data.get("defaults", {}))
+    jobs = []
+    names = set()
+    # 输出基础路径（输出目录+输入文件名）→任务名，同一路径的输出文件会互相覆盖
+    bases = {}
+    for i, spec in enumerate(data.get("jobs", [])):
+        job = dict(defaults, **spec)
+        unknown = set(job) - JOB_KEYS
+        if unknown:
+            raise ValueError(f"任务 {i + 1} 含未知字段: {', '.join(sorted(unknown))}")
+        for key in ("input", "width", "height"):
+            if key not in job:
+                raise ValueError(f"任务 {i + 1} 缺少字段: {key}")
+        job["input"] = os.path.join(base_dir, job["input"])
+        job["output"] = os.path.join(base_dir, job["output"])
+        job["name"] = job.get("name") or os.path.splitext(os.path.basename(job["input"]))[0]
+        if job["name"] in names:
+            raise ValueError(f"任务名称重复: {job['name']}（请为同名输入指定不同的name）")
+        names.add(job["name"])
+        ext = os.path.splitext(job["input"])[1].lower()
+        if ext not in IMAGE_EXTENSIONS + VIDEO_EXTENSIONS:
+            raise ValueError(f"任务 {job['name']} 的输入类型不支持: {ext}")
+        base = os.path.join(os.path.normcase(os.path.abspath(job["output"])),
+                            os.path.splitext(os.path.basename(job["input"]))[0])
+        if base in bases:
+            raise ValueError(f"任务 {bases[base]} 与 {job['name']} 的输出文件相同（{base}.*），请指定不同的output目录")
+        bases[base] = job["name"]
+        formats = job["formats"]
+        # 单个格式可直接写成字符串
+        if isinstance(formats, str):
+            formats = [formats]
+        if not isinstance(formats, list):
+            raise ValueError(f"任务 {job['name']} 的formats应为字符串或字符串列表，实际为 {type(formats).__name__}")
+        job["formats"] = list(dict.fromkeys(["json"] + formats))
+        bad = [fmt for fmt in job["formats"] if fmt not in JOB_FORMATS]
+        if bad:
+            raise ValueError(f"任务 {job['name']} 的输出格式不支持: {', '.join(bad)}（支持 {', '.join(JOB_FORMATS)}）")
+        jobs.append(job)
+    if not jobs:
+        raise ValueError("清单中没有任务！")
+    return jobs, data.get("concurrency")
+
+def file_digest(path):
+    """
+    分块计算文件内容的SHA-256（大视频文件不整体读入内存）
+    :param path: 文件路径
+    :return: 十六进制哈希字符串
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def job_hash(job):
+    """
+    计算任务的变更哈希：输入文件内容 + 影响输出的参数 + 输出目录
+    :param job: 任务字典
+    :return: 十六进制哈希字符串
+    """
+    params = {key: job[key] for key in HASH_KEYS}
+    params["output"] = os.path.abspath(job["output"])
+    text = file_digest(job["input"]) + json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def run_job(job, previous=None, force=False):
+    """
+    执行单个任务（进程池工作函数）：输入与参数未变化且上次的输出仍在时跳过，否则转换并按需渲染预览
+    异常不向外抛出，记录在结果中，避免一个任务失败影响其他任务
+    :param job: 任务字典
+    :param previous: 该任务上次成功时的状态{"hash", "outputs"}（没有时为None）
+    :param force: 是否忽略上次状态强制重新转换
+    :return: 结果字典：name、input、status、seconds、outputs、hash、error
+    """
+    from ws_converter.converter import convert_image_to_json, convert_video_to_json, ConversionFailed
+    from ws_converter.job_runner import remove_outputs
+
+    start = time.perf_counter()
+    result = {"name": job["name"], "input": job["input"], "status": JOB_DONE, "outputs": [], "hash": None,
+              "error": None}
+    try:
+        result["hash"] = digest = job_hash(job)
+        if (not force and previous and previous.get("hash") == digest
+                and all(os.path.exists(p) for p in previous.get("outputs", []))):
+            result.update(status=JOB_SKIPPED, outputs=previous["outputs"])
+        else:
+            adjustments = {key: job[key] for key in ("brightness", "contrast", "saturation")}
+            # 进度回调置空：并发任务不各自打印进度条
+            quiet = lambda done, total: None
+            base = os.path.splitext(os.path.basename(job["input"]))[0]
+            if os.path.splitext(job["input"])[1].lower() in IMAGE_EXTENSIONS:
+                outputs = convert_image_to_json(job["input"], job["output"], job["width"], job["height"],
+                                                job["description"], progress=quiet, **adjustments)
+                pattern = outputs[0]
+            else:
+                outputs = convert_video_to_json(job["input"], job["output"], job["width"], job["height"],
+                                                job["frames"], job["description"], progress=quiet, **adjustments)
+                pattern = os.path.join(job["output"], f"{base}_frame_*.json")
+            # 删除上次生成、本次不再生成的文件（如帧数减少后多出的帧），避免被预览渲染的通配符匹配
+            if previous:
+                remove_outputs([p for p in previous.get("outputs", []) if p not in outputs])
+            if outputs:
+                from ws_converter.renderer import render_frames
+
+                for fmt in job["formats"][1:]:
+                    preview = os.path.join(job["output"], f"{base}_preview.{fmt}")
+                    outputs += render_frames(pattern, preview, job["width"], job["height"], fps=job["fps"],
+                                             grid=job["grid"])
+            result["outputs"] = outputs
+    except ConversionFailed as e:
+        # 删除转换中途写出的部分文件，下次执行时重新转换
+        remove_outputs(e.outputs)
+        result.update(status=JOB_FAILED, error=f"{type(e.error).__name__}: {e.error}")
+    except Exception as e:
+        result.update(status=JOB_FAILED, error=f"{type(e).__name__}: {e}")
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+def run_manifest(manifest_path, concurrency=None, force=False, report_path=None):
+    """
+    执行任务清单：所有任务提交到进程池并发执行，完成一个打印一个，最后输出汇总报告
+    成功的任务状态写入清单旁的状态文件，下次执行时输入与参数未变化的任务直接跳过
+    :param manifest_path: 清单文件路径（.json或.toml）
+    :param concurrency: 并发任务数（默认取清单的concurrency，再默认CPU核数）
+    :param force: 是否忽略状态文件全部重新转换（默认False）
+    :param report_path: 汇总报告JSON的输出路径（默认None，不写文件）
+    :return: 汇总报告字典
+    """
+    start = time.perf_counter()
+    jobs, manifest_concurrency = load_manifest(manifest_path)
+    concurrency = max(1, concurrency or manifest_concurrency or os.cpu_count() or 1)
+    state_path = os.path.splitext(manifest_path)[0] + STATE_SUFFIX
+    state = {}
+    if os.path.exists(state_path):
+        with open(state_path, encoding="utf-8") as f:
+            state = json.load(f)
+
+    print(f"共 {len(jobs)} 个任务，并发数 {min(concurrency, len(jobs))}")
+    results = []
+
+    def collect(result):
+        results.append(result)
+        line = f"[{len(results)}/{len(jobs)}] {result['name']}：{STATUS_TEXT[result['status']]}，{result['seconds']:.2f} 秒"
+        if result["error"]:
+            line += f"，{result['error']}"
+        print(line)
+
+    if concurrency == 1 or len(jobs) == 1:
+        for job in jobs:
+            collect(run_job(job, state.get(job["name"]), force))
+    else:
+        with ProcessPoolExecutor(max_workers=min(concurrency, len(jobs))) as pool:
+            futures = {pool.submit(run_job, job, state.get(job["name"]), force): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    collect(future.result())
+                except Exception as e:
+                    # 工作进程异常退出等无法在任务内部捕获的错误
+                    collect({"name": job["name"], "input": job["input"], "status": JOB_FAILED, "outputs": [],
+                             "hash": None, "error": f"{type(e).__name__}: {e}", "seconds": 0.0})
+
+    # 只记录成功的任务，失败的任务保留上次的状态
+    for result in results:
+        if result["status"] != JOB_FAILED:
+            state[result["name"]] = {"hash": result["hash"], "outputs": result["outputs"]}
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+
+    # 报告按清单中的任务顺序排列
+    order = {job["name"]: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda r: order[r["name"]])
+    counts = {status: sum(r["status"] == status for r in results) for status in STATUS_TEXT}
+    report = {
+        "manifest": os.path.abspath(manifest_path),
+        "concurrency": concurrency,
+        "elapsed": round(time.perf_counter() - start, 3),
+        "total": len(results),
+        "done": counts[JOB_DONE],
+        "skipped": counts[JOB_SKIPPED],
+        "failed": counts[JOB_FAILED],
+        "jobs": [{key: r[key] for key in ("name", "input", "status", "seconds", "outputs", "error")}
+                 for r in results],
+    }
+    print(f"汇总：完成 {report['done']} 个，跳过 {report['skipped']} 个（未变化），失败 {report['failed']} 个，"
+          f"总耗时 {report['elapsed']:.2f} 秒")
+    for r in results:
+        if r["status"] == JOB_FAILED:
+            print(f"  ✗ {r['name']}（{r['input']}）：{r['error']}")
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return report
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
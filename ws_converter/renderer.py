@@ -0,0 +1,200 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : renderer.py
+# @Description : WS2812矩阵离线渲染文件，无需打开窗口即可将帧数据渲染为PNG拼图、GIF动图或MP4视频
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import glob
+import json
+import os
+import natsort
+import numpy as np
+from PIL import Image, GifImagePlugin
+from ws_converter.color import rgb565_array_to_rgb888, GRID_COLOR
+
+# ======================================== 全局变量 ============================================
+
+# 支持的输出格式（按输出文件扩展名判断）
+RENDER_FORMATS = {".png": "sheet", ".gif": "gif", ".mp4": "mp4"}
+
+# ======================================== 功能函数 ============================================
+
+def iter_frames(json_pattern, width=None, height=None):
+    """
+    按自然排序逐个读取JSON帧文件并生成RGB565帧数组（流式读取，内存不随帧数增长）
+    :param json_pattern: JSON帧文件的匹配模式（支持通配符，如"frames/*.json"）
+    :param width: 矩阵宽度（None时读取首帧的width字段）
+    :param height: 矩阵高度（None时读取首帧的height字段）
+    :return: 生成器，逐帧产出形状为(高, 宽)的uint16数组
+    """
+    files = natsort.natsorted(glob.glob(json_pattern))
+    if not files:
+        raise FileNotFoundError(f"未找到匹配的帧文件: {json_pattern}")
+
+    for path in files:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if width is None or height is None:
+            width, height = data["width"], data["height"]
+        # 与仿真器一致：像素数不足以黑色补齐，超出部分截断
+        frame = np.zeros(width * height, dtype=np.uint16)
+        pixels = np.asarray(data["pixels"][:frame.size], dtype=np.uint16)
+        frame[:len(pixels)] = pixels
+        yield frame.reshape(height, width)
+
+def render_frame(frame, pixel_size, grid=True):
+    """
+    按仿真器的外观（像素块+深灰边框）将一帧RGB565数据渲染为RGB888图像数组
+    :param frame: 形状为(高, 宽)的uint16 RGB565帧数组
+    :param pixel_size: 单个LED的显示尺寸（像素）
+    :param grid: 是否绘制像素边框（像素尺寸小于3时边框会盖住颜色，自动忽略）
+    :return: 形状为(高*pixel_size, 宽*pixel_size, 3)的uint8数组
+    """
+    rgb = rgb565_array_to_rgb888(frame)
+    img = np.repeat(np.repeat(rgb, pixel_size, axis=0), pixel_size, axis=1)
+    if grid and pixel_size >= 3:
+        # 与pygame.draw.rect(..., 1)一致：每个像素块的四条边各1像素
+        for offset in (0, pixel_size - 1):
+            img[offset::pixel_size, :] = GRID_COLOR
+            img[:, offset::pixel_size] = GRID_COLOR
+    return img
+
+def write_contact_sheets(frames, output_path, columns=8, sheet_frames=64, spacing=4):
+    """
+    将帧序列拼接为PNG拼图，每张拼图最多包含sheet_frames帧，写满即保存
+    :param frames: 渲染后RGB888图像数组的可迭代对象
+    :param output_path: 输出路径（多张拼图时自动追加_001、_002等编号）
+    :param columns: 每行拼接的帧数
+    :param sheet_frames: 每张拼图的最大帧数
+    :param spacing: 帧之间的间距（像素）
+    :return: 生成的PNG文件路径列表
+    """
+    base, ext = os.path.splitext(output_path)
+    paths = []
+    batch = []
+
+    def flush():
+        rows = (len(batch) + columns - 1) // columns
+        cols = min(columns, len(batch))
+        fh, fw, _ = batch[0].shape
+        sheet = np.zeros((rows * fh + (rows + 1) * spacing, cols * fw + (cols + 1) * spacing, 3), dtype=np.uint8)
+        for i, img in enumerate(batch):
+            r, c = divmod(i, columns)
+            y = spacing + r * (fh + spacing)
+            x = spacing + c * (fw + spacing)
+            sheet[y:y + fh, x:x + fw] = img
+        path = f"{base}_{len(paths) + 1:03d}{ext}"
+        Image.fromarray(sheet).save(path)
+        paths.append(path)
+        batch.clear()
+
+    for img in frames:
+        batch.append(img)
+        if len(batch) == sheet_frames:
+            flush()
+    if batch:
+        flush()
+
+    # 仅一张拼图时使用原始文件名
+    if len(paths) == 1:
+        os.replace(paths[0], output_path)
+        paths = [output_path]
+    return paths
+
+def write_gif(frames, output_path, fps=30, loop=0):
+    """
+    将帧序列流式编码为GIF动图（逐帧量化并使用局部调色板写入，不在内存中保留历史帧）
+    :param frames: 渲染后RGB888图像数组的可迭代对象
+    :param output_path: GIF输出路径
+    :param fps: 播放帧率
+    :param loop: 循环次数（0表示无限循环）
+    :return: 写入的帧数
+    """
+    duration = int(round(1000 / fps))
+    count = 0
+    with open(output_path, "wb") as fp:
+        for img in frames:
+            frame = Image.fromarray(img).quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+            if count == 0:
+                header, _ = GifImagePlugin.getheader(frame, info={"loop": loop, "duration": duration})
+                for block in header:
+                    fp.write(block)
+            for block in GifImagePlugin.getdata(frame, duration=duration, include_color_table=True):
+                fp.write(block)
+            count += 1
+        # GIF文件结束标记
+        fp.write(b";")
+    return count
+
+def write_mp4(frames, output_path, fps=30):
+    """
+    使用OpenCV VideoWriter将帧序列流式编码为MP4视频
+    :param frames: 渲染后RGB888图像数组的可迭代对象
+    :param output_path: MP4输出路径
+    :param fps: 视频帧率
+    :return: 写入的帧数
+    """
+    import cv2
+
+    writer = None
+    count = 0
+    try:
+        for img in frames:
+            if writer is None:
+                h, w, _ = img.shape
+                writer = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (w, h))
+                if not writer.isOpened():
+                    raise RuntimeError(f"无法创建视频文件: {output_path}")
+            writer.write(cv2.cvtColor(img, cv2.COLOR_RGB2BGR))
+            count += 1
+    finally:
+        if writer is not None:
+            writer.release()
+    return count
+
+def render_frames(json_pattern, output_path, width=None, height=None, window_width=1000,
+                  fps=30, grid=True, columns=8):
+    """
+    无窗口离线渲染帧数据，按输出文件扩展名选择PNG拼图、GIF或MP4格式
+    :param json_pattern: JSON帧文件的匹配模式（支持通配符，如"frames/*.json"）
+    :param output_path: 输出文件路径（.png/.gif/.mp4）
+    :param width: 矩阵宽度（None时读取首帧）
+    :param height: 矩阵高度（None时读取首帧）
+    :param window_width: 画面宽度（像素，与仿真器一致，用于计算单个LED尺寸，默认1000）
+    :param fps: GIF/MP4的播放帧率（默认30帧/秒）
+    :param grid: 是否绘制像素边框（默认True）
+    :param columns: PNG拼图每行帧数（默认8）
+    :return: 生成的文件路径列表
+    """
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext not in RENDER_FORMATS:
+        raise ValueError(f"不支持的输出格式: {ext}（支持 {', '.join(RENDER_FORMATS)}）")
+    out_dir = os.path.dirname(output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    def rendered():
+        pixel_size = None
+        for frame in iter_frames(json_pattern, width, height):
+            # 与仿真器相同的像素尺寸计算方式
+            if pixel_size is None:
+                pixel_size = max(1, window_width // frame.shape[1])
+            yield render_frame(frame, pixel_size, grid)
+
+    fmt = RENDER_FORMATS[ext]
+    if fmt == "sheet":
+        return write_contact_sheets(rendered(), output_path, columns)
+    if fmt == "gif":
+        write_gif(rendered(), output_path, fps)
+    else:
+        write_mp4(rendered(), output_path, fps)
+    return [output_path]
+
+# ======================================== 自定义类 ============================================
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
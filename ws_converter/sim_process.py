@@ -0,0 +1,350 @@
+# Python env   : Python v3.12.0
+# -*- coding: utf-8 -*-
+# @Time    : 2026/10/19
+# @File    : sim_process.py
+# @Description : WS2812仿真器独立进程运行文件，通过共享内存传递帧数据、通过队列传递控制命令和播放状态
+# @License : MIT
+
+# ======================================== 导入相关模块 =========================================
+
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from ws_converter.simulator import WS2812Simulator, load_frame_files, scan_frame_files
+
+# ======================================== 全局变量 ============================================
+
+# 播放状态上报的最小间隔（秒），状态变化时立即上报
+STATE_REPORT_INTERVAL = 0.2
+
+# ======================================== 功能函数 ============================================
+
+def simulator_process_main(cmd_queue, state_queue, width, height, window_width, fps, clock_mode, watch,
+                           background_fps=None):
+    """
+    仿真器子进程入口：创建仿真器并运行主循环，退出时上报最终状态
+    :param cmd_queue: 控制命令队列（主进程→子进程）
+    :param state_queue: 播放状态队列（子进程→主进程）
+    :param width: 矩阵宽度
+    :param height: 矩阵高度
+    :param window_width: 仿真窗口的初始宽度（像素）
+    :param fps: 帧播放的帧率
+    :param clock_mode: 播放时钟模式（"fixed"或"timestamp"）
+    :param watch: 是否启用监视模式
+    :param background_fps: 窗口失焦或最小化时的降频帧率（None表示不降频）
+    :return: 无返回值
+    """
+    sim = ProcessSimulator(cmd_queue, state_queue, width, height, window_width, fps, clock_mode, watch,
+                           background_fps=background_fps)
+    try:
+        sim.run()
+    finally:
+        sim.report_state(force=True, running=False)
+        sim.release_shared_frames()
+
+# ======================================== 自定义类 ============================================
+
+class ProcessSimulator(WS2812Simulator):
+    """
+    运行在子进程中的仿真器：帧数据直接映射主进程创建的共享内存，
+    每次主循环迭代处理命令队列中的控制命令，并将播放状态写回状态队列
+    支持的命令（元组形式）：
+        ("load", 共享内存名, 帧数组形状, 时间戳列表, 时长列表, 帧文件匹配模式, 帧文件列表, 帧文件索引)
+        ("play",)、("pause",)、("toggle",)、("seek", 帧索引)、("step", 偏移帧数)、("stop",)
+    """
+    def __init__(self, cmd_queue, state_queue, *args, **kwargs):
+        """
+        初始化子进程仿真器
+        :param cmd_queue: 控制命令队列
+        :param state_queue: 播放状态队列
+        :param args: 传递给WS2812Simulator的位置参数
+        :param kwargs: 传递给WS2812Simulator的关键字参数
+        :return: 无返回值
+        """
+        super().__init__(*args, **kwargs)
+        self.cmd_queue = cmd_queue
+        self.state_queue = state_queue
+        # 当前映射的共享内存块
+        self._shm = None
+        self._last_state = None
+        self._next_report = 0.0
+
+    def attach_shared_frames(self, name, shape, timestamps, durations, json_pattern, frame_files, file_index):
+        """
+        映射主进程创建的共享内存作为帧数组（不复制数据），并释放上一次映射的共享内存
+        :param name: 共享内存名称
+        :param shape: 帧数组形状(帧数, 高, 宽)
+        :param timestamps: 每帧timestamp字段列表
+        :param durations: 每帧duration字段列表
+        :param json_pattern: 帧文件匹配模式（监视模式使用）
+        :param frame_files: 主进程读取的帧文件列表（与帧数组一一对应）
+        :param file_index: 主进程读取前扫描的{路径: (修改时间ns, 文件大小)}索引
+        :return: 无返回值
+        """
+        old = self._shm
+        self.clear_frames()
+        shm = shared_memory.SharedMemory(name=name)
+        self.frames = np.ndarray(shape, dtype=np.uint16, buffer=shm.buf)
+        self._shm = shm
+        self.json_pattern = json_pattern
+        self._frame_meta = list(zip(timestamps, durations))
+        # 直接使用主进程读取时的文件索引：子进程重新扫描可能与已读取的帧不一致，也会重复一次目录扫描
+        self.frame_files = list(frame_files)
+        self._file_index = dict(file_index)
+        self.update_timeline()
+        if old is not None:
+            self._close_shm(old)
+
+    def release_shared_frames(self):
+        """
+        解除对共享内存的映射（共享内存由主进程负责销毁）
+        :return: 无返回值
+        """
+        self.frames = np.zeros((0, self.height, self.width), dtype=np.uint16)
+        if self._shm is not None:
+            self._close_shm(self._shm)
+            self._shm = None
+
+    @staticmethod
+    def _close_shm(shm):
+        """
+        关闭共享内存句柄，仍有数组引用时忽略（进程退出时由系统回收映射）
+        :param shm: SharedMemory对象
+        :return: 无返回值
+        """
+        try:
+            shm.close()
+        except BufferError:
+            pass
+
+    def process_commands(self):
+        """
+        处理命令队列中所有待执行的命令，并按需上报播放状态
+        :return: 无返回值
+        """
+        while True:
+            try:
+                cmd = self.cmd_queue.get_nowait()
+            except queue.Empty:
+                break
+            name, args = cmd[0], cmd[1:]
+            if name == "load":
+                self.attach_shared_frames(*args)
+            elif name == "play":
+                self.playing = True
+            elif name == "pause":
+                self.playing = False
+            elif name == "toggle":
+                self.playing = not self.playing
+            elif name == "seek":
+                self.current_frame = min(max(int(args[0]), 0), max(self.frame_count - 1, 0))
+            elif name == "step":
+                self.current_frame = min(max(self.current_frame + int(args[0]), 0), max(self.frame_count - 1, 0))
+                self.playing = False
+            elif name == "stop":
+                self.stop_event.set()
+        self.report_state()
+
+    def report_state(self, force=False, running=True):
+        """
+        将播放状态写入状态队列：状态变化时立即上报，否则按固定间隔上报统计信息
+        :param force: 是否强制上报
+        :param running: 子进程是否仍在运行
+        :return: 无返回值
+        """
+        state = (self.current_frame, self.frame_count, self.playing, running,
+                 self._shm.name if self._shm is not None else None)
+        now = time.perf_counter()
+        if not force and state == self._last_state and now < self._next_report:
+            return
+        self._last_state = state
+        self._next_report = now + STATE_REPORT_INTERVAL
+        info = {
+            "frame": self.current_frame,
+            "frame_count": self.frame_count,
+            "playing": self.playing,
+            "running": running,
+            "shm": state[4],
+        }
+        info.update(self.get_playback_stats())
+        self.state_queue.put(info)
+
+class SimulatorProcess:
+    """
+    仿真器独立进程的主进程端控制器
+    核心功能：
+        1. 以spawn方式启动仿真器子进程，Pygame与调用方（如Tk界面）不再竞争GIL
+        2. 在主进程读取帧数据并写入共享内存，子进程直接映射使用
+        3. 通过命令队列发送播放/暂停/跳帧/加载/停止命令，通过状态队列接收播放状态
+    """
+    def __init__(self, width, height, window_width=1000, fps=30, clock_mode="fixed", watch=False,
+                 background_fps=None):
+        """
+        启动仿真器子进程
+        :param width: 矩阵宽度
+        :param height: 矩阵高度
+        :param window_width: 仿真窗口的初始宽度（像素，默认1000）
+        :param fps: 帧播放的帧率（默认30帧/秒）
+        :param clock_mode: 播放时钟模式（"fixed"或"timestamp"，默认"fixed"）
+        :param watch: 是否启用监视模式（默认False）
+        :param background_fps: 窗口失焦或最小化时的降频帧率（默认None，不降频）
+        :return: 无返回值
+        """
+        self.width = width
+        self.height = height
+        ctx = multiprocessing.get_context("spawn")
+        self.commands = ctx.Queue()
+        self.states = ctx.Queue()
+        self.process = ctx.Process(
+            target=simulator_process_main,
+            args=(self.commands, self.states, width, height, window_width, fps, clock_mode, watch, background_fps),
+            daemon=True,
+        )
+        self.process.start()
+        # 最近一次收到的播放状态
+        self.state = {"frame": 0, "frame_count": 0, "playing": False, "running": True, "shm": None}
+        # 已创建、尚未销毁的共享内存块
+        self._shms = []
+
+    def send(self, *cmd):
+        """
+        向子进程发送控制命令（子进程已退出时忽略）
+        :param cmd: 命令名及参数
+        :return: 无返回值
+        """
+        if self.process.is_alive():
+            self.commands.put(cmd)
+
+    def read_frames(self, json_pattern):
+        """
+        读取帧数据直接写入新建的共享内存（只读取文件、不与子进程通信，可在后台线程执行）
+        先扫描帧文件建立索引再读取，读取期间被修改的文件会在监视模式下被重新加载
+        :param json_pattern: JSON帧文件的匹配模式（支持通配符）
+        :return: 帧数据字典（传给attach_frames或discard_frames）
+        """
+        frame_files, file_index = scan_frame_files(json_pattern)
+        shape = (len(frame_files), self.height, self.width)
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 2, 1))
+        try:
+            _, timestamps, durations = load_frame_files(frame_files, self.width, self.height,
+                                                        out=np.ndarray(shape, dtype=np.uint16, buffer=shm.buf))
+        except BaseException:
+            self._unlink(shm)
+            raise
+        return {"shm": shm, "shape": shape, "timestamps": timestamps, "durations": durations,
+                "json_pattern": json_pattern, "frame_files": frame_files, "file_index": file_index}
+
+    def attach_frames(self, loaded):
+        """
+        通知子进程切换到read_frames读取的帧数据（在调用方线程中执行，与poll_state等方法同一线程）
+        :param loaded: read_frames返回的帧数据字典
+        :return: 加载的帧数
+        """
+        self._shms.append(loaded["shm"])
+        self.send("load", loaded["shm"].name, loaded["shape"], loaded["timestamps"], loaded["durations"],
+                  loaded["json_pattern"], loaded["frame_files"], loaded["file_index"])
+        return loaded["shape"][0]
+
+    def discard_frames(self, loaded):
+        """
+        销毁不再使用的帧数据（如读取完成前仿真器已被关闭或替换）
+        :param loaded: read_frames返回的帧数据字典
+        :return: 无返回值
+        """
+        self._unlink(loaded["shm"])
+
+    def load_frames(self, json_pattern):
+        """
+        读取帧数据写入新的共享内存，并通知子进程切换到新帧数据（同步执行，界面程序应分开调用read_frames与attach_frames）
+        :param json_pattern: JSON帧文件的匹配模式（支持通配符）
+        :return: 加载的帧数
+        """
+        return self.attach_frames(self.read_frames(json_pattern))
+
+    def play(self):
+        """开始播放"""
+        self.send("play")
+
+    def pause(self):
+        """暂停播放"""
+        self.send("pause")
+
+    def toggle(self):
+        """切换播放/暂停"""
+        self.send("toggle")
+
+    def seek(self, index):
+        """
+        跳转到指定帧
+        :param index: 帧索引（从0开始）
+        :return: 无返回值
+        """
+        self.send("seek", index)
+
+    def step(self, delta):
+        """
+        相对当前帧前进/后退并暂停
+        :param delta: 偏移帧数（正数前进，负数后退）
+        :return: 无返回值
+        """
+        self.send("step", delta)
+
+    def poll_state(self):
+        """
+        读取子进程上报的所有状态，返回最新状态；子进程已切换到新共享内存后销毁旧的共享内存
+        :return: 最新播放状态字典
+        """
+        while True:
+            try:
+                self.state = self.states.get_nowait()
+            except queue.Empty:
+                break
+        current = self.state.get("shm")
+        if current is not None:
+            # 子进程已映射新块，之前的块不再使用
+            while len(self._shms) > 1 and self._shms[0].name != current:
+                self._unlink(self._shms.pop(0))
+        if not self.process.is_alive():
+            self.state["running"] = False
+        return self.state
+
+    def is_alive(self):
+        """
+        子进程是否仍在运行
+        :return: 布尔值
+        """
+        return self.process.is_alive()
+
+    def stop(self, timeout=1.0):
+        """
+        通知子进程退出并等待，超时则强制终止，最后销毁所有共享内存
+        :param timeout: 等待子进程退出的超时时间（秒）
+        :return: 无返回值
+        """
+        self.send("stop")
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        for shm in self._shms:
+            self._unlink(shm)
+        self._shms = []
+
+    @staticmethod
+    def _unlink(shm):
+        """
+        关闭并销毁共享内存块
+        :param shm: SharedMemory对象
+        :return: 无返回值
+        """
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+# ======================================== 初始化配置 ==========================================
+
+# ========================================  主程序  ===========================================
@@ -11,48 +11,284 @@
 import pygame
 import glob
 import json
+import os
 import natsort
+import numpy as np
+import time
+import csv
+import sys
+from collections import deque, OrderedDict
 from threading import Event
+from ws_converter.color import get_rgb565_lut, GRID_COLOR
 
 # ======================================== 全局变量 ============================================
 
+# 性能叠加层统计的最近帧数
+STATS_WINDOW = 120
+# 峰值常驻内存的最短刷新间隔（秒），叠加层每帧读取时不必每帧都调用系统接口
+RSS_REFRESH_INTERVAL = 1.0
+# 空闲（暂停或静态帧）时等待事件的超时时间（毫秒）
+IDLE_WAIT_MS = 100
+# 支持的外观模式：square为方块+边框，led为圆形漫射LED+辉光
+APPEARANCES = ("square", "led")
+# LED外观的最小像素尺寸（更小时退化为方块外观）
+LED_MIN_PIXEL_SIZE = 4
+# LED精灵缓存的内存上限（MB），超出后按最近最少使用淘汰；4096种量化颜色在大像素尺寸下全部缓存可达数百MB
+LED_SPRITE_CACHE_MB = 32
+
 # ======================================== 功能函数 ============================================
 
-def rgb565_to_rgb888(rgb565):
+def read_frame_file(path, out):
+    """
+    读取单个JSON帧文件，将RGB565数据写入预分配的帧数组（像素数不足以黑色补齐，超出部分截断）
+    :param path: JSON帧文件路径
+    :param out: 形状为(高, 宽)的uint16帧数组（原地写入）
+    :return: (timestamp字段, duration字段)，缺失为None
+    """
+    # 以UTF-8编码打开文件，解决中文内容解码错误
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    flat = out.reshape(-1)
+    pixels = np.asarray(data["pixels"][:flat.size], dtype=np.uint16)
+    flat[:len(pixels)] = pixels
+    flat[len(pixels):] = 0
+    return data.get("timestamp"), data.get("duration")
+
+def load_frame_files(files, width, height, out=None):
+    """
+    按给定顺序读取JSON帧文件，RGB565数据原样存入整块uint16帧数组
+    :param files: JSON帧文件路径列表
+    :param width: 帧宽度（列数）
+    :param height: 帧高度（行数）
+    :param out: 预分配的形状为(帧数, 高, 宽)的uint16数组（如共享内存上的数组，默认None表示新建）
+    :return: (形状为(帧数, 高, 宽)的uint16数组, 每帧timestamp字段列表, 每帧duration字段列表)
+    """
+    frames = np.zeros((len(files), height, width), dtype=np.uint16) if out is None else out
+    timestamps = []
+    durations = []
+    # 遍历每个JSON文件，加载帧数据
+    for i, path in enumerate(files):
+        timestamp, duration = read_frame_file(path, frames[i])
+        timestamps.append(timestamp)
+        durations.append(duration)
+    return frames, timestamps, durations
+
+def load_frame_stack(json_pattern, width, height):
+    """
+    按自然排序读取匹配的JSON帧文件，RGB565数据原样存入整块uint16帧数组
+    :param json_pattern: JSON帧文件的匹配模式（支持通配符，如"frames/*.json"）
+    :param width: 帧宽度（列数）
+    :param height: 帧高度（行数）
+    :return: (形状为(帧数, 高, 宽)的uint16数组, 每帧timestamp字段列表, 每帧duration字段列表)
+    """
+    # 按自然排序获取匹配的JSON文件（确保帧顺序正确）
+    return load_frame_files(natsort.natsorted(glob.glob(json_pattern)), width, height)
+
+def scan_frame_files(json_pattern):
+    """
+    扫描匹配的JSON帧文件并建立修改时间索引（用于监视模式判断文件是否变化）
+    :param json_pattern: JSON帧文件的匹配模式（支持通配符）
+    :return: (按自然排序的文件路径列表, {路径: (修改时间ns, 文件大小)}字典)
+    """
+    index = {}
+    for path in glob.glob(json_pattern):
+        try:
+            st = os.stat(path)
+        except OSError:
+            # 扫描期间被删除的文件直接忽略
+            continue
+        index[path] = (st.st_mtime_ns, st.st_size)
+    return natsort.natsorted(index), index
+
+def build_led_key_lut():
+    """
+    预计算RGB565到LED精灵缓存键的查找表：RGB888每通道量化为4位（16级），组合为12位键
+    :return: 形状为(65536,)的uint16数组
+    """
+    q = RGB565_LUT.astype(np.uint16) >> 4
+    return (q[:, 0] << 8) | (q[:, 1] << 4) | q[:, 2]
+
+def sprite_nbytes(sprite):
+    """
+    估算精灵Surface占用的像素内存
+    :param sprite: pygame.Surface对象
+    :return: 字节数
+    """
+    return sprite.get_pitch() * sprite.get_height()
+
+def build_led_intensity(pixel_size):
+    """
+    生成LED精灵的亮度分布：中心为漫射圆形灯珠，外圈为高斯辉光，精灵边长为像素尺寸的2倍
+    :param pixel_size: 单个LED的显示尺寸（像素）
+    :return: 形状为(2*pixel_size, 2*pixel_size)的float32数组，取值0-1
+    """
+    size = pixel_size * 2
+    # 以单元格尺寸为单位的到中心距离
+    coords = (np.arange(size, dtype=np.float32) + 0.5 - size / 2) / pixel_size
+    r = np.sqrt(coords[None, :] ** 2 + coords[:, None] ** 2)
+    # 灯珠：半径0.3内满亮度，0.3-0.45之间平滑衰减
+    t = np.clip((0.45 - r) / 0.15, 0.0, 1.0)
+    core = t * t * (3 - 2 * t)
+    # 辉光：较弱的高斯扩散，可与相邻LED叠加
+    bloom = 0.35 * np.exp(-(r / 0.5) ** 2)
+    return np.clip(core + bloom, 0.0, 1.0)
+
+def get_peak_rss_mb():
     """
-    高精度RGB565转RGB888（使用硬件级优化算法，提升色彩还原精度）
-    :param rgb565: RGB565格式的颜色值（16位整数，结构：高5位红、中间6位绿、低5位蓝）
-    :return: 转换后的RGB888格式颜色元组（r, g, b），每个分量为0-255的整数
+    获取当前进程的峰值常驻内存（仅类Unix系统可用）
+    :return: 峰值常驻内存（MB），不支持的平台返回None
     """
-    r = ((rgb565 >> 11) & 0x1F)
-    g = ((rgb565 >> 5) & 0x3F)
-    b = (rgb565 & 0x1F)
-    return (
-        (r * 527 + 23) >> 6,
-        (g * 259 + 33) >> 6,
-        (b * 527 + 23) >> 6
-    )
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux单位为KB，macOS单位为字节
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
 
 # ======================================== 自定义类 ============================================
 
+class FrameStats:
+    """
+    仿真器逐帧耗时统计类，记录每次主循环的解码、渲染、显示耗时和帧间隔
+    核心功能：
+        1. 以固定长度环形缓冲保存逐帧样本，内存占用有上限
+        2. 计算实际帧率、帧间隔p50/p99、各阶段平均耗时等汇总指标
+        3. 导出为JSON（汇总+逐帧）或CSV（逐帧）文件
+    """
+    # 逐帧样本字段：帧索引、解码/渲染/显示耗时（秒）、帧间隔（秒）、本帧新增丢帧数
+    FIELDS = ("frame", "decode", "render", "present", "frame_time", "dropped")
+
+    def __init__(self, target_fps, max_samples=100000, recent_samples=STATS_WINDOW):
+        """
+        初始化统计对象
+        :param target_fps: 目标帧率
+        :param max_samples: 最多保留的逐帧样本数（默认100000）
+        :param recent_samples: 单独保留的最近样本数（叠加层按帧统计时只需复制这部分，默认STATS_WINDOW）
+        :return: 无返回值
+        """
+        self.target_fps = target_fps
+        self.samples = deque(maxlen=max_samples)
+        self.recent_samples = deque(maxlen=recent_samples)
+        # 缓存的峰值常驻内存及其读取时刻
+        self._peak_rss = None
+        self._rss_time = None
+
+    def record(self, frame, decode, render, present, frame_time, dropped):
+        """
+        记录一帧的耗时样本
+        :param frame: 显示的帧索引
+        :param decode: RGB565解码耗时（秒）
+        :param render: 绘制耗时（秒，不含解码）
+        :param present: 显示刷新耗时（秒）
+        :param frame_time: 与上一帧的间隔（秒）
+        :param dropped: 本帧新增的丢帧数
+        :return: 无返回值
+        """
+        sample = (frame, decode, render, present, frame_time, dropped)
+        self.samples.append(sample)
+        self.recent_samples.append(sample)
+
+    def peak_rss_mb(self, max_age=0.0):
+        """
+        获取峰值常驻内存，距上次读取不超过max_age秒时直接返回缓存值
+        :param max_age: 缓存的最长有效时间（秒，默认0.0即每次重新读取）
+        :return: 峰值常驻内存（MB），不支持的平台返回None
+        """
+        now = time.perf_counter()
+        if self._rss_time is None or now - self._rss_time >= max_age:
+            self._peak_rss = get_peak_rss_mb()
+            self._rss_time = now
+        return self._peak_rss
+
+    def summary(self, recent=None, memory_mb=None):
+        """
+        计算统计汇总
+        :param recent: 仅统计最近多少帧（None表示全部样本）
+        :param memory_mb: 帧缓存占用内存（MB，可选）
+        :return: 汇总字典
+        """
+        if recent and recent <= self.recent_samples.maxlen:
+            # 叠加层每帧调用：只复制最近样本，开销不随会话时长增长
+            samples = list(self.recent_samples)[-recent:]
+        elif recent:
+            samples = list(self.samples)[-recent:]
+        else:
+            samples = list(self.samples)
+        result = {"target_fps": self.target_fps, "samples": len(samples)}
+        if samples:
+            data = np.asarray(samples, dtype=np.float64)
+            frame_time = data[:, 4]
+            mean_time = frame_time.mean()
+            result.update({
+                "achieved_fps": round(1.0 / mean_time, 2) if mean_time > 0 else 0.0,
+                "frame_time_p50_ms": round(float(np.percentile(frame_time, 50)) * 1000, 2),
+                "frame_time_p99_ms": round(float(np.percentile(frame_time, 99)) * 1000, 2),
+                "decode_avg_ms": round(float(data[:, 1].mean()) * 1000, 3),
+                "render_avg_ms": round(float(data[:, 2].mean()) * 1000, 3),
+                "present_avg_ms": round(float(data[:, 3].mean()) * 1000, 3),
+                "dropped_frames": int(data[:, 5].sum()),
+            })
+        if memory_mb is not None:
+            result["frame_buffer_mb"] = round(memory_mb, 2)
+        # 最近帧统计（叠加层）最多每秒读取一次内存，全量汇总（导出）每次读取
+        result["peak_rss_mb"] = self.peak_rss_mb(RSS_REFRESH_INTERVAL if recent else 0.0)
+        return result
+
+    def export(self, path, memory_mb=None):
+        """
+        导出统计数据，按扩展名选择格式：.csv为逐帧明细，其它为JSON（汇总+逐帧明细）
+        :param path: 输出文件路径
+        :param memory_mb: 帧缓存占用内存（MB，可选）
+        :return: 无返回值
+        """
+        if os.path.splitext(path)[1].lower() == ".csv":
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(self.FIELDS)
+                writer.writerows(self.samples)
+        else:
+            data = {
+                "summary": self.summary(memory_mb=memory_mb),
+                "frames": [dict(zip(self.FIELDS, sample)) for sample in self.samples],
+            }
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+
 class WS2812Simulator:
     """
     WS2812 LED矩阵仿真器类，基于Pygame实现WS2812矩阵的可视化仿真效果
     核心功能：
-        1. 加载JSON格式的帧数据（包含RGB565颜色信息），自动转换为RGB888供渲染
+        1. 加载JSON格式的帧数据（包含RGB565颜色信息），以uint16数组紧凑存储，绘制时通过查找表转换为RGB888
         2. 支持帧的自动播放、暂停，以及上一帧/下一帧手动切换
         3. 支持仿真窗口大小调整，像素显示尺寸自动适配矩阵宽度
         4. 提供线程安全的停止控制机制，支持优雅退出
+        5. 支持按帧时间戳播放（timestamp时钟模式），渲染落后时自动丢帧，保证实时性
+        6. 支持监视模式，基于文件修改时间索引热重载变化的帧，不中断播放
+        7. 记录逐帧解码/渲染/显示耗时，可显示性能叠加层并导出JSON/CSV统计
+        8. 空闲感知：仅在画面变化时重绘，暂停时阻塞等待事件，失焦/最小化时可降频
+        9. 支持LED外观：按像素尺寸缓存预渲染的圆形漫射LED精灵，以加色混合批量blit
     """
-    def __init__(self, width, height, window_width=1000, fps=30):
+    def __init__(self, width, height, window_width=1000, fps=30, clock_mode="fixed", watch=False, show_stats=False,
+                 background_fps=None, appearance="square"):
         """
         初始化WS2812仿真器的参数和Pygame运行环境
         :param width: WS2812矩阵的宽度（列数，即水平方向LED数量）
         :param height: WS2812矩阵的高度（行数，即垂直方向LED数量）
         :param window_width: 仿真窗口的初始宽度（像素，默认1000）
-        :param fps: 帧播放的帧率（默认30帧/秒）
+        :param fps: 帧播放的帧率（默认30帧/秒；timestamp模式下仅用于无时间戳帧的默认帧间隔）
+        :param clock_mode: 播放时钟模式，"fixed"为每次循环前进一帧，"timestamp"为按帧时间戳对齐单调时钟
+        :param watch: 是否启用监视模式（帧文件变化时仅重新加载变化的帧，不中断播放）
+        :param show_stats: 是否显示性能统计叠加层（运行中可按I键切换）
+        :param background_fps: 窗口失焦或最小化时的降频帧率（None表示不降频）
+        :param appearance: 外观模式，"square"为方块+边框，"led"为圆形漫射LED+辉光（运行中可按L键切换）
         :return: 无返回值
         """
+        if clock_mode not in ("fixed", "timestamp"):
+            raise ValueError(f"不支持的时钟模式: {clock_mode}")
+        if appearance not in APPEARANCES:
+            raise ValueError(f"不支持的外观模式: {appearance}")
+
         # 矩阵尺寸参数
         self.width = width
         self.height = height
@@ -64,8 +300,9 @@ class WS2812Simulator:
         self.screen_height = height * self.pixel_size
         # 播放参数
         self.fps = fps
-        # 存储所有帧的RGB888颜色数据
-        self.frames = []
+        self.clock_mode = clock_mode
+        # 存储所有帧的RGB565颜色数据（形状为(帧数, 高, 宽)的uint16数组）
+        self.frames = np.zeros((0, height, width), dtype=np.uint16)
         # 播放状态标记（True：播放，False：暂停）
         self.current_frame = 0
         # 播放状态标记（True：播放，False：暂停）
@@ -74,6 +311,51 @@ class WS2812Simulator:
         self.show_numbers = False
         # 线程停止控制事件（用于优雅退出）
         self.stop_event = Event()
+        # 像素边框网格图层缓存，键为(列数, 行数, 像素尺寸)，像素尺寸变化时重建
+        self._grid_surfaces = {}
+
+        # 每帧相对首帧的播放时间（秒）及整段循环时长，timestamp模式据此调度
+        self.timestamps = np.zeros(0, dtype=np.float64)
+        self.loop_duration = 0.0
+        # 播放统计：实际显示的帧数、因渲染落后而跳过的帧数、累计播放时长（秒）
+        self.presented_frames = 0
+        self.dropped_frames = 0
+        self.play_time = 0.0
+        # timestamp模式下时间轴零点对应的单调时钟时刻（None表示需要重新对齐）
+        self._play_origin = None
+        # 上一次由播放时钟显示的帧，用于识别外部跳帧后重新对齐时钟
+        self._last_scheduled = None
+        # 上一次显示的帧所在的循环轮次（与帧索引合起来即展开后的帧位置）
+        self._last_loop = 0
+
+        # 监视模式参数：帧文件匹配模式、轮询间隔（秒）、下次轮询时刻
+        self.watch = watch
+        self.watch_interval = 0.5
+        self.json_pattern = None
+        self._next_watch_poll = 0.0
+        # 当前帧对应的文件列表、文件修改时间索引、每帧的(timestamp, duration)
+        self.frame_files = []
+        self._file_index = {}
+        self._frame_meta = []
+
+        # 性能统计：逐帧耗时记录、叠加层显示开关、当前帧解码耗时
+        self.stats = FrameStats(fps)
+        self.show_stats = show_stats
+        self._decode_time = 0.0
+
+        # 空闲感知：重绘请求标记、窗口可见/焦点状态、失焦降频帧率
+        self._dirty = True
+        self.visible = True
+        self.focused = True
+        self.background_fps = background_fps
+
+        # LED外观：精灵缓存（键为量化颜色，按最近使用排序）及其占用字节数、缓存对应的像素尺寸、各区域的精灵位置列表
+        self.appearance = appearance
+        self._led_sprites = OrderedDict()
+        self._led_sprite_bytes = 0
+        self._led_sprite_size = None
+        self._led_intensity = None
+        self._led_dests = {}
 
         pygame.init()
         # 创建可调整大小的仿真窗口
@@ -90,51 +372,393 @@ class WS2812Simulator:
         清空已加载的帧数据和当前帧索引，为加载新帧数据做准备
         :return: 无返回值
         """
-        self.frames.clear()
+        self.frames = np.zeros((0, self.height, self.width), dtype=np.uint16)
+        self.timestamps = np.zeros(0, dtype=np.float64)
+        self.loop_duration = 0.0
         self.current_frame = 0
+        self._play_origin = None
+        self.frame_files = []
+        self._file_index = {}
+        self._frame_meta = []
+        self.request_redraw()
+
+    def request_redraw(self):
+        """
+        请求在下一次主循环迭代中重绘画面（帧数据变化、窗口暴露等情况）
+        :return: 无返回值
+        """
+        self._dirty = True
 
     def load_frames(self, json_pattern):
         """
-        根据指定的JSON文件匹配模式加载帧数据，自动将RGB565转换为RGB888格式
+        根据指定的JSON文件匹配模式加载帧数据，RGB565数据原样存入uint16帧数组
         :param json_pattern: JSON帧文件的匹配模式（支持通配符，如"frames/*.json"）
         :return: 无返回值
         """
         # 加载前清空旧数据
         self.clear_frames()
-        # 按自然排序获取匹配的JSON文件（确保帧顺序正确）
-        files = natsort.natsorted(glob.glob(json_pattern))
-
-        # 遍历每个JSON文件，加载帧数据
-        for path in files:
-            # 以UTF-8编码打开文件，解决中文内容解码错误
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-                # 将帧中的每个RGB565颜色转换为RGB888，存入帧列表
-                pixels = [rgb565_to_rgb888(p) for p in data["pixels"]]
-                self.frames.append(pixels)
+        self.json_pattern = json_pattern
+        files, index = scan_frame_files(json_pattern)
+        frames = np.zeros((len(files), self.height, self.width), dtype=np.uint16)
+        self._frame_meta = [read_frame_file(path, frames[i]) for i, path in enumerate(files)]
+        self.frames = frames
+        self.frame_files = files
+        self._file_index = index
+        self.update_timeline()
+
+    def set_frames(self, frames):
+        """
+        直接加载内存中的帧数组（如点阵字库渲染的文字帧），按fps均匀分布时间轴
+        :param frames: 形状为(帧数, 高, 宽)的uint16 RGB565数组
+        :return: 无返回值
+        """
+        self.clear_frames()
+        self.frames = np.ascontiguousarray(frames, dtype=np.uint16)
+        self._frame_meta = [(None, None)] * len(self.frames)
+        self.update_timeline()
+
+    def reload_changed_frames(self):
+        """
+        监视模式下重新扫描帧文件，只重新解析修改时间或大小发生变化的帧，新增/删除文件时复用未变化的帧数据
+        写入中途的文件解析失败时保留旧数据，并在下次轮询时重试
+        :return: 重新解析的帧数
+        """
+        files, index = scan_frame_files(self.json_pattern)
+        changed = [p for p in files if index[p] != self._file_index.get(p)]
+        if files == self.frame_files and not changed:
+            return 0
+
+        if files == self.frame_files:
+            # 文件列表不变：原地更新变化的帧，不重建帧数组
+            frames = self.frames
+            meta = self._frame_meta
+            slots = {p: i for i, p in enumerate(files)}
+        else:
+            # 文件增删：按新顺序重建帧数组，未变化的帧直接复制
+            old_slots = {p: i for i, p in enumerate(self.frame_files)}
+            frames = np.zeros((len(files), self.height, self.width), dtype=np.uint16)
+            meta = [(None, None)] * len(files)
+            for i, p in enumerate(files):
+                if p in old_slots:
+                    frames[i] = self.frames[old_slots[p]]
+                    meta[i] = self._frame_meta[old_slots[p]]
+            slots = {p: i for i, p in enumerate(files)}
+
+        reloaded = 0
+        for p in changed:
+            i = slots[p]
+            try:
+                buffer = np.zeros((self.height, self.width), dtype=np.uint16)
+                meta[i] = read_frame_file(p, buffer)
+                frames[i] = buffer
+                reloaded += 1
+            except (OSError, ValueError, KeyError):
+                # 文件可能仍在写入：不记录其索引，下次轮询重试
+                index.pop(p, None)
+
+        self.frames = frames
+        self._frame_meta = meta
+        self.frame_files = files
+        self._file_index = index
+        self.current_frame = min(self.current_frame, max(self.frame_count - 1, 0))
+        self.update_timeline()
+        self.request_redraw()
+        return reloaded
+
+    def update_timeline(self):
+        """
+        根据各帧记录的(timestamp, duration)重建播放时间轴
+        :return: 无返回值
+        """
+        timestamps = [m[0] for m in self._frame_meta]
+        durations = [m[1] for m in self._frame_meta]
+        self.timestamps, self.loop_duration = self.build_timeline(timestamps, durations)
+
+    def build_timeline(self, timestamps, durations):
+        """
+        根据帧中记录的时间戳或持续时长构建播放时间轴
+            1. 所有帧都有timestamp时，使用时间戳（平移到首帧为0）
+            2. 否则所有帧都有duration时，按持续时长累加
+            3. 都没有时，按fps均匀分布
+        :param timestamps: 每帧的timestamp字段列表（秒，缺失为None）
+        :param durations: 每帧的duration字段列表（秒，缺失为None）
+        :return: (每帧起始时间数组, 整段循环时长)
+        """
+        n = len(timestamps)
+        if n == 0:
+            return np.zeros(0, dtype=np.float64), 0.0
+        default_step = 1.0 / self.fps if self.fps > 0 else 1.0 / 30
+
+        if all(t is not None for t in timestamps):
+            starts = np.asarray(timestamps, dtype=np.float64)
+            starts = starts - starts[0]
+            # 时间戳必须单调不减，否则回退到均匀分布
+            if n > 1 and np.any(np.diff(starts) < 0):
+                starts = np.arange(n, dtype=np.float64) * default_step
+            steps = np.diff(starts)
+            positive = steps[steps > 0]
+            # 末帧持续时长取帧间隔中位数（即视频抽帧间隔）
+            last = float(np.median(positive)) if len(positive) else default_step
+            if durations[-1] is not None:
+                last = float(durations[-1])
+            return starts, float(starts[-1] + last)
+
+        if all(d is not None for d in durations):
+            lengths = np.asarray(durations, dtype=np.float64)
+            starts = np.concatenate(([0.0], np.cumsum(lengths)[:-1]))
+            return starts, float(lengths.sum())
+
+        starts = np.arange(n, dtype=np.float64) * default_step
+        return starts, n * default_step
+
+    def get_grid_surface(self, width=None, height=None):
+        """
+        获取与当前像素尺寸匹配的像素边框网格图层，尺寸不变时复用缓存
+        :param width: 网格列数（默认为矩阵宽度）
+        :param height: 网格行数（默认为矩阵高度）
+        :return: 带透明色键的pygame.Surface网格图层
+        """
+        width = width or self.width
+        height = height or self.height
+        key = (width, height, self.pixel_size)
+        if key not in self._grid_surfaces:
+            grid = pygame.Surface((width * self.pixel_size, height * self.pixel_size))
+            grid.fill((0, 0, 0))
+            grid.set_colorkey((0, 0, 0))
+            for y in range(height):
+                for x in range(width):
+                    rect = pygame.Rect(x*self.pixel_size, y*self.pixel_size, self.pixel_size, self.pixel_size)
+                    pygame.draw.rect(grid, GRID_COLOR, rect, 1)
+            self._grid_surfaces[key] = grid
+        return self._grid_surfaces[key]
+
+    def handle_resize(self, window_width, window_height):
+        """
+        窗口尺寸变化时按新尺寸重新计算像素显示尺寸（LED精灵缓存在下次绘制时按新尺寸重建）
+        :param window_width: 新的窗口宽度（像素）
+        :param window_height: 新的窗口高度（像素）
+        :return: 无返回值
+        """
+        self.pixel_size = max(1, min(window_width // self.width, window_height // self.height))
+        self.screen_width = self.width * self.pixel_size
+        self.screen_height = self.height * self.pixel_size
+        self.request_redraw()
+
+    def use_led_appearance(self):
+        """
+        当前是否使用LED外观（像素尺寸过小时退化为方块外观）
+        :return: 布尔值
+        """
+        return self.appearance == "led" and self.pixel_size >= LED_MIN_PIXEL_SIZE
+
+    def get_led_sprite(self, key):
+        """
+        获取量化颜色对应的LED精灵，像素尺寸变化时清空整个缓存后重建；
+        缓存占用超过LED_SPRITE_CACHE_MB时淘汰最久未使用的精灵（至少保留刚生成的一个）
+        :param key: 12位量化颜色键（r4<<8 | g4<<4 | b4）
+        :return: pygame.Surface精灵
+        """
+        if self._led_sprite_size != self.pixel_size:
+            self._led_sprites.clear()
+            self._led_sprite_bytes = 0
+            self._led_dests.clear()
+            self._led_intensity = build_led_intensity(self.pixel_size)
+            self._led_sprite_size = self.pixel_size
+        sprites = self._led_sprites
+        sprite = sprites.get(key)
+        if sprite is not None:
+            sprites.move_to_end(key)
+            return sprite
+        # 4位量化值扩展回8位（×17），乘以亮度分布得到精灵颜色
+        color = np.array([(key >> 8) & 0xF, (key >> 4) & 0xF, key & 0xF], dtype=np.float32) * 17
+        pixels = (self._led_intensity[:, :, None] * color).astype(np.uint8)
+        sprite = pygame.surfarray.make_surface(pixels.swapaxes(0, 1))
+        sprites[key] = sprite
+        self._led_sprite_bytes += sprite_nbytes(sprite)
+        budget = LED_SPRITE_CACHE_MB * 1024 * 1024
+        while self._led_sprite_bytes > budget and len(sprites) > 1:
+            _, old = sprites.popitem(last=False)
+            self._led_sprite_bytes -= sprite_nbytes(old)
+        return sprite
+
+    def led_blits(self, frame, x0=0, y0=0):
+        """
+        生成一帧LED外观的批量blit参数：按量化颜色取缓存精灵，以加色混合叠加辉光，黑色LED跳过
+        :param frame: 形状为(高, 宽)的uint16 RGB565帧数组
+        :param x0: 区域左上角在窗口中的x坐标（像素）
+        :param y0: 区域左上角在窗口中的y坐标（像素）
+        :return: 可直接传给Surface.blits的(精灵, 位置, None, 混合标志)列表
+        """
+        h, w = frame.shape
+        keys = LED_KEY_LUT[frame].ravel()
+        # 本帧用到的精灵单独持有引用，生成过程中被缓存淘汰的精灵仍可用于本帧
+        sprites = {key: self.get_led_sprite(key) for key in np.unique(keys).tolist() if key}
+        ps = self.pixel_size
+        dest_key = (w, h, x0, y0)
+        dests = self._led_dests.get(dest_key)
+        if dests is None:
+            # 精灵边长为2倍像素尺寸，中心对齐单元格中心
+            offset = ps // 2
+            dests = [(x0 + x * ps - offset, y0 + y * ps - offset) for y in range(h) for x in range(w)]
+            self._led_dests[dest_key] = dests
+        return [(sprites[key], dest, None, pygame.BLEND_RGB_ADD)
+                for key, dest in zip(keys.tolist(), dests) if key]
 
     def draw(self):
         """
-        绘制当前帧的WS2812矩阵画面，包括像素点、像素边框和帧信息提示
+        绘制当前帧的WS2812矩阵画面，包括像素点、像素边框（或LED精灵）和帧信息提示
         :return: 无返回值
         """
         self.screen.fill((0, 0, 0))
         # 无数据时跳过绘制
-        if not self.frames: return
+        if self.frame_count == 0: return
 
-        # 遍历每个像素位置，绘制对应的颜色
-        for y in range(self.height):
-            for x in range(self.width):
-                i = y * self.width + x
-                color = self.frames[self.current_frame][i] if i < len(self.frames[self.current_frame]) else (0, 0, 0)
-                rect = pygame.Rect(x*self.pixel_size, y*self.pixel_size, self.pixel_size, self.pixel_size)
-                pygame.draw.rect(self.screen, color, rect)
-                pygame.draw.rect(self.screen, (40, 40, 40), rect, 1)
+        if self.use_led_appearance():
+            start = time.perf_counter()
+            batch = self.led_blits(self.frames[self.current_frame])
+            self._decode_time = time.perf_counter() - start
+            self.screen.blits(batch, doreturn=False)
+            info = self.font.render(f"Frame: {self.current_frame+1}/{self.frame_count}", True, (255,255,255))
+            self.screen.blit(info, (5, 5))
+            return
+
+        # 一次查表将整帧RGB565展开为RGB888，surfarray要求(宽, 高, 3)排列
+        start = time.perf_counter()
+        rgb = RGB565_LUT[self.frames[self.current_frame]]
+        surface = pygame.surfarray.make_surface(rgb.swapaxes(0, 1))
+        self._decode_time = time.perf_counter() - start
+        surface = pygame.transform.scale(surface, (self.width * self.pixel_size, self.height * self.pixel_size))
+        self.screen.blit(surface, (0, 0))
+        # 叠加缓存的像素边框网格
+        self.screen.blit(self.get_grid_surface(), (0, 0))
 
         # 绘制帧信息提示（当前帧/总帧数）
-        info = self.font.render(f"Frame: {self.current_frame+1}/{len(self.frames)}", True, (255,255,255))
+        info = self.font.render(f"Frame: {self.current_frame+1}/{self.frame_count}", True, (255,255,255))
         self.screen.blit(info, (5, 5))
 
+    @property
+    def frame_count(self):
+        """
+        已加载的帧数
+        :return: 帧数（整数）
+        """
+        return len(self.frames)
+
+    @property
+    def achieved_fps(self):
+        """
+        播放状态下实际达到的显示帧率（实际显示帧数/累计播放时长）
+        :return: 帧率（浮点数），尚未播放时为0.0
+        """
+        return self.presented_frames / self.play_time if self.play_time > 0 else 0.0
+
+    def get_playback_stats(self):
+        """
+        获取播放统计信息
+        :return: 字典，包含显示帧数、丢帧数、累计播放时长和实际帧率
+        """
+        return {
+            "presented_frames": self.presented_frames,
+            "dropped_frames": self.dropped_frames,
+            "play_time": round(self.play_time, 3),
+            "achieved_fps": round(self.achieved_fps, 2),
+        }
+
+    def advance_by_clock(self, now):
+        """
+        timestamp模式下根据单调时钟计算当前应显示的帧，落后时跳过中间帧并计入丢帧数
+        :param now: 当前单调时钟时刻（time.perf_counter()）
+        :return: 下一帧应显示的单调时钟时刻
+        """
+        n = self.frame_count
+        # 首次播放或外部跳帧（方向键/GUI按钮）后，以当前帧重新对齐时间轴
+        if self._play_origin is None or self.current_frame != self._last_scheduled:
+            self._play_origin = now - self.timestamps[self.current_frame]
+            self._last_scheduled = self.current_frame
+            self._last_loop = 0
+            if self.visible:
+                self.presented_frames += 1
+        if self.loop_duration <= 0:
+            return now + 1.0 / self.fps
+
+        elapsed = now - self._play_origin
+        loops, position = divmod(elapsed, self.loop_duration)
+        target = int(np.searchsorted(self.timestamps, position, side="right")) - 1
+        loops = int(loops)
+        # 在展开（不取模）的帧位置上计算前进帧数，长时间卡顿跨过整轮循环时也能计全丢帧
+        step = (loops - self._last_loop) * n + target - self.current_frame
+        if step > 0:
+            self.dropped_frames += step - 1
+            if self.visible:
+                self.presented_frames += 1
+            self.current_frame = target
+            self._last_scheduled = target
+            self._last_loop = loops
+
+        # 计算下一帧的到期时刻（末帧之后回到下一轮循环的首帧）
+        next_start = self.timestamps[target + 1] if target + 1 < n else self.loop_duration
+        return self._play_origin + loops * self.loop_duration + next_start
+
+    @property
+    def frame_memory_mb(self):
+        """
+        帧缓存占用的内存（MB）
+        :return: 浮点数
+        """
+        return self.frames.nbytes / (1024 * 1024)
+
+    def draw_stats_overlay(self):
+        """
+        在画面右上角绘制最近帧的性能统计叠加层
+        :return: 无返回值
+        """
+        summary = self.stats.summary(recent=STATS_WINDOW, memory_mb=self.frame_memory_mb)
+        if not summary["samples"]:
+            return
+        lines = [
+            f"FPS: {summary['achieved_fps']:.1f} / {self.fps}",
+            f"Frame p50/p99: {summary['frame_time_p50_ms']:.1f} / {summary['frame_time_p99_ms']:.1f} ms",
+            f"Decode: {summary['decode_avg_ms']:.2f} ms  Render: {summary['render_avg_ms']:.2f} ms",
+            f"Present: {summary['present_avg_ms']:.2f} ms",
+            f"Dropped: {self.dropped_frames}  Frames: {summary['frame_buffer_mb']:.2f} MB",
+        ]
+        if summary["peak_rss_mb"] is not None:
+            lines.append(f"Peak RSS: {summary['peak_rss_mb']:.1f} MB")
+        surfaces = [self.font.render(line, True, (255, 255, 0)) for line in lines]
+        width = max(s.get_width() for s in surfaces) + 10
+        height = sum(s.get_height() for s in surfaces) + 10
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 160))
+        y = 5
+        for text in surfaces:
+            panel.blit(text, (5, y))
+            y += text.get_height()
+        self.screen.blit(panel, (self.screen.get_width() - width - 5, 5))
+
+    def get_stats_summary(self):
+        """
+        获取全部样本的性能统计汇总（含播放统计）
+        :return: 汇总字典
+        """
+        summary = self.stats.summary(memory_mb=self.frame_memory_mb)
+        summary.update(self.get_playback_stats())
+        return summary
+
+    def export_stats(self, path):
+        """
+        导出性能统计数据（.csv为逐帧明细，.json为汇总+逐帧明细）
+        :param path: 输出文件路径
+        :return: 无返回值
+        """
+        self.stats.export(path, memory_mb=self.frame_memory_mb)
+
+    def process_commands(self):
+        """
+        主循环每次迭代调用的外部控制钩子，默认不做任何处理，由子类重写
+        :return: 无返回值
+        """
+        pass
+
     def run(self):
         """
         启动仿真器的主循环，处理用户输入事件并播放帧数据
@@ -142,14 +766,31 @@ class WS2812Simulator:
             - 空格键：切换播放/暂停状态
             - 左方向键：切换到上一帧（并自动暂停播放）
             - 右方向键：切换到下一帧（并自动暂停播放）
+            - I键：显示/隐藏性能统计叠加层
+            - L键：切换方块/LED外观
             - 关闭窗口：触发停止事件，退出主循环并释放Pygame资源
         :return: 无返回值
         """
         # 重置停止标志
         self.stop_event.clear()
+        last_tick = time.perf_counter()
+        last_frame_start = None
+        # 上一次绘制时的画面状态，状态不变且无重绘请求时跳过绘制
+        last_drawn = None
+        self.request_redraw()
         # 主循环：直到停止事件被触发
         while not self.stop_event.is_set():
-            for event in pygame.event.get():
+            playing = self.playing and self.frame_count > 0
+            # 窗口不可见时不会绘制，待重绘标志不能作为忙等的理由（否则最小化+暂停时空转占满一个核）
+            if playing or (self._dirty and self.visible):
+                events = pygame.event.get()
+            else:
+                # 空闲（暂停/静态帧）时阻塞等待事件，超时后继续处理命令、监视和停止信号
+                event = pygame.event.wait(IDLE_WAIT_MS)
+                events = [event] if event.type != pygame.NOEVENT else []
+                events += pygame.event.get()
+
+            for event in events:
                 # 窗口关闭事件：触发停止事件
                 if event.type == pygame.QUIT:
                     self.stop_event.set()
@@ -160,26 +801,288 @@ class WS2812Simulator:
                         self.playing = not self.playing
                     elif event.key == pygame.K_RIGHT:
                         # 右方向键：切换到下一帧（不超过总帧数）
-                        self.current_frame = min(self.current_frame + 1, len(self.frames) - 1)
+                        self.current_frame = min(self.current_frame + 1, self.frame_count - 1)
                         self.playing = False
                     elif event.key == pygame.K_LEFT:
                         # 左方向键：切换到上一帧（不小于0）
                         self.current_frame = max(self.current_frame - 1, 0)
                         self.playing = False
+                    elif event.key == pygame.K_i:
+                        # I键：切换性能统计叠加层
+                        self.show_stats = not self.show_stats
+                        self.request_redraw()
+                    elif event.key == pygame.K_l:
+                        # L键：切换方块/LED外观
+                        self.appearance = "square" if self.appearance == "led" else "led"
+                        self.request_redraw()
+                # 窗口尺寸变化：按新尺寸重新计算像素显示尺寸
+                elif event.type == pygame.VIDEORESIZE:
+                    self.handle_resize(event.w, event.h)
+                # 窗口重新暴露：需要重绘
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED,
+                                    pygame.WINDOWSIZECHANGED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN):
+                    self.visible = True
+                    self.request_redraw()
+                elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                    self.visible = False
+                elif event.type == pygame.WINDOWFOCUSGAINED:
+                    self.focused = True
+                elif event.type == pygame.WINDOWFOCUSLOST:
+                    self.focused = False
+
+            # 处理外部控制命令（供子类扩展，如独立进程模式下的命令通道）
+            self.process_commands()
+            now = time.perf_counter()
+            # 监视模式：按轮询间隔检查帧文件变化
+            if self.watch and self.json_pattern and now >= self._next_watch_poll:
+                self._next_watch_poll = now + self.watch_interval
+                self.reload_changed_frames()
+            next_due = None
+            dropped_before = self.dropped_frames
+            playing = self.playing and self.frame_count > 0
+            if playing:
+                self.play_time += now - last_tick
+                if self.clock_mode == "timestamp":
+                    # 按时间戳调度，渲染落后时直接跳到当前时刻应显示的帧
+                    next_due = self.advance_by_clock(now)
+                else:
+                    # 固定模式：每次循环切换到下一帧（循环播放）
+                    self.current_frame = (self.current_frame + 1) % self.frame_count
+                    # 窗口不可见时帧不会显示，不计入显示帧数
+                    if self.visible:
+                        self.presented_frames += 1
+            else:
+                # 暂停后恢复播放时重新对齐时间轴
+                self._play_origin = None
+                last_frame_start = None
+            last_tick = now
 
-            # 播放状态下，自动切换到下一帧（循环播放）
-            if self.playing and self.frames:
-                self.current_frame = (self.current_frame + 1) % len(self.frames)
+            # 仅在画面状态变化或收到重绘请求、且窗口可见时绘制
+            state = (self.current_frame, self.frame_count, self.show_stats)
+            if self.visible and (self._dirty or state != last_drawn):
+                # 绘制当前帧画面，并分别计时解码、绘制、显示刷新
+                self._decode_time = 0.0
+                draw_start = time.perf_counter()
+                self.draw()
+                if self.show_stats:
+                    self.draw_stats_overlay()
+                present_start = time.perf_counter()
+                pygame.display.flip()
+                present_end = time.perf_counter()
+                if playing and last_frame_start is not None:
+                    self.stats.record(self.current_frame, self._decode_time,
+                                      present_start - draw_start - self._decode_time,
+                                      present_end - present_start, draw_start - last_frame_start,
+                                      self.dropped_frames - dropped_before)
+                last_frame_start = draw_start if playing else None
+                last_drawn = state
+                self._dirty = False
 
-            # 绘制当前帧画面
-            self.draw()
-            pygame.display.flip()
-            # 控制帧率，确保运行速度符合设定的FPS
-            self.clock.tick(self.fps)
+            if not playing:
+                continue
+            # 窗口失焦或最小化时按后台帧率降频（timestamp模式下由时钟自动丢帧保持实时）
+            throttled = self.background_fps and (not self.focused or not self.visible)
+            if next_due is not None:
+                if throttled:
+                    next_due = max(next_due, now + 1.0 / self.background_fps)
+                # 等待到下一帧到期时刻，最长50ms以保证事件响应
+                wait = min(next_due - time.perf_counter(), 0.05)
+                if wait > 0:
+                    pygame.time.wait(int(wait * 1000))
+            else:
+                # 控制帧率，确保运行速度符合设定的FPS
+                self.clock.tick(min(self.fps, self.background_fps) if throttled else self.fps)
         # 确保退出时释放资源
         pygame.quit()
 
-def run_simulator(json_pattern, width, height, window_width=1000, fps=30):
+class WS2812WallSimulator(WS2812Simulator):
+    """
+    多面板拼接屏（视频墙）仿真器类，在WS2812Simulator基础上按布局合成多个面板
+    核心功能：
+        1. 按布局描述放置面板（位置、尺寸、顺时针旋转0/90/180/270度）
+        2. 每个面板可使用独立帧源，也可将一个整墙大帧源按面板区域拆分
+        3. 每帧将各面板转为小尺寸Surface并缩放，通过screen.blits批量合成到同一窗口
+    布局格式（JSON，坐标与尺寸均以LED为单位）：
+        {
+            "source": "wall/big_frame_*.json",    # 可选：整墙帧源，按面板区域拆分
+            "panels": [
+                {"x": 0, "y": 0, "width": 16, "height": 16, "rotation": 0,
+                 "source": "wall/p0_frame_*.json"}  # 可选：面板独立帧源（优先于整墙帧源）
+            ]
+        }
+    """
+    def __init__(self, layout, window_width=1000, fps=30, clock_mode="fixed"):
+        """
+        初始化拼接屏仿真器，根据面板布局计算整墙尺寸
+        :param layout: 布局字典（格式见类说明）
+        :param window_width: 仿真窗口的初始宽度（像素，默认1000）
+        :param fps: 帧播放的帧率（默认30帧/秒）
+        :param clock_mode: 播放时钟模式（"fixed"或"timestamp"，默认"fixed"）
+        :return: 无返回值
+        """
+        self.layout = layout
+        self.panels = []
+        for i, panel in enumerate(layout.get("panels", [])):
+            rotation = int(panel.get("rotation", 0)) % 360
+            if rotation % 90:
+                raise ValueError(f"面板{i}的旋转角度必须为90的整数倍: {rotation}")
+            w, h = int(panel["width"]), int(panel["height"])
+            # 旋转90/270度后面板在墙上的占位宽高互换
+            fw, fh = (h, w) if rotation in (90, 270) else (w, h)
+            self.panels.append({
+                "x": int(panel.get("x", 0)), "y": int(panel.get("y", 0)),
+                "width": w, "height": h, "rotation": rotation,
+                "footprint": (fw, fh), "source": panel.get("source"),
+            })
+        if not self.panels:
+            raise ValueError("布局中没有任何面板")
+
+        # 整墙尺寸为所有面板占位区域的外接矩形
+        wall_w = max(p["x"] + p["footprint"][0] for p in self.panels)
+        wall_h = max(p["y"] + p["footprint"][1] for p in self.panels)
+        # 各面板的帧数组列表（按面板原始方向存储）
+        self.panel_frames = []
+        super().__init__(wall_w, wall_h, window_width, fps, clock_mode)
+
+    def clear_frames(self):
+        """
+        清空所有面板的帧数据和当前帧索引
+        :return: 无返回值
+        """
+        super().clear_frames()
+        self.panel_frames = []
+
+    def load_frames(self, json_pattern=None):
+        """
+        加载各面板的帧数据：面板有独立帧源时读取独立帧源，否则从整墙帧源中拆分出面板区域
+        :param json_pattern: 整墙帧源的匹配模式（默认使用布局中的source字段）
+        :return: 无返回值
+        """
+        self.clear_frames()
+        json_pattern = json_pattern or self.layout.get("source")
+
+        wall_frames = None
+        timeline = None
+        if json_pattern:
+            wall_frames, timestamps, durations = load_frame_stack(json_pattern, self.width, self.height)
+            timeline = (timestamps, durations)
+
+        for i, panel in enumerate(self.panels):
+            if panel["source"]:
+                frames, timestamps, durations = load_frame_stack(panel["source"], panel["width"], panel["height"])
+                if timeline is None:
+                    timeline = (timestamps, durations)
+            elif wall_frames is not None:
+                fw, fh = panel["footprint"]
+                region = wall_frames[:, panel["y"]:panel["y"] + fh, panel["x"]:panel["x"] + fw]
+                # 逆向旋转回面板原始方向，合成时再按布局旋转
+                frames = np.ascontiguousarray(np.rot90(region, panel["rotation"] // 90, axes=(1, 2)))
+            else:
+                raise ValueError(f"面板{i}没有帧源，且布局未提供整墙帧源")
+            self.panel_frames.append(frames)
+
+        # 整墙帧数取各面板帧数的最大值，帧数较少的面板循环播放
+        count = max(len(frames) for frames in self.panel_frames)
+        if timeline is not None and len(timeline[0]) == count:
+            self.timestamps, self.loop_duration = self.build_timeline(*timeline)
+        else:
+            self.timestamps, self.loop_duration = self.build_timeline([None] * count, [None] * count)
+
+    @property
+    def frame_count(self):
+        """
+        整墙帧数（各面板帧数的最大值）
+        :return: 帧数（整数）
+        """
+        return max((len(frames) for frames in self.panel_frames), default=0)
+
+    @property
+    def frame_memory_mb(self):
+        """
+        所有面板帧缓存占用的内存（MB）
+        :return: 浮点数
+        """
+        return sum(frames.nbytes for frames in self.panel_frames) / (1024 * 1024)
+
+    def draw(self):
+        """
+        绘制当前帧的整墙画面：逐面板查表、旋转、缩放后，与网格图层一起批量blit到窗口
+        :return: 无返回值
+        """
+        self.screen.fill((0, 0, 0))
+        if self.frame_count == 0: return
+
+        ps = self.pixel_size
+        batch = []
+        self._decode_time = 0.0
+        led = self.use_led_appearance()
+        for panel, frames in zip(self.panels, self.panel_frames):
+            if len(frames) == 0:
+                continue
+            if led:
+                start = time.perf_counter()
+                frame = np.rot90(frames[self.current_frame % len(frames)], -(panel["rotation"] // 90))
+                batch.extend(self.led_blits(frame, panel["x"] * ps, panel["y"] * ps))
+                self._decode_time += time.perf_counter() - start
+                continue
+            start = time.perf_counter()
+            rgb = RGB565_LUT[frames[self.current_frame % len(frames)]]
+            # np.rot90的正方向为逆时针，布局中的旋转为顺时针
+            rgb = np.rot90(rgb, -(panel["rotation"] // 90))
+            fw, fh = panel["footprint"]
+            surface = pygame.surfarray.make_surface(rgb.swapaxes(0, 1))
+            self._decode_time += time.perf_counter() - start
+            surface = pygame.transform.scale(surface, (fw * ps, fh * ps))
+            dest = (panel["x"] * ps, panel["y"] * ps)
+            batch.append((surface, dest))
+            batch.append((self.get_grid_surface(fw, fh), dest))
+        self.screen.blits(batch, doreturn=False)
+
+        # 绘制帧信息提示（当前帧/总帧数/面板数）
+        info = self.font.render(f"Frame: {self.current_frame+1}/{self.frame_count}  Panels: {len(self.panels)}",
+                                True, (255, 255, 255))
+        self.screen.blit(info, (5, 5))
+
+def load_wall_layout(path):
+    """
+    读取拼接屏布局JSON文件，面板帧源中的相对路径以布局文件所在目录为基准
+    :param path: 布局JSON文件路径
+    :return: 布局字典
+    """
+    with open(path, encoding="utf-8") as f:
+        layout = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    if layout.get("source"):
+        layout["source"] = os.path.join(base, layout["source"])
+    for panel in layout.get("panels", []):
+        if panel.get("source"):
+            panel["source"] = os.path.join(base, panel["source"])
+    return layout
+
+def run_wall_simulator(layout_path, window_width=1000, fps=30, clock_mode="fixed", show_stats=False,
+                       stats_path=None, appearance="square"):
+    """
+    快速启动拼接屏仿真器的封装函数
+    :param layout_path: 布局JSON文件路径
+    :param window_width: 仿真窗口的初始宽度（像素，默认1000）
+    :param fps: 帧播放的帧率（默认30帧/秒）
+    :param clock_mode: 播放时钟模式（"fixed"或"timestamp"，默认"fixed"）
+    :param show_stats: 是否显示性能统计叠加层（默认False）
+    :param stats_path: 退出时导出性能统计的文件路径（.json/.csv，默认不导出）
+    :param appearance: 外观模式（"square"或"led"，默认"square"）
+    :return: 播放统计信息字典（见WS2812Simulator.get_playback_stats）
+    """
+    sim = WS2812WallSimulator(load_wall_layout(layout_path), window_width, fps, clock_mode)
+    sim.show_stats = show_stats
+    sim.appearance = appearance
+    sim.load_frames()
+    sim.run()
+    if stats_path:
+        sim.export_stats(stats_path)
+    return sim.get_playback_stats()
+
+def run_simulator(json_pattern, width, height, window_width=1000, fps=30, clock_mode="fixed", watch=False,
+                  show_stats=False, stats_path=None, appearance="square"):
     """
     快速启动WS2812仿真器的封装函数，简化仿真器的调用流程
     :param json_pattern: JSON帧文件的匹配模式（支持通配符，如"frames/*.json"）
@@ -187,15 +1090,54 @@ def run_simulator(json_pattern, width, height, window_width=1000, fps=30):
     :param height: WS2812矩阵的高度（行数）
     :param window_width: 仿真窗口的初始宽度（像素，默认1000）
     :param fps: 帧播放的帧率（默认30帧/秒）
-    :return: 无返回值
+    :param clock_mode: 播放时钟模式（"fixed"或"timestamp"，默认"fixed"）
+    :param watch: 是否启用监视模式（帧文件变化时自动热重载）
+    :param show_stats: 是否显示性能统计叠加层（默认False）
+    :param stats_path: 退出时导出性能统计的文件路径（.json/.csv，默认不导出）
+    :param appearance: 外观模式（"square"或"led"，默认"square"）
+    :return: 播放统计信息字典（见WS2812Simulator.get_playback_stats）
     """
     # 创建仿真器实例
-    sim = WS2812Simulator(width, height, window_width, fps)
+    sim = WS2812Simulator(width, height, window_width, fps, clock_mode, watch, show_stats,
+                          appearance=appearance)
     # 加载指定的帧数据
     sim.load_frames(json_pattern)
     # 启动仿真器主循环
     sim.run()
+    if stats_path:
+        sim.export_stats(stats_path)
+    return sim.get_playback_stats()
+
+def run_text_simulator(atlas_path, text, width, height, window_width=1000, fps=30, scroll=False, speed=1,
+                       text_color=(255, 255, 255), bg_color=(0, 0, 0), appearance="square"):
+    """
+    使用点阵字库渲染字符串并在仿真器中播放（与设备端使用同一份字库数据）
+    :param atlas_path: 点阵字库文件路径
+    :param text: 文字内容
+    :param width: WS2812矩阵的宽度（列数）
+    :param height: WS2812矩阵的高度（行数）
+    :param window_width: 仿真窗口的初始宽度（像素，默认1000）
+    :param fps: 帧播放的帧率（默认30帧/秒）
+    :param scroll: 是否滚动显示（默认False）
+    :param speed: 滚动时每帧移动的列数（默认1）
+    :param text_color: 文字RGB颜色（默认白色）
+    :param bg_color: 背景RGB颜色（默认黑色）
+    :param appearance: 外观模式（"square"或"led"，默认"square"）
+    :return: 播放统计信息字典（见WS2812Simulator.get_playback_stats）
+    """
+    from ws_converter.font_atlas import FontAtlas
+
+    frames = FontAtlas(atlas_path).render_frames(text, width, height, scroll, speed, text_color, bg_color)
+    sim = WS2812Simulator(width, height, window_width, fps, appearance=appearance)
+    sim.set_frames(frames)
+    sim.run()
+    return sim.get_playback_stats()
 
 # ======================================== 初始化配置 ==========================================
 
+# RGB565→RGB888全量查找表（65536×3，约192KB），绘制时整帧一次索引完成颜色展开
+RGB565_LUT = get_rgb565_lut()
+# RGB565→LED精灵缓存键查找表（每通道16级，最多4096种精灵）
+LED_KEY_LUT = build_led_key_lut()
+
 # ========================================  主程序  ===========================================
\ No newline at end of file